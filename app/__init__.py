@@ -1,8 +1,18 @@
-from flasgger import Swagger
 from flask import Flask
 from flask_caching import Cache
 
+from app.apidocs import CachedSwagger
+from app.response_cache import ResponseCache
+from app.telemetry import RequestTelemetry
+from embrapa_api.metrics import registry as metrics
+from embrapa_api.refresher import BackgroundRefresher
+from embrapa_api.store import DatasetStore
+
 cache = Cache()
+store = DatasetStore()
+response_cache = ResponseCache(cache, store, metrics)
+telemetry = RequestTelemetry(metrics)
+refresher = BackgroundRefresher(store)
 
 
 def create_app(config=None):
@@ -13,6 +23,9 @@ def create_app(config=None):
 
     cache_config = {'CACHE_TYPE': 'flask_caching.backends.simplecache.SimpleCache'}
     cache.init_app(app, config=cache_config)
+    store.init_app(app)
+    metrics.init_app(app)
+    telemetry.init_app(app)
 
     swagger_template = {
         "swagger": "2.0",
@@ -28,11 +41,13 @@ def create_app(config=None):
         "basePath": "/",
         "schemes": ["http"],
     }
-    _ = Swagger(app, template=swagger_template)
+    _ = CachedSwagger(app, template=swagger_template)
 
     with app.app_context():
         from app.routes import bp
 
         app.register_blueprint(bp)
 
+    refresher.init_app(app)
+
     return app
@@ -0,0 +1,19 @@
+"""Swagger (flasgger) with the API spec parsed once per process."""
+
+from flasgger import Swagger
+
+
+class CachedSwagger(Swagger):
+    """Swagger that parses the route docstrings into the spec only once.
+
+    flasgger already caches the spec, except in debug mode (``make run``),
+    where it re-parses every docstring on each request to ``/apispec_1.json``.
+    Route changes restart the process through the reloader anyway, so the
+    cached spec is never stale.
+    """
+
+    def get_apispecs(self, endpoint='apispec_1'):
+        spec = self.apispecs.get(endpoint)
+        if spec is None:
+            spec = self.apispecs[endpoint] = super().get_apispecs(endpoint)
+        return spec
@@ -1,8 +1,21 @@
 class Config:
     TESTING = False
     USE_LOCAL_DATA = False
+    LOCAL_DATA_FOLDER = None
+    RESPONSE_CACHE_TIMEOUT = 3600
+    FETCH_TIMEOUT = 30
+    CONCURRENT_FETCH = True
+    FETCH_WORKERS = 5
+    LOAD_ARTIFACTS = True
+    COMPACT_SCHEMA = True
+    FLOAT32_MEASURES = False
+    METRICS_ENABLED = True
+    BACKGROUND_REFRESH = True
+    REFRESH_INTERVAL = 6 * 3600
 
 
 class TestConfig(Config):
     TESTING = True
     USE_LOCAL_DATA = True
+    LOAD_ARTIFACTS = False
+    BACKGROUND_REFRESH = False
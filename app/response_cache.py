@@ -0,0 +1,83 @@
+"""Response cache for the paginated data endpoints."""
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+from urllib.parse import urlencode
+
+from flask import current_app
+
+from embrapa_api.metrics import Counter
+
+COUNTERS = {
+    "hits": "Responses served from the response cache.",
+    "misses": "Responses computed and stored in the response cache.",
+    "invalidations": "Times the cached responses of a dataset were dropped.",
+}
+
+
+class ResponseCache:
+    """Caches endpoint payloads keyed on dataset, snapshot and query arguments.
+
+    Entries are stored in the Flask-Caching backend. Each key carries the
+    snapshot version and a per-dataset generation, so installing a new snapshot
+    (or calling ``invalidate``) makes every older entry of that dataset
+    unreachable without touching the other datasets.
+
+    Hits, misses and invalidations are counted per dataset; with a metrics
+    ``registry`` the counters are also exported on ``/metrics`` as
+    ``embrapa_response_cache_<counter>_total``.
+    """
+
+    def __init__(self, cache, store=None, registry=None):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = defaultdict(int)
+        metric = Counter if registry is None else registry.counter
+        self._counters = {
+            counter: metric(
+                f"embrapa_response_cache_{counter}_total", documentation, ("dataset",)
+            )
+            for counter, documentation in COUNTERS.items()
+        }
+        if store is not None:
+            store.subscribe(lambda snapshot: self.invalidate(snapshot.name))
+
+    def key(self, dataset: str, version: str, query: Dict) -> str:
+        generation = self._generations[dataset]
+        return (
+            f"resp:{dataset}:{generation}:{version}:{urlencode(sorted(query.items()))}"
+        )
+
+    def get_or_set(
+        self, dataset: str, version: str, query: Dict, compute: Callable[[], Dict]
+    ) -> Tuple[Dict, bool]:
+        """Return the cached payload for the query, computing it on a miss.
+
+        The second element of the result tells whether it was a cache hit.
+        """
+        key = self.key(dataset, version, query)
+        payload = self.cache.get(key)
+        if payload is not None:
+            self._counters["hits"].inc(dataset=dataset)
+            return payload, True
+        self._counters["misses"].inc(dataset=dataset)
+        payload = compute()
+        timeout = current_app.config.get("RESPONSE_CACHE_TIMEOUT", 3600)
+        self.cache.set(key, payload, timeout=timeout)
+        return payload, False
+
+    def invalidate(self, dataset: str):
+        """Drop every cached response of a dataset."""
+        with self._lock:
+            self._generations[dataset] += 1
+        self._counters["invalidations"].inc(dataset=dataset)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss/invalidation counters per dataset."""
+        summary: Dict[str, Dict[str, int]] = {}
+        for counter, metric in self._counters.items():
+            for (dataset,), value in metric.collect().items():
+                counters = summary.setdefault(dataset, dict.fromkeys(COUNTERS, 0))
+                counters[counter] = int(value)
+        return summary
@@ -1,16 +1,37 @@
-import io
-from flask import Blueprint, jsonify, render_template, request, send_file
-from app import cache
-from embrapa_api.preprocessing.preprocessors import (
-    ComercializacaoPreprocessor,
-    ExportacaoPreprocessor,
-    ImportacaoPreprocessor,
-    ProcessamentoPreprocessor,
-    ProducaoPreprocessor,
+import base64
+import binascii
+import os
+
+from flask import (
+    Blueprint,
+    current_app,
+    jsonify,
+    render_template,
+    request,
+    send_file,
+    stream_with_context,
 )
+from werkzeug.datastructures import MultiDict
+
+from app import response_cache, store
+from embrapa_api.artifacts import DOWNLOAD_ENCODINGS, downloads_folder, render_download
+from embrapa_api.metrics import stage
+from embrapa_api.store import SEARCH_COLUMNS
 
 bp = Blueprint('main', __name__)
 
+YEAR_COLUMN = 'DT_ANO'
+
+# campos aceitos como filtro de igualdade nos endpoints de dados
+FILTER_FIELDS = {
+    'producao': ['ID_PRODUTO'],
+    'processamento': ['ID_UVA_PROCESSADA'],
+    'comercializacao': ['NM_PRODUTO'],
+    'importacao': ['NM_ITEM', 'NM_PAIS'],
+    'exportacao': ['NM_ITEM', 'NM_PAIS'],
+}
+STALE_CURSOR_MESSAGE = 'O dataset foi atualizado; recomece a paginação sem cursor.'
+
 
 @bp.route('/')
 def index():
@@ -18,16 +39,38 @@ def index():
     return render_template('index.html')
 
 
-def generate_csv_response(data, filename):
-    output = io.StringIO()
-    data.to_csv(output, index=False)
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode()),
+def generate_csv_response(snapshot, filename):
+    """Serve o CSV pré-renderado do snapshot, comprimido conforme Accept-Encoding.
+
+    O ETag é derivado da versão do snapshot e da codificação, então downloads
+    repetidos com If-None-Match recebem 304 sem reenviar o arquivo.
+    """
+    encoding = request.accept_encodings.best_match(
+        DOWNLOAD_ENCODINGS, default='identity'
+    )
+    folder = downloads_folder(current_app.config)
+
+    def render():
+        return render_download(
+            snapshot.data, folder, snapshot.name, snapshot.version, encoding
+        )
+
+    path = snapshot.derived(('download', folder, encoding), render)
+    if not os.path.exists(path):
+        # removido por um build ou por outro worker: renderiza de novo
+        path = render()
+    response = send_file(
+        path,
         mimetype='text/csv',
         as_attachment=True,
         download_name=filename,
+        etag=f'{snapshot.version}-{encoding}',
+        conditional=True,
     )
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 @bp.route('/download_producao')
@@ -43,9 +86,7 @@ def download_producao():
               type: string
               format: binary
     """
-    preprocessor = ProducaoPreprocessor()
-    data = preprocessor.preprocess()
-    return generate_csv_response(data, "producao.csv")
+    return generate_csv_response(store.get('producao'), "producao.csv")
 
 
 @bp.route('/download_processamento')
@@ -61,9 +102,7 @@ def download_processamento():
               type: string
               format: binary
     """
-    preprocessor = ProcessamentoPreprocessor()
-    data = preprocessor.preprocess()
-    return generate_csv_response(data, "processamento.csv")
+    return generate_csv_response(store.get('processamento'), "processamento.csv")
 
 
 @bp.route('/download_comercializacao')
@@ -79,9 +118,7 @@ def download_comercializacao():
               type: string
               format: binary
     """
-    preprocessor = ComercializacaoPreprocessor()
-    data = preprocessor.preprocess()
-    return generate_csv_response(data, "comercializacao.csv")
+    return generate_csv_response(store.get('comercializacao'), "comercializacao.csv")
 
 
 @bp.route('/download_importacao')
@@ -97,9 +134,7 @@ def download_importacao():
               type: string
               format: binary
     """
-    preprocessor = ImportacaoPreprocessor()
-    data = preprocessor.preprocess()
-    return generate_csv_response(data, "importacao.csv")
+    return generate_csv_response(store.get('importacao'), "importacao.csv")
 
 
 @bp.route('/download_exportacao')
@@ -115,17 +150,13 @@ def download_exportacao():
               type: string
               format: binary
     """
-    preprocessor = ExportacaoPreprocessor()
-    data = preprocessor.preprocess()
-    return generate_csv_response(data, "exportacao.csv")
+    return generate_csv_response(store.get('exportacao'), "exportacao.csv")
 
 
 @bp.route('/producao')
 def producao():
     """Endpoint para visualização da tabela de Produção."""
-    preprocessor = ProducaoPreprocessor()
-    data = preprocessor.preprocess()
-    unique_ids = data['ID_PRODUTO'].unique().tolist()
+    unique_ids = store.get('producao').facet('ID_PRODUTO')
     return render_template(
         'table.html',
         title="Produção",
@@ -138,9 +169,7 @@ def producao():
 @bp.route('/processamento')
 def processamento():
     """Endpoint para visualização da tabela de Processamento."""
-    preprocessor = ProcessamentoPreprocessor()
-    data = preprocessor.preprocess()
-    unique_ids = data['ID_UVA_PROCESSADA'].unique().tolist()
+    unique_ids = store.get('processamento').facet('ID_UVA_PROCESSADA')
     return render_template(
         'table.html',
         title="Processamento",
@@ -153,9 +182,7 @@ def processamento():
 @bp.route('/comercializacao')
 def comercializacao():
     """Endpoint para visualização da tabela de Comercialização."""
-    preprocessor = ComercializacaoPreprocessor()
-    data = preprocessor.preprocess()
-    unique_ids = data['NM_PRODUTO'].unique().tolist()
+    unique_ids = store.get('comercializacao').facet('NM_PRODUTO')
     return render_template(
         'table.html',
         title="Comercialização",
@@ -168,10 +195,9 @@ def comercializacao():
 @bp.route('/importacao')
 def importacao():
     """Endpoint para visualização da tabela de Importação."""
-    preprocessor = ImportacaoPreprocessor()
-    data = preprocessor.preprocess()
-    unique_items = data['NM_ITEM'].unique().tolist()
-    unique_countries = data['NM_PAIS'].unique().tolist()
+    snapshot = store.get('importacao')
+    unique_items = snapshot.facet('NM_ITEM')
+    unique_countries = snapshot.facet('NM_PAIS')
     return render_template(
         'table.html',
         title="Importação",
@@ -185,10 +211,9 @@ def importacao():
 @bp.route('/exportacao')
 def exportacao():
     """Endpoint para visualização da tabela de Exportação."""
-    preprocessor = ExportacaoPreprocessor()
-    data = preprocessor.preprocess()
-    unique_items = data['NM_ITEM'].unique().tolist()
-    unique_countries = data['NM_PAIS'].unique().tolist()
+    snapshot = store.get('exportacao')
+    unique_items = snapshot.facet('NM_ITEM')
+    unique_countries = snapshot.facet('NM_PAIS')
     return render_template(
         'table.html',
         title="Exportação",
@@ -199,18 +224,243 @@ def exportacao():
     )
 
 
-def apply_pagination(df, start, length):
-    return df.iloc[start:start + length]
+def apply_filters(snapshot, filters, filter_fields):
+    """Posições das linhas que atendem aos filtros, via índices do snapshot.
+
+    Um filtro pode trazer vários valores (tupla), combinados com OU; campos
+    diferentes são combinados com E. ``search`` mantém as linhas cujo nome
+    (``SEARCH_COLUMNS``) tem uma palavra iniciada pelo termo, sem diferenciar
+    acentos e maiúsculas. ``year_from``/``year_to`` restringem o
+    ``DT_ANO`` (limites inclusivos) por busca binária nas posições ordenadas
+    por ano. Retorna None quando nenhum filtro foi informado.
+    """
+    active = {
+        field: filters[field]
+        for field in filter_fields
+        if field in filters and filters[field]
+    }
+    if 'search' in filters:
+        # o termo vira a lista de nomes que o contem, intersectada com o filtro
+        column = SEARCH_COLUMNS[snapshot.name][0]
+        found = snapshot.search_index(column).matches(filters['search'])
+        if column in active:
+            selected = active[column]
+            selected = {selected} if isinstance(selected, str) else set(selected)
+            found = [value for value in found if value in selected]
+        active[column] = found
+    ranges = {}
+    if 'year_from' in filters or 'year_to' in filters:
+        ranges[YEAR_COLUMN] = (filters.get('year_from'), filters.get('year_to'))
+    return snapshot.positions(active, ranges)
+
+
+class StaleCursor(Exception):
+    """Cursor gerado para uma versão do dataset que não é mais a atual."""
+
 
+def encode_cursor(version, position):
+    """Cursor opaco que continua a paginação após a linha ``position``."""
+    token = f'{version}:{position}'.encode()
+    return base64.urlsafe_b64encode(token).decode().rstrip('=')
 
-def apply_filters(df, filters, filter_fields):
+
+def decode_cursor(token):
+    """Versão do snapshot e posição da última linha entregue de um cursor.
+
+    Levanta ValueError se o token não foi gerado por ``encode_cursor``.
+    """
+    padded = token + '=' * (-len(token) % 4)
+    try:
+        version, position = base64.urlsafe_b64decode(padded).decode().split(':')
+        if int(position) < 0:
+            raise ValueError(position)
+        return version, int(position)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f'Cursor inválido: {token!r}') from None
+
+
+def filter_values(args, field, known):
+    """Valores de um filtro: parâmetros repetidos e listas separadas por vírgula.
+
+    Um valor existente no dataset (``known``) é usado inteiro, mesmo com
+    vírgulas, como "Coreia do Sul, República". Os demais são separados nas
+    vírgulas e os pedaços são remontados, do mais longo ao mais curto, em
+    valores existentes: "Chile,Coreia do Sul, República" são dois países.
+    Um pedaço que não forma nenhum valor existente levanta ValueError, em vez
+    de não casar com nenhuma linha em silêncio.
+    """
+    values = []
+    for raw in args.getlist(field):
+        if raw in known or ',' not in raw:
+            values.append(raw)
+            continue
+        parts = raw.split(',')
+        start = 0
+        while start < len(parts):
+            for stop in range(len(parts), start, -1):
+                joined = ','.join(parts[start:stop])
+                # ha nomes no dataset com espacos nas pontas
+                value = joined if joined in known else joined.strip()
+                if value in known:
+                    break
+            else:
+                stop = start + 1
+                if value:
+                    raise ValueError(f'Valor inexistente em {field}: {value}')
+            if value:
+                values.append(value)
+            start = stop
+    return [value for value in values if value]
+
+
+def parse_query(args, filter_fields, snapshot):
+    """Normaliza os argumentos que afetam a resposta de um endpoint de dados.
+
+    Parâmetros extras do DataTables (ordenação, ``_`` anti-cache etc.) e o
+    ``draw`` (apenas validado) ficam fora da consulta, para que requisições
+    equivalentes compartilhem a mesma entrada de cache; pelo mesmo motivo, os
+    valores de um filtro com vários valores são ordenados. Com ``cursor``, a
+    página começa após a linha indicada por ele e o ``start`` é ignorado;
+    cursores de outra versão do snapshot levantam ``StaleCursor``.
+    ``length=-1`` retorna todas as linhas a partir do início da página.
+    ``fields`` limita as colunas retornadas. Valores não inteiros em ``draw``,
+    ``start``, ``length``, ``year_from`` ou ``year_to``, ``start`` ou
+    ``length`` negativos (exceto -1) e colunas inexistentes levantam
+    ValueError.
+    """
+    # importado sob demanda: o unidecode so e necessario com busca
+    from embrapa_api.search import fold
+
+    # o draw so e ecoado na resposta, mas um valor invalido deve dar 400
+    int(args.get('draw', 1))
+    length = int(args.get('length', 10))
+    if length < -1:
+        raise ValueError(f'length inválido: {length}')
+    # -1 é o "todos" do DataTables
+    query = {'length': None if length == -1 else length}
+    if args.get('cursor'):
+        cursor_version, query['after'] = decode_cursor(args['cursor'])
+        if cursor_version != snapshot.version:
+            raise StaleCursor(cursor_version)
+    else:
+        query['start'] = int(args.get('start', 0))
+        if query['start'] < 0:
+            raise ValueError(f'start inválido: {query["start"]}')
     for field in filter_fields:
-        if field in filters and filters[field]:
-            df = df[df[field] == str(filters[field])]
-    return df
+        values = sorted(set(filter_values(args, field, snapshot.index(field))))
+        if len(values) == 1:
+            query[field] = values[0]
+        elif values:
+            query[field] = tuple(values)
+    for bound in ('year_from', 'year_to'):
+        if args.get(bound):
+            query[bound] = int(args[bound])
+    fields = [
+        field.strip()
+        for value in args.getlist('fields')
+        for field in value.split(',')
+        if field.strip()
+    ]
+    for field in fields:
+        if field not in snapshot.data.columns:
+            raise ValueError(f'Coluna inexistente: {field}')
+    if fields:
+        query['fields'] = tuple(dict.fromkeys(fields))
+    # ``search[value]`` é a caixa de busca do DataTables
+    term = fold(args.get('search') or args.get('search[value]') or '')
+    if term:
+        query['search'] = term
+    return query
+
+
+def page_start(positions, query):
+    """Índice, no conjunto filtrado, da primeira linha da página.
+
+    As posições das linhas são estáveis dentro de um snapshot, então o cursor
+    guarda a posição da última linha entregue e a página seguinte começa logo
+    após ela, por busca binária nas posições filtradas.
+    """
+    if 'after' not in query:
+        return query['start']
+    if positions is None:
+        return query['after'] + 1
+    return int(positions.searchsorted(query['after'], side='right'))
+
+
+def error_response(status, message):
+    return jsonify({'error': message}), status
+
+
+def data_body(dataset, snapshot, query):
+    """Corpo JSON (sem o ``draw``) de uma consulta já normalizada.
+
+    O corpo é codificado uma única vez e guardado já em JSON no cache de
+    respostas. Retorna o corpo e se ele veio do cache.
+    """
+    filter_fields = FILTER_FIELDS[dataset]
+
+    def compute():
+        # importado sob demanda: a serializacao traz o pandas para o processo
+        from embrapa_api.serialization import encode, records
+
+        data = snapshot.data
+        total_records = len(data)
+
+        # Aplicar filtros
+        with stage(dataset, 'filter'):
+            positions = apply_filters(snapshot, query, filter_fields)
+
+        # Paginação
+        with stage(dataset, 'paginate'):
+            filtered_records = total_records if positions is None else len(positions)
+            start = page_start(positions, query)
+            stop = filtered_records
+            if query['length'] is not None:
+                stop = min(start + query['length'], filtered_records)
+            if 'fields' in query:
+                data = data[list(query['fields'])]
+            if positions is None:
+                paginated_data = data.iloc[start:stop]
+                last = stop - 1
+            else:
+                paginated_data = data.iloc[positions[start:stop]]
+                last = int(positions[stop - 1]) if stop > 0 else -1
+            next_cursor = None
+            if start < stop < filtered_records:
+                next_cursor = encode_cursor(snapshot.version, last)
+
+        with stage(dataset, 'serialize'):
+            return encode(
+                {
+                    "recordsTotal": total_records,
+                    "recordsFiltered": filtered_records,
+                    "next_cursor": next_cursor,
+                    "data": records(paginated_data),
+                }
+            )
+
+    return response_cache.get_or_set(dataset, snapshot.version, query, compute)
+
+
+def data_response(dataset):
+    """Resposta paginada e filtrada de um dataset, servida pelo cache de respostas."""
+    snapshot = store.get(dataset)
+    try:
+        query = parse_query(request.args, FILTER_FIELDS[dataset], snapshot)
+    except StaleCursor:
+        return error_response(409, STALE_CURSOR_MESSAGE)
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    body, hit = data_body(dataset, snapshot, query)
+    draw = int(request.args.get('draw', 1))
+    response = current_app.response_class(
+        b'{"draw":%d,' % draw + body[1:], mimetype='application/json'
+    )
+    response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
 
 
-@cache.cached(timeout=3600, key_prefix='producao_data')
 @bp.route('/get_producao_data')
 def get_producao_data():
     """Obter dados de Produção.
@@ -225,7 +475,32 @@ def get_producao_data():
         in: query
         type: integer
         required: false
-        description: Número de registros a serem retornados
+        description: Número de registros a serem retornados (-1 para todos)
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Cursor next_cursor da página anterior (substitui o start)
+      - name: year_from
+        in: query
+        type: integer
+        required: false
+        description: Primeiro ano (DT_ANO) incluído
+      - name: year_to
+        in: query
+        type: integer
+        required: false
+        description: Último ano (DT_ANO) incluído
+      - name: search
+        in: query
+        type: string
+        required: false
+        description: Prefixo de uma palavra do nome, sem diferenciar acentos
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Colunas retornadas, separadas por vírgula (padrão todas)
       - name: ID_PRODUTO
         in: query
         type: string
@@ -250,32 +525,9 @@ def get_producao_data():
               TIPO_PRODUTO:
                 type: string
     """
-    preprocessor = ProducaoPreprocessor()
-    data = preprocessor.preprocess()
-    total_records = len(data)
+    return data_response('producao')
 
-    # Aplicar filtros
-    filters = request.args.to_dict()
-    data = apply_filters(data, filters, ["ID_PRODUTO"])
-    filtered_records = len(data)
-
-    # Paginação
-    start = int(request.args.get('start', 0))
-    length = int(request.args.get('length', 10))
-
-    paginated_data = apply_pagination(data, start, length)
-
-    return jsonify(
-        {
-            "draw": int(request.args.get('draw', 1)),
-            "recordsTotal": total_records,
-            "recordsFiltered": filtered_records,
-            "data": paginated_data.to_dict(orient='records'),
-        }
-    )
 
-
-@cache.cached(timeout=3600, key_prefix='processamento_data')
 @bp.route('/get_processamento_data')
 def get_processamento_data():
     """Obter dados de Processamento.
@@ -290,7 +542,32 @@ def get_processamento_data():
         in: query
         type: integer
         required: false
-        description: Número de registros a serem retornados
+        description: Número de registros a serem retornados (-1 para todos)
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Cursor next_cursor da página anterior (substitui o start)
+      - name: year_from
+        in: query
+        type: integer
+        required: false
+        description: Primeiro ano (DT_ANO) incluído
+      - name: year_to
+        in: query
+        type: integer
+        required: false
+        description: Último ano (DT_ANO) incluído
+      - name: search
+        in: query
+        type: string
+        required: false
+        description: Prefixo de uma palavra do nome, sem diferenciar acentos
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Colunas retornadas, separadas por vírgula (padrão todas)
       - name: ID_UVA_PROCESSADA
         in: query
         type: string
@@ -317,32 +594,9 @@ def get_processamento_data():
               CD_TIPO_UVA:
                 type: string
     """
-    preprocessor = ProcessamentoPreprocessor()
-    data = preprocessor.preprocess()
-    total_records = len(data)
-
-    # Aplicar filtros
-    filters = request.args.to_dict()
-    data = apply_filters(data, filters, ["ID_UVA_PROCESSADA"])
-    filtered_records = len(data)
-
-    # Paginação
-    start = int(request.args.get('start', 0))
-    length = int(request.args.get('length', 10))
-
-    paginated_data = apply_pagination(data, start, length)
-
-    return jsonify(
-        {
-            "draw": int(request.args.get('draw', 1)),
-            "recordsTotal": total_records,
-            "recordsFiltered": filtered_records,
-            "data": paginated_data.to_dict(orient='records'),
-        }
-    )
+    return data_response('processamento')
 
 
-@cache.cached(timeout=3600, key_prefix='comercializacao_data')
 @bp.route('/get_comercializacao_data')
 def get_comercializacao_data():
     """Obter dados de Comercialização.
@@ -357,7 +611,32 @@ def get_comercializacao_data():
         in: query
         type: integer
         required: false
-        description: Número de registros a serem retornados
+        description: Número de registros a serem retornados (-1 para todos)
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Cursor next_cursor da página anterior (substitui o start)
+      - name: year_from
+        in: query
+        type: integer
+        required: false
+        description: Primeiro ano (DT_ANO) incluído
+      - name: year_to
+        in: query
+        type: integer
+        required: false
+        description: Último ano (DT_ANO) incluído
+      - name: search
+        in: query
+        type: string
+        required: false
+        description: Prefixo de uma palavra do nome, sem diferenciar acentos
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Colunas retornadas, separadas por vírgula (padrão todas)
       - name: NM_PRODUTO
         in: query
         type: string
@@ -382,32 +661,9 @@ def get_comercializacao_data():
               TIPO_PRODUTO:
                 type: string
     """
-    preprocessor = ComercializacaoPreprocessor()
-    data = preprocessor.preprocess()
-    total_records = len(data)
-
-    # Aplicar filtros
-    filters = request.args.to_dict()
-    data = apply_filters(data, filters, ["NM_PRODUTO"])
-    filtered_records = len(data)
+    return data_response('comercializacao')
 
-    # Paginação
-    start = int(request.args.get('start', 0))
-    length = int(request.args.get('length', 10))
 
-    paginated_data = apply_pagination(data, start, length)
-
-    return jsonify(
-        {
-            "draw": int(request.args.get('draw', 1)),
-            "recordsTotal": total_records,
-            "recordsFiltered": filtered_records,
-            "data": paginated_data.to_dict(orient='records'),
-        }
-    )
-
-
-@cache.cached(timeout=3600, key_prefix='importacao_data')
 @bp.route('/get_importacao_data')
 def get_importacao_data():
     """Obter dados de Importação.
@@ -422,7 +678,32 @@ def get_importacao_data():
         in: query
         type: integer
         required: false
-        description: Número de registros a serem retornados
+        description: Número de registros a serem retornados (-1 para todos)
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Cursor next_cursor da página anterior (substitui o start)
+      - name: year_from
+        in: query
+        type: integer
+        required: false
+        description: Primeiro ano (DT_ANO) incluído
+      - name: year_to
+        in: query
+        type: integer
+        required: false
+        description: Último ano (DT_ANO) incluído
+      - name: search
+        in: query
+        type: string
+        required: false
+        description: Prefixo de uma palavra do nome, sem diferenciar acentos
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Colunas retornadas, separadas por vírgula (padrão todas)
       - name: NM_ITEM
         in: query
         type: string
@@ -452,32 +733,9 @@ def get_importacao_data():
               VL_VALOR_IMPORTADO_USD:
                 type: number
     """
-    preprocessor = ImportacaoPreprocessor()
-    data = preprocessor.preprocess()
-    total_records = len(data)
-
-    # Aplicar filtros
-    filters = request.args.to_dict()
-    data = apply_filters(data, filters, ["NM_ITEM", "NM_PAIS"])
-    filtered_records = len(data)
-
-    # Paginação
-    start = int(request.args.get('start', 0))
-    length = int(request.args.get('length', 10))
-
-    paginated_data = apply_pagination(data, start, length)
-
-    return jsonify(
-        {
-            "draw": int(request.args.get('draw', 1)),
-            "recordsTotal": total_records,
-            "recordsFiltered": filtered_records,
-            "data": paginated_data.to_dict(orient='records'),
-        }
-    )
+    return data_response('importacao')
 
 
-@cache.cached(timeout=3600, key_prefix='exportacao_data')
 @bp.route('/get_exportacao_data')
 def get_exportacao_data():
     """Obter dados de Exportação.
@@ -492,7 +750,32 @@ def get_exportacao_data():
         in: query
         type: integer
         required: false
-        description: Número de registros a serem retornados
+        description: Número de registros a serem retornados (-1 para todos)
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Cursor next_cursor da página anterior (substitui o start)
+      - name: year_from
+        in: query
+        type: integer
+        required: false
+        description: Primeiro ano (DT_ANO) incluído
+      - name: year_to
+        in: query
+        type: integer
+        required: false
+        description: Último ano (DT_ANO) incluído
+      - name: search
+        in: query
+        type: string
+        required: false
+        description: Prefixo de uma palavra do nome, sem diferenciar acentos
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Colunas retornadas, separadas por vírgula (padrão todas)
       - name: NM_ITEM
         in: query
         type: string
@@ -522,26 +805,284 @@ def get_exportacao_data():
               VL_VALOR_EXPORTADO_USD:
                 type: number
     """
-    preprocessor = ExportacaoPreprocessor()
-    data = preprocessor.preprocess()
-    total_records = len(data)
+    return data_response('exportacao')
+
+
+def parse_aggregate_query(args, dimensions):
+    """Normaliza os argumentos de uma agregação.
+
+    ``group_by`` e ``measures`` são listas separadas por vírgula; cada medida é
+    ``COLUNA`` ou ``COLUNA:agregação`` (sum, mean ou count; padrão sum). Os
+    demais argumentos com o nome de uma dimensão viram filtros de igualdade;
+    um ``DT_ANO`` que não é inteiro levanta ValueError.
+    """
+
+    def items(name):
+        return [part.strip() for part in args.get(name, '').split(',') if part.strip()]
+
+    query = {
+        'view': 'aggregate',
+        'group_by': ','.join(items('group_by')),
+        'measures': ','.join(
+            measure if ':' in measure else f'{measure}:sum'
+            for measure in items('measures')
+        ),
+    }
+    for dimension in dimensions:
+        if args.get(dimension):
+            query[dimension] = str(args[dimension])
+    if YEAR_COLUMN in query:
+        # como year_from/year_to nos endpoints de dados: ano não inteiro é 400
+        query[YEAR_COLUMN] = str(int(query[YEAR_COLUMN]))
+    return query
+
+
+@bp.route('/aggregate/<dataset>')
+def aggregate(dataset):
+    """Agregar medidas de um dataset por dimensões.
+    ---
+    parameters:
+      - name: dataset
+        in: path
+        type: string
+        required: true
+        enum: [producao, processamento, comercializacao, importacao, exportacao]
+      - name: group_by
+        in: query
+        type: string
+        required: false
+        description: Dimensões separadas por vírgula (ex. DT_ANO,NM_PAIS)
+      - name: measures
+        in: query
+        type: string
+        required: false
+        description: >-
+          Medidas separadas por vírgula, com agregação sum, mean ou count
+          (ex. VL_VALOR_EXPORTADO_USD:sum,QTD_EXPORTADO_KG:mean); padrão: soma
+          de todas as medidas
+      - name: DT_ANO
+        in: query
+        type: string
+        required: false
+        description: Filtro por ano (qualquer dimensão do dataset pode filtrar)
+    responses:
+      200:
+        description: Uma linha por grupo, com as dimensões e as medidas agregadas
+      400:
+        description: Dimensão, medida ou agregação inválida, ou ano não inteiro
+      404:
+        description: Dataset inexistente
+    """
+    # importado sob demanda: o cubo traz o pandas para o processo
+    from embrapa_api.rollups import DIMENSIONS, MEASURES
 
-    # Aplicar filtros
-    filters = request.args.to_dict()
-    data = apply_filters(data, filters, ["NM_ITEM", "NM_PAIS"])
-    filtered_records = len(data)
+    if dataset not in MEASURES:
+        return error_response(404, f'Dataset inexistente: {dataset}')
+    snapshot = store.get(dataset)
+    try:
+        query = parse_aggregate_query(request.args, DIMENSIONS[dataset])
+    except ValueError as e:
+        return error_response(400, str(e))
+    group_by = query['group_by'].split(',') if query['group_by'] else []
+    if query['measures']:
+        measures = [tuple(item.split(':', 1)) for item in query['measures'].split(',')]
+    else:
+        measures = [(measure, 'sum') for measure in MEASURES[dataset]]
+    filters = {
+        dimension: query[dimension]
+        for dimension in DIMENSIONS[dataset]
+        if dimension in query
+    }
+    try:
+        snapshot.rollups().validate(group_by, measures, filters)
+    except ValueError as e:
+        return error_response(400, str(e))
 
-    # Paginação
-    start = int(request.args.get('start', 0))
-    length = int(request.args.get('length', 10))
+    def compute():
+        from embrapa_api.serialization import encode, records
 
-    paginated_data = apply_pagination(data, start, length)
+        with stage(dataset, 'aggregate'):
+            result = snapshot.rollups().aggregate(group_by, measures, filters)
+        with stage(dataset, 'serialize'):
+            return encode({"groups": len(result), "data": records(result)})
+
+    body, hit = response_cache.get_or_set(dataset, snapshot.version, query, compute)
+    response = current_app.response_class(body, mimetype='application/json')
+    response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+
+@bp.route('/search/<dataset>')
+def search(dataset):
+    """Autocomplete dos nomes de um dataset.
+    ---
+    parameters:
+      - name: dataset
+        in: path
+        type: string
+        required: true
+        enum: [producao, processamento, comercializacao, importacao, exportacao]
+      - name: q
+        in: query
+        type: string
+        required: false
+        description: Prefixo de uma palavra do nome, sem diferenciar acentos
+      - name: field
+        in: query
+        type: string
+        required: false
+        description: >-
+          Coluna pesquisada (NM_PRODUTO, NM_UVA ou NM_PAIS, conforme o dataset)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Número máximo de nomes retornados (padrão 10)
+    responses:
+      200:
+        description: >-
+          Nomes encontrados, primeiro os que começam pelo termo, em ordem
+          alfabética
+      400:
+        description: Coluna ou limite inválido
+      404:
+        description: Dataset inexistente
+    """
+    if dataset not in SEARCH_COLUMNS:
+        return error_response(404, f'Dataset inexistente: {dataset}')
+    field = request.args.get('field', SEARCH_COLUMNS[dataset][0])
+    if field not in SEARCH_COLUMNS[dataset]:
+        return error_response(400, f'Coluna sem busca em {dataset}: {field}')
+    limit = request.args.get('limit', '10')
+    if not limit.isdigit():
+        return error_response(400, f'Limite inválido: {limit}')
 
+    index = store.get(dataset).search_index(field)
     return jsonify(
         {
-            "draw": int(request.args.get('draw', 1)),
-            "recordsTotal": total_records,
-            "recordsFiltered": filtered_records,
-            "data": paginated_data.to_dict(orient='records'),
+            'field': field,
+            'results': index.matches(request.args.get('q', ''), int(limit)),
         }
     )
+
+
+# chaves de uma consulta do lote, repassadas como os argumentos de /get_*_data
+BATCH_ARGS = ('start', 'length', 'cursor', 'year_from', 'year_to', 'search', 'fields')
+
+
+def spec_args(spec, filter_fields):
+    """Argumentos equivalentes aos de /get_*_data para uma consulta do lote.
+
+    ``filters`` mapeia um campo a um valor ou a uma lista de valores; listas
+    em ``fields`` viram a lista de colunas separadas por vírgula. Levanta
+    ValueError para campos que o dataset não filtra e para valores que não
+    são texto ou número.
+    """
+    args = MultiDict()
+    filters = spec.get('filters') or {}
+    if not isinstance(filters, dict):
+        raise ValueError('filters deve ser um objeto')
+    for field, values in filters.items():
+        if field not in filter_fields:
+            raise ValueError(f'Campo sem filtro: {field}')
+        for value in scalars(field, values):
+            args.add(field, value)
+    for name in BATCH_ARGS:
+        if spec.get(name) is not None:
+            args.add(name, ','.join(scalars(name, spec[name])))
+    return args
+
+
+def scalars(name, values):
+    """Texto de um valor ou de uma lista de valores de uma consulta do lote.
+
+    Objetos e listas aninhadas não têm texto que case com o dataset e
+    levantam ValueError, em vez de não casar com nada em silêncio.
+    """
+    values = values if isinstance(values, list) else [values]
+    for value in values:
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            raise ValueError(f'Valor inválido em {name}: {value!r}')
+    return [str(value) for value in values]
+
+
+@bp.route('/batch', methods=['POST'])
+def batch():
+    """Executar várias consultas de dados em uma requisição.
+    ---
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            queries:
+              type: array
+              description: >-
+                Consultas com dataset, filters (campo para valor ou lista de
+                valores), fields, start, length, cursor, year_from, year_to e
+                search, como nos endpoints /get_*_data
+              items:
+                type: object
+                properties:
+                  dataset:
+                    type: string
+                    enum: [producao, processamento, comercializacao, importacao,
+                      exportacao]
+                  filters:
+                    type: object
+                  fields:
+                    type: array
+                    items:
+                      type: string
+    responses:
+      200:
+        description: >-
+          Resultados na ordem das consultas, cada um com o dataset e o mesmo
+          corpo de /get_*_data
+      400:
+        description: Lote ou consulta inválida (``query`` indica qual)
+      409:
+        description: Cursor de uma versão anterior do dataset
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get('queries'), list):
+        return error_response(400, 'O corpo deve ser um objeto com a lista queries')
+    specs = payload['queries']
+    limit = current_app.config.get('BATCH_MAX_QUERIES', 1000)
+    if len(specs) > limit:
+        return error_response(400, f'O lote aceita no máximo {limit} consultas')
+
+    # um snapshot por dataset para o lote inteiro: todas as respostas vêm da
+    # mesma versão, mesmo se uma atualização chegar durante o streaming
+    snapshots = {}
+    queries = []
+    for number, spec in enumerate(specs):
+        try:
+            if not isinstance(spec, dict):
+                raise ValueError('Cada consulta deve ser um objeto')
+            dataset = spec.get('dataset')
+            if not isinstance(dataset, str) or dataset not in FILTER_FIELDS:
+                raise ValueError(f'Dataset inexistente: {dataset}')
+            if dataset not in snapshots:
+                snapshots[dataset] = store.get(dataset)
+            args = spec_args(spec, FILTER_FIELDS[dataset])
+            query = parse_query(args, FILTER_FIELDS[dataset], snapshots[dataset])
+        except StaleCursor:
+            return jsonify({'error': STALE_CURSOR_MESSAGE, 'query': number}), 409
+        except ValueError as e:
+            return jsonify({'error': str(e), 'query': number}), 400
+        queries.append((dataset, query))
+
+    def generate():
+        yield b'{"results":['
+        for number, (dataset, query) in enumerate(queries):
+            body, _ = data_body(dataset, snapshots[dataset], query)
+            yield b'%s{"dataset":"%s",' % (b',' if number else b'', dataset.encode())
+            yield body[1:]
+        yield b']}'
+
+    return current_app.response_class(
+        stream_with_context(generate()), mimetype='application/json'
+    )
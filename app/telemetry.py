@@ -0,0 +1,100 @@
+"""Request-level telemetry: latency, in-flight requests and response sizes."""
+
+import time
+from typing import Dict
+
+from flask import g, request
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class RequestTelemetry:
+    """Records every request served by the app on a metrics registry.
+
+    Latency and response size are histograms per endpoint and status code, and
+    the number of requests being served is a gauge per endpoint. Everything is
+    exported on ``/metrics`` and summarized in-process by ``stats``. Nothing is
+    installed when the registry is disabled (``METRICS_ENABLED``).
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.latency = registry.histogram(
+            "embrapa_request_seconds",
+            "Time spent serving each request.",
+            ("endpoint", "method", "status"),
+        )
+        self.size = registry.histogram(
+            "embrapa_response_bytes",
+            "Size of the response bodies.",
+            ("endpoint", "status"),
+            buckets=SIZE_BUCKETS,
+        )
+        self.in_flight = registry.gauge(
+            "embrapa_requests_in_flight",
+            "Requests currently being served.",
+            ("endpoint",),
+        )
+
+    def init_app(self, app):
+        if not self.registry.enabled:
+            return
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.teardown_request(self._teardown)
+
+    @staticmethod
+    def _endpoint() -> str:
+        return request.endpoint or "unmatched"
+
+    def _before(self):
+        g.telemetry_start = time.perf_counter()
+        g.telemetry_status = 500
+        self.in_flight.inc(endpoint=self._endpoint())
+
+    def _after(self, response):
+        g.telemetry_status = response.status_code
+        # respostas em stream sem Content-Length nao tem tamanho registrado
+        if response.content_length is not None:
+            self.size.observe(
+                response.content_length,
+                endpoint=self._endpoint(),
+                status=response.status_code,
+            )
+        return response
+
+    def _teardown(self, exc):
+        start = g.pop("telemetry_start", None)
+        if start is None:
+            return
+        endpoint = self._endpoint()
+        self.in_flight.dec(endpoint=endpoint)
+        self.latency.observe(
+            time.perf_counter() - start,
+            endpoint=endpoint,
+            method=request.method,
+            status=g.pop("telemetry_status", 500),
+        )
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per endpoint: requests in flight and, per status code, the request
+        count, mean latency and bytes sent."""
+        summary: Dict[str, Dict] = {}
+
+        def entry(endpoint):
+            return summary.setdefault(endpoint, {"in_flight": 0, "statuses": {}})
+
+        for (endpoint,), value in self.in_flight.collect().items():
+            entry(endpoint)["in_flight"] = int(value)
+        for (endpoint, _, status), series in self.latency.collect().items():
+            counters = entry(endpoint)["statuses"].setdefault(
+                status, {"count": 0, "total_s": 0.0, "bytes": 0}
+            )
+            counters["count"] += series["count"]
+            counters["total_s"] += series["sum"]
+            counters["mean_s"] = counters["total_s"] / counters["count"]
+        for (endpoint, status), series in self.size.collect().items():
+            counters = entry(endpoint)["statuses"].get(status)
+            if counters is not None:
+                counters["bytes"] = int(series["sum"])
+        return summary
@@ -0,0 +1,231 @@
+"""On-disk artifacts: columnar tables (Arrow IPC), facet lists and pre-rendered
+CSV downloads."""
+
+import glob
+import gzip
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager, suppress
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+from embrapa_api.config import ARTIFACTS_FOLDER
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+DOWNLOADS_SUBFOLDER = "downloads"
+CSV_CHUNK_ROWS = 5000
+
+# Content-Encoding -> file suffix of the pre-rendered downloads, preferred first
+DOWNLOAD_ENCODINGS = {"gzip": ".gz", "identity": ""}
+if brotli is not None:
+    DOWNLOAD_ENCODINGS = {"br": ".br", **DOWNLOAD_ENCODINGS}
+
+
+def downloads_folder(config: Mapping) -> str:
+    """Folder of the rendered downloads of an app (by default, the build's)."""
+    folder = config.get("DOWNLOADS_FOLDER")
+    if folder is None:
+        artifacts = config.get("ARTIFACTS_FOLDER", ARTIFACTS_FOLDER)
+        folder = os.path.join(artifacts, DOWNLOADS_SUBFOLDER)
+    return folder
+
+
+def _table_path(folder: str, name: str) -> str:
+    return os.path.join(folder, f"{name}.arrow")
+
+
+def write_table(data: "pd.DataFrame", path: str):
+    """Write a DataFrame as an uncompressed Arrow IPC file, so it can be mmapped."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def read_table(path: str) -> "pd.DataFrame":
+    """Read an Arrow IPC file through a memory map."""
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas()
+
+
+def write_artifacts(
+    snapshots: Dict, folder: str, facets: Dict[str, List[str]] = None
+) -> Dict:
+    """Persist everything needed to serve each snapshot without preprocessing.
+
+    Writes ``<name>.arrow``, the distinct values of the ``facets`` columns of
+    each dataset (``<name>.facets.json``), the CSV download in every supported
+    Content-Encoding (under ``downloads/``) and a manifest of versions.
+    Downloads of versions other than the new and the previously built ones are
+    pruned.
+    """
+    os.makedirs(folder, exist_ok=True)
+    facets = facets or {}
+    downloads_folder = os.path.join(folder, DOWNLOADS_SUBFOLDER)
+    # a running app may still serve the downloads of the previous build
+    previous = {
+        name: entry["version"]
+        for name, entry in read_manifest(folder)["datasets"].items()
+    }
+    manifest = {
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "datasets": {},
+    }
+    for name, snapshot in snapshots.items():
+        path = _table_path(folder, name)
+        write_table(snapshot.data, path)
+
+        facets_path = os.path.join(folder, f"{name}.facets.json")
+        with open(facets_path, "w", encoding="utf-8") as file:
+            values = {column: snapshot.facet(column) for column in facets.get(name, [])}
+            json.dump(values, file, ensure_ascii=False)
+
+        downloads = {
+            encoding: os.path.basename(
+                render_download(
+                    snapshot.data, downloads_folder, name, snapshot.version, encoding
+                )
+            )
+            for encoding in DOWNLOAD_ENCODINGS
+        }
+        manifest["datasets"][name] = {
+            "file": os.path.basename(path),
+            "facets": os.path.basename(facets_path),
+            "downloads": downloads,
+            "version": snapshot.version,
+            "rows": len(snapshot.data),
+        }
+        logger.info(f"Wrote artifact {path} ({len(snapshot.data)} rows).")
+        prune_downloads(
+            downloads_folder, name, {snapshot.version, previous.get(name)} - {None}
+        )
+
+    with open(os.path.join(folder, MANIFEST_FILE), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+def read_manifest(folder: str) -> Dict:
+    """Return the artifact manifest of ``folder``, or an empty one if missing."""
+    path = os.path.join(folder, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {"datasets": {}}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def read_artifacts(folder: str) -> Dict[str, Dict]:
+    """Load every table listed in the manifest of ``folder``.
+
+    Returns ``{name: {"data": DataFrame, "version": str, "facets": dict}}``,
+    where ``facets`` maps columns to their distinct values (empty when the
+    artifacts predate facet lists).
+    """
+    return {
+        name: read_artifact(folder, entry)
+        for name, entry in read_manifest(folder)["datasets"].items()
+    }
+
+
+def read_artifact(folder: str, entry: Dict) -> Dict:
+    """Load the table and facets of one manifest entry (see ``read_artifacts``)."""
+    facets = {}
+    if "facets" in entry:
+        with open(os.path.join(folder, entry["facets"]), encoding="utf-8") as file:
+            facets = json.load(file)
+    return {
+        "data": read_table(os.path.join(folder, entry["file"])),
+        "version": entry["version"],
+        "facets": facets,
+    }
+
+
+def iter_csv(data: "pd.DataFrame", chunk_rows: int = CSV_CHUNK_ROWS):
+    """Yield the CSV of ``data`` as encoded blocks of ``chunk_rows`` rows."""
+    for start in range(0, max(len(data), 1), chunk_rows):
+        chunk = data.iloc[start : start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode()
+
+
+@contextmanager
+def _encoded_writer(path: str, encoding: str):
+    """Open ``path`` and yield a ``write(bytes)`` callable compressing with
+    ``encoding``."""
+    with open(path, "wb") as raw:
+        if encoding == "gzip":
+            # mtime=0 keeps the output deterministic across builds
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as compressed:
+                yield compressed.write
+        elif encoding == "br":
+            compressor = brotli.Compressor()
+            yield lambda chunk: raw.write(compressor.process(chunk))
+            raw.write(compressor.finish())
+        else:
+            yield raw.write
+
+
+def render_download(
+    data: "pd.DataFrame", folder: str, name: str, version: str, encoding: str
+) -> str:
+    """Write the CSV of a snapshot in the given Content-Encoding, once per version.
+
+    Files are named after the snapshot version, so an existing file is reused
+    as is. Renders of other versions are left in place: requests (and other
+    workers) may still be serving them; ``prune_downloads`` removes them
+    outside the request path.
+    """
+    suffix = DOWNLOAD_ENCODINGS[encoding]
+    path = os.path.join(folder, f"{name}-{version}.csv{suffix}")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with _encoded_writer(tmp_path, encoding) as write:
+        for chunk in iter_csv(data):
+            write(chunk)
+    os.replace(tmp_path, path)
+    logger.info(f"Rendered download {path}.")
+    return path
+
+
+def prune_downloads(folder: str, name: str, keep: Iterable[str]) -> List[str]:
+    """Remove the rendered downloads of ``name`` whose version is not in ``keep``.
+
+    Files still being written (``.tmp``) are left alone. Returns the removed
+    paths.
+    """
+    keep = set(keep)
+    prefix = f"{name}-"
+    removed = []
+    for path in glob.glob(os.path.join(folder, f"{prefix}*.csv*")):
+        filename = os.path.basename(path)
+        if filename.endswith(".tmp"):
+            continue
+        version = filename[len(prefix) :].split(".csv", 1)[0]
+        if version not in keep:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+                removed.append(path)
+    if removed:
+        logger.info(f"Removed {len(removed)} old downloads of {name}.")
+    return removed
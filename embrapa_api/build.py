@@ -0,0 +1,50 @@
+"""Build step that precomputes everything the app serves as on-disk artifacts.
+
+Usage::
+
+    python -m embrapa_api.build [--local] [--output FOLDER]
+"""
+
+import argparse
+import logging
+
+from flask import Flask
+
+from embrapa_api.artifacts import write_artifacts
+from embrapa_api.config import ARTIFACTS_FOLDER
+from embrapa_api.store import FACETS, DatasetStore
+
+logger = logging.getLogger(__name__)
+
+
+def build(folder: str = ARTIFACTS_FOLDER, use_local: bool = False):
+    """Run every preprocessor once and write its artifacts to ``folder``.
+
+    Besides the refined tables, the facet lists of the views and the CSV
+    downloads (plain and compressed) are rendered, so the app can serve every
+    route from ``folder`` alone.
+    """
+    app = Flask(__name__)
+    app.config.update(USE_LOCAL_DATA=use_local)
+    store = DatasetStore()
+    with app.app_context():
+        snapshots = {name: store.get(name) for name in store.preprocessors}
+    return write_artifacts(snapshots, folder, FACETS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=ARTIFACTS_FOLDER)
+    parser.add_argument(
+        "--local", action="store_true", help="Use the bundled CSVs instead of the URLs."
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    manifest = build(args.output, use_local=args.local)
+    for name, entry in manifest["datasets"].items():
+        logger.info(f"{name}: {entry['rows']} rows, version {entry['version']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,5 @@ import os
 PROJECT_FOLDER = os.path.dirname(os.path.abspath(__file__)).replace('/embrapa_api', '')
 DATA_FOLDER = f'{PROJECT_FOLDER}/data'
 CSV_FILES_FOLDER = f'{DATA_FOLDER}/csv_files'
+MIRROR_FOLDER = f'{DATA_FOLDER}/mirror'
+ARTIFACTS_FOLDER = f'{DATA_FOLDER}/artifacts'
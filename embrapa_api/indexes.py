@@ -0,0 +1,188 @@
+"""Row-position indexes built once per dataset snapshot."""
+
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+EMPTY_POSITIONS = np.empty(0, dtype=np.intp)
+
+# columns with more distinct values than this resolve value lists on the hash
+# index: their bitmaps would take ``values x rows / 8`` bytes
+BITMAP_MAX_VALUES = 64
+
+
+class HashIndex:
+    """Maps each distinct value of a column to the sorted positions holding it."""
+
+    def __init__(self, values: pd.Series):
+        codes, uniques = pd.factorize(values)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        self._positions = {
+            value: order[bounds[code] : bounds[code + 1]]
+            for code, value in enumerate(uniques)
+        }
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, value) -> bool:
+        return value in self._positions
+
+    def values(self):
+        return list(self._positions)
+
+    def lookup(self, value) -> np.ndarray:
+        """Positions of the rows equal to ``value``, in table order."""
+        return self._positions.get(value, EMPTY_POSITIONS)
+
+    def lookup_any(self, values: Iterable) -> np.ndarray:
+        """Positions of the rows equal to any of ``values``, in table order.
+
+        The position arrays of distinct values are disjoint, so their union is
+        a concatenation and a sort.
+        """
+        found = [self.lookup(value) for value in dict.fromkeys(values)]
+        if not found:
+            return EMPTY_POSITIONS
+        if len(found) == 1:
+            return found[0]
+        return np.sort(np.concatenate(found))
+
+
+class BitmapIndex:
+    """One packed bitmap per distinct value of a column.
+
+    Bit ``i`` of a value's bitmap is set when row ``i`` holds the value, so an
+    IN-list is the OR of a few bitmaps and filters on several columns are the
+    AND of those, at one bit per row. Memory is ``values x rows / 8`` bytes,
+    so it is only built for columns with up to ``BITMAP_MAX_VALUES`` values.
+    """
+
+    def __init__(self, values: pd.Series):
+        codes, uniques = pd.factorize(values)
+        self.size = len(values)
+        self._codes = {value: code for code, value in enumerate(uniques)}
+        self._bitmaps = np.zeros((len(uniques), (self.size + 7) // 8), dtype=np.uint8)
+        rows = np.flatnonzero(codes >= 0)
+        # mesmo layout do np.packbits: a linha 0 e o bit mais significativo
+        bits = (128 >> (rows & 7)).astype(np.uint8)
+        np.bitwise_or.at(self._bitmaps, (codes[rows], rows >> 3), bits)
+
+    def __len__(self):
+        return len(self._codes)
+
+    def lookup(self, values: Iterable) -> np.ndarray:
+        """Bitmap of the rows holding any of ``values``."""
+        codes = [self._codes[value] for value in values if value in self._codes]
+        if not codes:
+            return np.zeros(self._bitmaps.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(self._bitmaps[codes], axis=0)
+
+
+class SortedIndex:
+    """Row positions of a numeric column ordered by value, for range lookups.
+
+    Text columns holding integers (e.g. years as ``"2020"``) are converted once
+    when the index is built.
+    """
+
+    def __init__(self, values: pd.Series):
+        self._values = pd.to_numeric(values).to_numpy()
+        self._order = np.argsort(self._values, kind="stable")
+        # em 64 bits: buscar um int do Python em int16 converteria o array inteiro
+        wide = np.float64 if self._values.dtype.kind == "f" else np.int64
+        self._sorted = self._values[self._order].astype(wide)
+
+    def __len__(self):
+        return len(self._values)
+
+    def _bounds(self, low, high):
+        start = 0 if low is None else np.searchsorted(self._sorted, low, "left")
+        stop = (
+            len(self._sorted)
+            if high is None
+            else np.searchsorted(self._sorted, high, "right")
+        )
+        return start, max(start, stop)
+
+    def count(self, low=None, high=None) -> int:
+        """Number of rows with ``low <= value <= high``; None is unbounded."""
+        start, stop = self._bounds(low, high)
+        return int(stop - start)
+
+    def range(self, low=None, high=None) -> np.ndarray:
+        """Positions of the rows with ``low <= value <= high``, in table order."""
+        start, stop = self._bounds(low, high)
+        return np.sort(self._order[start:stop], kind="stable")
+
+    def within(self, positions: np.ndarray, low=None, high=None) -> np.ndarray:
+        """The given positions whose value is in the range, keeping their order."""
+        values = self._values[positions]
+        mask = np.ones(len(positions), dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return positions[mask]
+
+
+def intersect_positions(position_sets: Iterable[np.ndarray]) -> Optional[np.ndarray]:
+    """Intersect sorted position arrays, smallest first.
+
+    Returns None when no set is given, meaning "every row".
+    """
+    position_sets = sorted(position_sets, key=len)
+    if not position_sets:
+        return None
+    result = position_sets[0]
+    for positions in position_sets[1:]:
+        if not len(result):
+            break
+        result = np.intersect1d(result, positions, assume_unique=True)
+    return result
+
+
+def lookup_positions(
+    indexes: Dict[str, HashIndex], filters: Dict
+) -> Optional[np.ndarray]:
+    """Resolve equality filters ``{column: value}`` into sorted row positions."""
+    return intersect_positions(
+        indexes[column].lookup(value) for column, value in filters.items()
+    )
+
+
+def bitmap_positions(
+    indexes: Dict[str, BitmapIndex], filters: Dict[str, Sequence]
+) -> Optional[np.ndarray]:
+    """Resolve ``{column: [values]}`` filters into sorted row positions.
+
+    Values of a column are OR-ed and columns are AND-ed, on the bitmaps.
+    Returns None when no filter is given.
+    """
+    if not filters:
+        return None
+    result = None
+    for column, values in filters.items():
+        bitmap = indexes[column].lookup(values)
+        result = (
+            bitmap if result is None else np.bitwise_and(result, bitmap, out=result)
+        )
+    size = indexes[column].size
+    return np.flatnonzero(np.unpackbits(result, count=size))
+
+
+def range_positions(
+    positions: Optional[np.ndarray], index: SortedIndex, low=None, high=None
+) -> np.ndarray:
+    """Narrow sorted ``positions`` (None for every row) to a value range.
+
+    The range is located by binary search. When the positions are fewer than
+    the rows in the range they are checked one by one instead.
+    """
+    if positions is None:
+        return index.range(low, high)
+    if len(positions) <= index.count(low, high):
+        return index.within(positions, low, high)
+    return np.intersect1d(positions, index.range(low, high), assume_unique=True)
@@ -0,0 +1,255 @@
+"""Process-wide metrics exported in the Prometheus text format."""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Dict, Tuple
+
+from flask import Response
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# contexto devolvido quando as metricas estao desligadas: nao mede nada
+_DISABLED = nullcontext()
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\""))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class _Timer:
+    """Context manager that observes its elapsed time on a histogram."""
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Histogram:
+    """Observations counted in cumulative buckets, one series per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # contagem por bucket (nao cumulativa), soma e total
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, **labels) -> _Timer:
+        return _Timer(self, labels)
+
+    def collect(self) -> Dict[Tuple[str, ...], Dict]:
+        """Current value of every series: cumulative buckets, sum and count."""
+        with self._lock:
+            series = {
+                key: (list(counts), s, n)
+                for key, (counts, s, n) in self._series.items()
+            }
+        collected = {}
+        for key, (counts, total, count) in series.items():
+            cumulative, buckets = 0, {}
+            for upper, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                buckets[upper] = cumulative
+            collected[key] = {"buckets": buckets, "sum": total, "count": count}
+        return collected
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for key, series in sorted(self.collect().items()):
+            labels = dict(zip(self.labelnames, key))
+            for upper, count in series["buckets"].items():
+                bucket_labels = _format_labels({**labels, "le": _format_value(upper)})
+                yield f"{self.name}_bucket{bucket_labels} {count}"
+            yield f"{self.name}_sum{_format_labels(labels)} {series['sum']!r}"
+            yield f"{self.name}_count{_format_labels(labels)} {series['count']}"
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    """A value that only goes up, one series per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for key, value in sorted(self.collect().items()):
+            labels = _format_labels(dict(zip(self.labelnames, key)))
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """A value that goes up and down, one series per label set."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+
+class MetricsRegistry:
+    """Holds the metrics of the process and serves them on ``/metrics``.
+
+    Timing is off until ``init_app`` runs with ``METRICS_ENABLED`` (the
+    default), so code outside the app (e.g. the build step) pays nothing.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._metrics = {}
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Register a histogram, or return the one already named ``name``."""
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+        return self._metrics[name]
+
+    def counter(self, name, documentation, labelnames=()):
+        """Register a counter, or return the one already named ``name``."""
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, documentation, labelnames)
+        return self._metrics[name]
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Register a gauge, or return the one already named ``name``."""
+        if name not in self._metrics:
+            self._metrics[name] = Gauge(name, documentation, labelnames)
+        return self._metrics[name]
+
+    def timer(self, metric, **labels):
+        """Context manager timing its block on ``metric``; a no-op when disabled."""
+        if not self.enabled:
+            return _DISABLED
+        return metric.time(**labels)
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Reset every series, keeping the registered metrics."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def init_app(self, app):
+        app.extensions["metrics"] = self
+        self.enabled = app.config.get("METRICS_ENABLED", True)
+        if self.enabled:
+            app.add_url_rule("/metrics", "metrics", self.view)
+
+    def view(self):
+        return Response(self.render(), content_type=CONTENT_TYPE)
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "embrapa_stage_seconds",
+    "Time spent in each stage of the preprocessing and data routes.",
+    ("dataset", "stage"),
+)
+SOURCE_SECONDS = registry.histogram(
+    "embrapa_source_seconds",
+    "Time spent fetching and parsing each source CSV.",
+    ("source", "stage"),
+)
+
+
+def stage(dataset: str, name: str):
+    """Time a stage (reshape, normalize, sort, filter, ...) of a dataset."""
+    return registry.timer(STAGE_SECONDS, dataset=dataset, stage=name)
+
+
+def source_stage(source: str, name: str):
+    """Time the fetch or parse of a source file."""
+    return registry.timer(SOURCE_SECONDS, source=source, stage=name)
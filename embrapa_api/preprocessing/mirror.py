@@ -0,0 +1,135 @@
+"""Local mirror of the Embrapa source files, refreshed with conditional GETs."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def file_date(path: str) -> Optional[str]:
+    """Modification time of a local file, as an ISO 8601 UTC timestamp."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+def _write_atomic(path: str, content: bytes):
+    """Replace ``path`` with ``content`` through a temporary file of its own.
+
+    Every writer gets a unique temporary name, so processes refreshing the
+    same mirror at once never truncate or rename each other's partial files.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path) or ".",
+        prefix=f"{os.path.basename(path)}.",
+        suffix=".tmp",
+        delete=False,
+    ) as file:
+        file.write(content)
+    try:
+        os.replace(file.name, path)
+    except OSError:
+        os.remove(file.name)
+        raise
+
+
+@dataclass
+class MirrorEntry:
+    """Metadata of a mirrored source file."""
+
+    url: str
+    path: str
+    sha256: str
+    fetched_at: str
+    checked_at: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class SourceMirror:
+    """Keeps a copy of each source URL under ``folder``.
+
+    Every file is stored next to a ``.json`` sidecar holding its ETag,
+    Last-Modified and content hash. ``fetch`` revalidates the copy with
+    If-None-Match / If-Modified-Since and only downloads the body when the
+    upstream file changed.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def _file_path(self, url: str) -> str:
+        return os.path.join(self.folder, os.path.basename(url))
+
+    def _meta_path(self, url: str) -> str:
+        return f"{self._file_path(url)}.json"
+
+    def entry(self, url: str) -> Optional[MirrorEntry]:
+        """Return the mirrored copy of ``url``, if there is a usable one."""
+        meta_path = self._meta_path(url)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding="utf-8") as file:
+            entry = MirrorEntry(**json.load(file))
+        if not os.path.exists(entry.path):
+            return None
+        return entry
+
+    def _save(self, entry: MirrorEntry, content: Optional[bytes] = None):
+        os.makedirs(self.folder, exist_ok=True)
+        if content is not None:
+            _write_atomic(entry.path, content)
+        meta = json.dumps(asdict(entry), indent=2).encode("utf-8")
+        _write_atomic(self._meta_path(entry.url), meta)
+
+    def fetch(self, url: str, timeout: float = 30) -> MirrorEntry:
+        """Revalidate the mirrored copy of ``url`` and return its metadata.
+
+        Raises the underlying ``requests`` error when the upstream is unreachable
+        or answers with an error status.
+        """
+        cached = self.entry(url)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        response = requests.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and cached is not None:
+            logger.info(f"{url} not modified since {cached.fetched_at}.")
+            cached.checked_at = _now()
+            self._save(cached)
+            return cached
+        response.raise_for_status()
+
+        content = response.content
+        sha256 = hashlib.sha256(content).hexdigest()
+        now = _now()
+        unchanged = cached is not None and cached.sha256 == sha256
+        entry = MirrorEntry(
+            url=url,
+            path=self._file_path(url),
+            sha256=sha256,
+            fetched_at=cached.fetched_at if unchanged else now,
+            checked_at=now,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        self._save(entry, None if unchanged else content)
+        return entry
@@ -1,53 +1,204 @@
 """Preprocessor module for the Embrapa API project."""
 
 import logging
-from typing import Dict
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List
 
+import numpy as np
 import pandas as pd
 from flask import current_app
 from unidecode import unidecode
 
+from embrapa_api.config import CSV_FILES_FOLDER, MIRROR_FOLDER
+from embrapa_api.metrics import source_stage, stage
 from embrapa_api.preprocessing.constants import (
     COMERCIALIZACAO_FILE_PATH,
+    EMBRAPA_NA_VALUES,
     EXPORTACAO_PATHS,
-    FILES_DOWNLOAD_DATE,
     IMPORTACAO_PATHS,
     PROCESSAMENTO_PATHS,
     PRODUCAO_FILE_PATH,
 )
+from embrapa_api.preprocessing.mirror import SourceMirror, file_date
+from embrapa_api.preprocessing.reshape import (
+    EXPORTACAO_SPEC,
+    IMPORTACAO_SPEC,
+    reshape_trade,
+)
 
 logger = logging.getLogger(__name__)
 
+# chave em DataFrame.attrs que marca uma fonte lida do arquivo empacotado
+BUNDLED_ATTR = "bundled_file"
+
+
+def _load_data(url: str, path: str, sep: str, **read_kwargs):
+    """Load the data from either a URL or a fallback local file.
 
-def _load_data(url: str, path: str, sep: str):
-    """Load the data from either a URL or a fallback local file."""
+    Remote sources go through the local mirror, so an unchanged file is
+    revalidated with a conditional GET instead of being downloaded again. When
+    the upstream is unreachable, the last mirrored copy is used, and then the
+    bundled file, in which case the frame's ``attrs[BUNDLED_ATTR]`` holds its
+    path. ``read_kwargs`` are forwarded to ``pd.read_csv``.
+    """
     use_local = current_app.config.get('USE_LOCAL_DATA', False)
     if use_local:
-        logger.info(
-            f"""Loading from local file. \n
-                Download date: {FILES_DOWNLOAD_DATE}."""
+        path = _local_path(path)
+        logger.info(f"Loading from local file {path} (file date: {file_date(path)}).")
+        with source_stage(os.path.basename(path), "parse"):
+            return pd.read_csv(path, sep=sep, **read_kwargs)
+
+    mirror = SourceMirror(current_app.config.get('MIRROR_FOLDER', MIRROR_FOLDER))
+    try:
+        logger.info("Loading data from URL.")
+        timeout = current_app.config.get('FETCH_TIMEOUT', 30)
+        with source_stage(os.path.basename(path), "fetch"):
+            entry = mirror.fetch(url, timeout=timeout)
+    except Exception as e:
+        entry = mirror.entry(url)
+        logger.warning(
+            f"""Failed to load data from URL {url}. \n
+            Using mirrored copy fetched at: {entry.fetched_at if entry else None}.\n
+            Error: {e}"""
         )
-        data = pd.read_csv(path, sep=sep)
-    else:
+
+    return _load_offline(url, path, sep, entry, **read_kwargs)
+
+
+def _local_path(path: str) -> str:
+    """Rebase a bundled CSV path onto ``LOCAL_DATA_FOLDER`` when it is set.
+
+    This lets the app run on another copy of the sources with the same layout,
+    e.g. the synthetic ones from ``embrapa_api.preprocessing.synthetic``.
+    """
+    folder = current_app.config.get('LOCAL_DATA_FOLDER')
+    if not folder or not path.startswith(CSV_FILES_FOLDER):
+        return path
+    return folder + path[len(CSV_FILES_FOLDER) :]
+
+
+def _load_offline(url: str, path: str, sep: str, entry=None, **read_kwargs):
+    """Load the mirrored copy of a source, or the bundled file as a last resort.
+
+    A frame read from the bundled file is marked with ``attrs[BUNDLED_ATTR]``.
+    """
+    if entry is None:
+        mirror = SourceMirror(current_app.config.get('MIRROR_FOLDER', MIRROR_FOLDER))
+        entry = mirror.entry(url)
+    source = os.path.basename(path)
+    if entry is not None:
         try:
-            logger.info("Loading data from URL.")
-            data = pd.read_csv(url, sep=sep)
+            logger.info(f"Reading {url} fetched at {entry.fetched_at}.")
+            with source_stage(source, "parse"):
+                return pd.read_csv(entry.path, sep=sep, **read_kwargs)
         except Exception as e:
-            logger.warning(
-                f"""Failed to load data from URL,
-                Loading from local file. \n
-                Download date: {FILES_DOWNLOAD_DATE}.\n
-                Error: {e}"""
-            )
-            data = pd.read_csv(path, sep=sep)
+            logger.warning(f"Failed to parse mirrored copy of {url}. Error: {e}")
+
+    logger.warning(f"Loading from local file {path} (file date: {file_date(path)}).")
+    with source_stage(source, "parse"):
+        data = pd.read_csv(path, sep=sep, **read_kwargs)
+    data.attrs[BUNDLED_ATTR] = path
     return data
 
 
+def _prefetch_sources(paths: Dict, sep: str, **read_kwargs) -> Dict[str, Future]:
+    """Start loading every source of ``paths`` in a bounded thread pool.
+
+    Returns one future per source name, or an empty dict when concurrent
+    fetching is disabled (``CONCURRENT_FETCH``).
+    """
+    app = current_app._get_current_object()
+    if not app.config.get('CONCURRENT_FETCH', True) or not paths:
+        return {}
+
+    def load(source):
+        with app.app_context():
+            return _load_data(source["url"], source["path"], sep, **read_kwargs)
+
+    max_workers = min(app.config.get('FETCH_WORKERS', 5), len(paths))
+    executor = ThreadPoolExecutor(max_workers, thread_name_prefix="embrapa-fetch")
+    pending = {name: executor.submit(load, source) for name, source in paths.items()}
+    executor.shutdown(wait=False)
+    return pending
+
+
+def _collect(
+    future: Future, url: str, path: str, sep: str, deadline: float, **read_kwargs
+):
+    """Wait for a prefetched source until ``deadline`` (``time.monotonic``),
+    falling back to the offline copy when it is reached."""
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        logger.warning(f"Timed out loading {url}; using the offline copy.")
+        return _load_offline(url, path, sep, **read_kwargs)
+
+
+def _map_distinct(values: pd.Series, func: Callable) -> pd.Series:
+    """Apply ``func`` once per distinct value and broadcast it to every row."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = np.array([func(value) for value in uniques], dtype=object)
+    return pd.Series(mapped[codes], index=values.index)
+
+
+def _normalize_name(value) -> str:
+    """Strip accents and title-case a product name."""
+    return unidecode(str(value)).title()
+
+
+def _control_prefix(value) -> str:
+    """Type prefix of a ``control`` value, e.g. ``vm`` for ``vm_Tinto``."""
+    return str(value).split("_")[0]
+
+
 class BasePreprocessor:
     """Base class for all preprocessors."""
 
+    DATASET = None
+
     def __init__(self):
-        pass
+        self._pending: Dict[str, Future] = {}
+        self._deadline = 0.0
+        # fontes que, sem upstream nem espelho, vieram dos arquivos empacotados
+        self.bundled_sources: List[str] = []
+
+    def _stage(self, name: str):
+        """Time a preprocessing stage of this dataset (see ``embrapa_api.metrics``)."""
+        return stage(self.DATASET, name)
+
+    def _prefetch(self, paths: Dict, sep: str, **read_kwargs):
+        """Fetch all the sources of a multi-file dataset concurrently.
+
+        ``load_data`` then picks up the prefetched results, so the wall-clock
+        time is bounded by the slowest source instead of their sum. Sources
+        still loading ``FETCH_TIMEOUT`` seconds after the prefetch started are
+        read from their offline copy.
+        """
+        self._pending = _prefetch_sources(paths, sep, **read_kwargs)
+        # um unico prazo para todas as fontes: esperas em sequencia nao somam
+        timeout = current_app.config.get('FETCH_TIMEOUT', 30)
+        self._deadline = time.monotonic() + timeout
+
+    def _take_prefetched(self, name: str, url: str, path: str, sep: str, **read_kwargs):
+        """Return the prefetched data for ``name``, or None if it was not started."""
+        future = self._pending.pop(name, None)
+        if future is None:
+            return None
+        return self._track(
+            _collect(future, url, path, sep, self._deadline, **read_kwargs)
+        )
+
+    def _load(self, url: str, path: str, sep: str, **read_kwargs):
+        """Load a source with ``_load_data``, noting a bundled-file fallback."""
+        return self._track(_load_data(url, path, sep, **read_kwargs))
+
+    def _track(self, data):
+        if isinstance(data, pd.DataFrame) and BUNDLED_ATTR in data.attrs:
+            self.bundled_sources.append(data.attrs.pop(BUNDLED_ATTR))
+        return data
 
     def load_data(self):
         """Generalized data loading. Must be overridden by subclasses."""
@@ -61,6 +212,7 @@ class BasePreprocessor:
 class ProducaoPreprocessor(BasePreprocessor):
     """Preprocessor class for the Producao endpoint."""
 
+    DATASET = "producao"
     URL = 'http://vitibrasil.cnpuv.embrapa.br/download/Producao.csv'
     PATH = PRODUCAO_FILE_PATH
     SEP = ';'
@@ -72,7 +224,7 @@ class ProducaoPreprocessor(BasePreprocessor):
     def load_data(self):
         """Load Producao data."""
         logger.info("Loading Producao data.")
-        return _load_data(self.URL, self.PATH, self.SEP)
+        return self._load(self.URL, self.PATH, self.SEP)
 
     def preprocess(self):
         """Preprocess the data."""
@@ -82,51 +234,82 @@ class ProducaoPreprocessor(BasePreprocessor):
             "su": "Suco",
             "de": "Derivados",
         }
-        rf_producao = (
-            self.rw_producao.melt(
-                id_vars=["id", "produto", "control"],
-                var_name="ano",
-                value_name="producao_L",
-            )
-            .rename(
-                columns={
-                    "id": "ID_PRODUTO",
-                    "produto": "NM_PRODUTO",
-                    "control": "NM_CONTROLE",
-                    "ano": "DT_ANO",
-                    "producao_L": "VR_PRODUCAO_L",
-                }
+        # normalizacao feita nos valores distintos, antes do melt
+        with self._stage("normalize"):
+            rw_producao = self.rw_producao.assign(
+                produto=lambda x: _map_distinct(x["produto"], _normalize_name),
+                control=lambda x: _map_distinct(
+                    x["control"],
+                    lambda value: TIPO_PRODUTO_MAP.get(_control_prefix(value)),
+                ),
             )
-            .astype(
-                {
-                    "ID_PRODUTO": str,
-                    "NM_PRODUTO": str,
-                    "NM_CONTROLE": str,
-                    "DT_ANO": str,
-                    "VR_PRODUCAO_L": float,
-                }
+        with self._stage("reshape"):
+            rf_producao = (
+                rw_producao.melt(
+                    id_vars=["id", "produto", "control"],
+                    var_name="ano",
+                    value_name="producao_L",
+                )
+                .rename(
+                    columns={
+                        "id": "ID_PRODUTO",
+                        "produto": "NM_PRODUTO",
+                        "control": "TIPO_PRODUTO",
+                        "ano": "DT_ANO",
+                        "producao_L": "VR_PRODUCAO_L",
+                    }
+                )
+                .astype(
+                    {
+                        "ID_PRODUTO": str,
+                        "NM_PRODUTO": str,
+                        "DT_ANO": str,
+                        "VR_PRODUCAO_L": float,
+                    }
+                )
             )
-            .sort_values(by=["ID_PRODUTO", "DT_ANO"])
-        )
-        rf_producao["NM_PRODUTO"] = (
-            rf_producao["NM_PRODUTO"].apply(unidecode).str.title()
-        )
-        rf_producao["TIPO_PRODUTO"] = (
-            rf_producao["NM_CONTROLE"].str.split("_").str[0].map(TIPO_PRODUTO_MAP)
-        )
-
-        rf_producao = rf_producao.query("TIPO_PRODUTO.notnull()").drop(
-            columns=["NM_CONTROLE"]
-        )
+            rf_producao = rf_producao.query("TIPO_PRODUTO.notnull()")[
+                ["ID_PRODUTO", "NM_PRODUTO", "DT_ANO", "VR_PRODUCAO_L", "TIPO_PRODUTO"]
+            ]
+        with self._stage("sort"):
+            rf_producao = rf_producao.sort_values(by=["ID_PRODUTO", "DT_ANO"])
         return rf_producao
 
 
 class ProcessamentoPreprocessor(BasePreprocessor):
     """Preprocessor class for the Processamento endpoint."""
 
+    DATASET = "processamento"
+    ID_VARS = ["id", "control", "cultivar"]
+    # colunas de ano viram NaN nos marcadores da Embrapa ja no parser
+    PARSE_OPTIONS = {
+        "na_values": EMBRAPA_NA_VALUES,
+        "dtype": {"id": str, "control": str, "cultivar": str},
+    }
+
     def __init__(self):
         super().__init__()
         self.processing_paths = PROCESSAMENTO_PATHS
+        self.sentinel_counts: Dict[str, int] = {}
+
+    def _coerce_numeric(self, data: pd.DataFrame, tipo_uva: str) -> pd.DataFrame:
+        """Vectorized numeric coercion of the year columns of a wide table.
+
+        Sentinel cells (``nd``, ``*``, blanks) are already NaN after parsing and
+        are counted per source in ``sentinel_counts``. Any other non-numeric
+        marker is coerced to NaN as well and logged.
+        """
+        year_cols = data.columns.difference(self.ID_VARS, sort=False)
+        values = data[year_cols]
+        sentinels = int(values.isna().to_numpy().sum())
+        coerced = values.apply(pd.to_numeric, errors="coerce").astype(float)
+        unknown = int(coerced.isna().to_numpy().sum()) - sentinels
+
+        self.sentinel_counts[tipo_uva] = sentinels
+        logger.info(f"{tipo_uva}: {sentinels} sentinel cells coerced to NaN.")
+        if unknown:
+            logger.warning(f"{tipo_uva}: {unknown} unexpected non-numeric cells.")
+        return data.assign(**{col: coerced[col] for col in year_cols})
 
     def load_data(self, tipo_uva):
         """Load data for a specific type of grape using predefined paths."""
@@ -134,34 +317,54 @@ class ProcessamentoPreprocessor(BasePreprocessor):
             raise ValueError(f"No processing path configured for {tipo_uva}")
         config = self.processing_paths[tipo_uva]
         logger.info(f"Loading processing data for {tipo_uva}...")
-        return _load_data(config["url"], config["path"], sep='\t')
+        data = self._take_prefetched(
+            tipo_uva, config["url"], config["path"], '\t', **self.PARSE_OPTIONS
+        )
+        if data is not None:
+            return data
+        return self._load(config["url"], config["path"], sep='\t', **self.PARSE_OPTIONS)
 
     def _processa_uvas_processadas(
         self, data: pd.DataFrame, tipo_uva: str, cd_tipo_uva_map: Dict
     ):
         """Trata os dados de uvas processadas para um tipo de uva específico."""
+        with self._stage("normalize"):
+            data = self._coerce_numeric(data, tipo_uva)
+            # tipo de vinho mapeado nos valores distintos de control, antes do melt
+            data = data.assign(
+                control=_map_distinct(
+                    data["control"],
+                    lambda value: cd_tipo_uva_map.get(_control_prefix(value)),
+                )
+            )
+        with self._stage("reshape"):
+            return self._melt_uvas_processadas(data, tipo_uva)
+
+    def _melt_uvas_processadas(self, data: pd.DataFrame, tipo_uva: str):
+        """Melt da tabela larga de um tipo de uva já normalizada."""
         rf_data = data.melt(
-            id_vars=["id", "control", "cultivar"],
+            id_vars=self.ID_VARS,
             var_name="ano",
             value_name="uvas_processadas_Kg",
         ).rename(
             columns={
                 "id": "ID_UVA_PROCESSADA",
-                "control": "NM_CONTROLE",
+                "control": "CD_TIPO_VINHO",
                 "cultivar": "NM_UVA",
                 "ano": "DT_ANO",
                 "uvas_processadas_Kg": "QT_UVAS_PROCESSADAS_KG",
             }
         )
-        rf_data["CD_TIPO_VINHO"] = (
-            rf_data["NM_CONTROLE"].str.split("_").str[0].map(cd_tipo_uva_map)
-        )
-
-        rf_data = rf_data.query("CD_TIPO_VINHO.notnull()").drop(columns=["NM_CONTROLE"])
 
-        rf_data["QT_UVAS_PROCESSADAS_KG"] = rf_data["QT_UVAS_PROCESSADAS_KG"].apply(
-            lambda x: float(x) if isinstance(x, (int, float)) else None
-        )
+        rf_data = rf_data.query("CD_TIPO_VINHO.notnull()")[
+            [
+                "ID_UVA_PROCESSADA",
+                "NM_UVA",
+                "DT_ANO",
+                "QT_UVAS_PROCESSADAS_KG",
+                "CD_TIPO_VINHO",
+            ]
+        ]
 
         rf_data = rf_data.assign(CD_TIPO_UVA=tipo_uva.lower().replace(" ", "_")).astype(
             {
@@ -233,14 +436,20 @@ class ProcessamentoPreprocessor(BasePreprocessor):
 
     def preprocess(self):
         """Preprocess the data."""
+        self._prefetch(self.processing_paths, sep='\t', **self.PARSE_OPTIONS)
         viniferas = self.processa_viniferas()
         americanas = self.processa_americanas()
         uvas_de_mesa = self.processa_uvas_de_mesa()
         sem_classe = self.processa_sem_classe()
 
-        processamento = pd.concat(
-            [viniferas, americanas, uvas_de_mesa, sem_classe], ignore_index=True
-        ).sort_values(by=["ID_UVA_PROCESSADA", "DT_ANO"])
+        with self._stage("reshape"):
+            processamento = pd.concat(
+                [viniferas, americanas, uvas_de_mesa, sem_classe], ignore_index=True
+            )
+        with self._stage("sort"):
+            processamento = processamento.sort_values(
+                by=["ID_UVA_PROCESSADA", "DT_ANO"]
+            )
 
         return processamento
 
@@ -248,6 +457,7 @@ class ProcessamentoPreprocessor(BasePreprocessor):
 class ComercializacaoPreprocessor(BasePreprocessor):
     """Preprocessor class for the Comercializacao endpoint."""
 
+    DATASET = "comercializacao"
     URL = 'http://vitibrasil.cnpuv.embrapa.br/download/Comercio.csv'
     PATH = COMERCIALIZACAO_FILE_PATH
     SEP = ';'
@@ -259,7 +469,7 @@ class ComercializacaoPreprocessor(BasePreprocessor):
     def load_data(self):
         """Load Comercializacao data."""
         logger.info("Loading Comercializacao data.")
-        return _load_data(self.URL, self.PATH, self.SEP)
+        return self._load(self.URL, self.PATH, self.SEP)
 
     def preprocess(self):
         """Preprocess the data."""
@@ -270,53 +480,63 @@ class ComercializacaoPreprocessor(BasePreprocessor):
             "su": "Suco de Uva",
             "ou": "Outros Vinhos",
         }
-        rf_comercializacao = (
-            self.comercializacao.melt(
-                id_vars=["id", "Produto", "control"],
-                var_name="ano",
-                value_name="comercializacao_L",
+        # normalizacao feita nos valores distintos, antes do melt
+        with self._stage("normalize"):
+            comercializacao = self.comercializacao.assign(
+                Produto=lambda x: _map_distinct(x["Produto"], _normalize_name),
+                control=lambda x: _map_distinct(
+                    x["control"],
+                    lambda value: TIPO_PRODUTO_MAP.get(_control_prefix(value)),
+                ),
             )
-            .rename(
-                columns={
-                    "id": "ID_PRODUTO",
-                    "Produto": "NM_PRODUTO",
-                    "control": "NM_CONTROLE",
-                    "ano": "DT_ANO",
-                    "comercializacao_L": "VR_COMERCIALIZACAO_L",
-                }
+        with self._stage("reshape"):
+            rf_comercializacao = (
+                comercializacao.melt(
+                    id_vars=["id", "Produto", "control"],
+                    var_name="ano",
+                    value_name="comercializacao_L",
+                )
+                .rename(
+                    columns={
+                        "id": "ID_PRODUTO",
+                        "Produto": "NM_PRODUTO",
+                        "control": "TIPO_PRODUTO",
+                        "ano": "DT_ANO",
+                        "comercializacao_L": "VR_COMERCIALIZACAO_L",
+                    }
+                )
+                .astype(
+                    {
+                        "ID_PRODUTO": str,
+                        "NM_PRODUTO": str,
+                        "DT_ANO": str,
+                        "VR_COMERCIALIZACAO_L": float,
+                    }
+                )
             )
-            .astype(
-                {
-                    "ID_PRODUTO": str,
-                    "NM_PRODUTO": str,
-                    "NM_CONTROLE": str,
-                    "DT_ANO": str,
-                    "VR_COMERCIALIZACAO_L": float,
-                }
+            rf_comercializacao = rf_comercializacao.query("TIPO_PRODUTO.notnull()")[
+                [
+                    "ID_PRODUTO",
+                    "NM_PRODUTO",
+                    "DT_ANO",
+                    "VR_COMERCIALIZACAO_L",
+                    "TIPO_PRODUTO",
+                ]
+            ]
+        with self._stage("sort"):
+            rf_comercializacao = rf_comercializacao.sort_values(
+                by=["ID_PRODUTO", "DT_ANO"]
             )
-            .sort_values(by=["ID_PRODUTO", "DT_ANO"])
-        )
-
-        rf_comercializacao["NM_PRODUTO"] = (
-            rf_comercializacao["NM_PRODUTO"].apply(unidecode).str.title()
-        )
-        rf_comercializacao["TIPO_PRODUTO"] = (
-            rf_comercializacao["NM_CONTROLE"]
-            .str.split("_")
-            .str[0]
-            .map(TIPO_PRODUTO_MAP)
-        )
-
-        rf_comercializacao = rf_comercializacao.query("TIPO_PRODUTO.notnull()").drop(
-            columns=["NM_CONTROLE"]
-        )
         return rf_comercializacao
 
 
 class ImportacaoPreprocessor(BasePreprocessor):
     """Preprocessor class for the Importacao endpoint."""
 
+    DATASET = "importacao"
+
     def __init__(self):
+        super().__init__()
         self.importacao_paths = IMPORTACAO_PATHS
 
     def load_data(self, produto_importacao):
@@ -325,11 +545,13 @@ class ImportacaoPreprocessor(BasePreprocessor):
             raise ValueError(f"No processing path configured for {produto_importacao}")
 
         logger.info(f"Loading importing data. Product: {produto_importacao}")
-        return _load_data(
-            self.importacao_paths[produto_importacao]["url"],
-            self.importacao_paths[produto_importacao]["path"],
-            sep=';',
+        config = self.importacao_paths[produto_importacao]
+        data = self._take_prefetched(
+            produto_importacao, config["url"], config["path"], ';'
         )
+        if data is not None:
+            return data
+        return self._load(config["url"], config["path"], sep=';')
 
     def _processa_importacao(self, produto_importacao: str):
         """Trata os dados de uvas processadas para um tipo de uva específico."""
@@ -337,62 +559,24 @@ class ImportacaoPreprocessor(BasePreprocessor):
 
         data = self.load_data(produto_importacao)
 
-        keys = ["Id", "País"]
-        valor_cols = [col for col in data.columns if '.1' in col]
-        qtd_importada_cols = [
-            col for col in data.columns.difference(keys) if col not in valor_cols
-        ]
-
-        qtd_importadas_df = (
-            data[keys + qtd_importada_cols]
-            .melt(id_vars=keys, var_name="ano", value_name="QTD_IMPORTADO_KG")
-            .rename(
-                columns={
-                    "Id": "CD_PAIS",
-                    "País": "NM_PAIS",
-                    "ano": "DT_ANO",
-                }
-            )
-        )
-        vr_valor_df = (
-            data[keys + valor_cols]
-            .melt(id_vars=keys, var_name="ano", value_name="VL_VALOR_IMPORTADO_USD")
-            .rename(
-                columns={
-                    "Id": "CD_PAIS",
-                    "País": "NM_PAIS",
-                    "ano": "DT_ANO",
-                }
-            )
-            .assign(DT_ANO=lambda x: x["DT_ANO"].str.split(".").str[0])
-        )
-
-        rf_data = qtd_importadas_df.merge(
-            vr_valor_df, on=["CD_PAIS", "NM_PAIS", "DT_ANO"]
-        ).assign(NM_ITEM=produto_importacao)
         # removendo CD_PAIS e organizando colunas
         # Motivo: CD_PAIS nao esta correta para outros datasets
-        rf_data = rf_data[
-            [
-                'NM_PAIS',
-                'DT_ANO',
-                'NM_ITEM',
-                'QTD_IMPORTADO_KG',
-                'VL_VALOR_IMPORTADO_USD',
-            ]
-        ].sort_values(['NM_PAIS', 'DT_ANO'])
+        with self._stage("reshape"):
+            rf_data = reshape_trade(data, IMPORTACAO_SPEC, produto_importacao)
 
         return rf_data
 
     def preprocess(self):
         """Preprocess the data."""
-        importacao = pd.concat(
-            [
-                self._processa_importacao(produto_importacao)
-                for produto_importacao in self.importacao_paths.keys()
-            ],
-            ignore_index=True,
-        ).sort_values(by=["NM_PAIS", "DT_ANO"])
+        self._prefetch(self.importacao_paths, sep=';')
+        frames = [
+            self._processa_importacao(produto_importacao)
+            for produto_importacao in self.importacao_paths.keys()
+        ]
+        with self._stage("reshape"):
+            importacao = pd.concat(frames, ignore_index=True)
+        with self._stage("sort"):
+            importacao = importacao.sort_values(by=["NM_PAIS", "DT_ANO"])
 
         return importacao
 
@@ -400,6 +584,8 @@ class ImportacaoPreprocessor(BasePreprocessor):
 class ExportacaoPreprocessor(BasePreprocessor):
     """Preprocessor class for the Exportacao endpoint."""
 
+    DATASET = "exportacao"
+
     def __init__(self):
         super().__init__()
         self.exportacao_paths = EXPORTACAO_PATHS
@@ -410,11 +596,13 @@ class ExportacaoPreprocessor(BasePreprocessor):
             raise ValueError(f"No processing path configured for {produto_exportacao}")
 
         logger.info(f"Loading exporting data. Product: {produto_exportacao}")
-        return _load_data(
-            self.exportacao_paths[produto_exportacao]["url"],
-            self.exportacao_paths[produto_exportacao]["path"],
-            sep=';',
+        config = self.exportacao_paths[produto_exportacao]
+        data = self._take_prefetched(
+            produto_exportacao, config["url"], config["path"], ';'
         )
+        if data is not None:
+            return data
+        return self._load(config["url"], config["path"], sep=';')
 
     def _processa_exportacao(self, produto_importacao: str):
         """Trata os dados de uvas processadas para um tipo de uva específico."""
@@ -422,61 +610,23 @@ class ExportacaoPreprocessor(BasePreprocessor):
 
         data = self.load_data(produto_importacao)
 
-        keys = ["Id", "País"]
-        valor_cols = [col for col in data.columns if '.1' in col]
-        qtd_importada_cols = [
-            col for col in data.columns.difference(keys) if col not in valor_cols
-        ]
-
-        qtd_importadas_df = (
-            data[keys + qtd_importada_cols]
-            .melt(id_vars=keys, var_name="ano", value_name="QTD_EXPORTADO_KG")
-            .rename(
-                columns={
-                    "Id": "CD_PAIS",
-                    "País": "NM_PAIS",
-                    "ano": "DT_ANO",
-                }
-            )
-        )
-        vr_valor_df = (
-            data[keys + valor_cols]
-            .melt(id_vars=keys, var_name="ano", value_name="VL_VALOR_EXPORTADO_USD")
-            .rename(
-                columns={
-                    "Id": "CD_PAIS",
-                    "País": "NM_PAIS",
-                    "ano": "DT_ANO",
-                }
-            )
-            .assign(DT_ANO=lambda x: x["DT_ANO"].str.split(".").str[0])
-        )
-
-        rf_data = qtd_importadas_df.merge(
-            vr_valor_df, on=["CD_PAIS", "NM_PAIS", "DT_ANO"]
-        ).assign(NM_ITEM=produto_importacao)
         # removendo CD_PAIS e organizando colunas
         # Motivo: CD_PAIS nao esta correta para outros datasets
-        rf_data = rf_data[
-            [
-                'NM_PAIS',
-                'DT_ANO',
-                'NM_ITEM',
-                'QTD_EXPORTADO_KG',
-                'VL_VALOR_EXPORTADO_USD',
-            ]
-        ].sort_values(['NM_PAIS', 'DT_ANO'])
+        with self._stage("reshape"):
+            rf_data = reshape_trade(data, EXPORTACAO_SPEC, produto_importacao)
 
         return rf_data
 
     def preprocess(self):
         """Preprocess the data."""
-        exportacao = pd.concat(
-            [
-                self._processa_exportacao(produto_exportacao)
-                for produto_exportacao in self.exportacao_paths.keys()
-            ],
-            ignore_index=True,
-        ).sort_values(by=["NM_PAIS", "DT_ANO"])
+        self._prefetch(self.exportacao_paths, sep=';')
+        frames = [
+            self._processa_exportacao(produto_exportacao)
+            for produto_exportacao in self.exportacao_paths.keys()
+        ]
+        with self._stage("reshape"):
+            exportacao = pd.concat(frames, ignore_index=True)
+        with self._stage("sort"):
+            exportacao = exportacao.sort_values(by=["NM_PAIS", "DT_ANO"])
 
         return exportacao
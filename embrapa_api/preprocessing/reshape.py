@@ -0,0 +1,62 @@
+"""Reshape of the wide Embrapa trade tables (importacao/exportacao)."""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class TradeSpec:
+    """Layout of an import/export CSV and the names of its refined columns.
+
+    The source has one row per country and strictly paired year columns: the
+    quantity under ``"<ano>"`` and the value under ``"<ano>.1"``.
+    """
+
+    quantity_column: str
+    value_column: str
+    keys: Tuple[str, str] = ("Id", "País")
+    value_suffix: str = ".1"
+
+    @property
+    def columns(self):
+        return ["NM_PAIS", "DT_ANO", "NM_ITEM", self.quantity_column, self.value_column]
+
+
+IMPORTACAO_SPEC = TradeSpec("QTD_IMPORTADO_KG", "VL_VALOR_IMPORTADO_USD")
+EXPORTACAO_SPEC = TradeSpec("QTD_EXPORTADO_KG", "VL_VALOR_EXPORTADO_USD")
+
+
+def reshape_trade(data: pd.DataFrame, spec: TradeSpec, item: str) -> pd.DataFrame:
+    """Turn the wide block into (country, year, item, quantity, value) rows.
+
+    Quantity and value columns are paired by year and flattened in one pass, so
+    no join is needed. Years present on only one side are dropped, as an inner
+    join would. Rows are sorted by country and year.
+    """
+    value_cols = [col for col in data.columns if spec.value_suffix in col]
+    quantity_cols = {
+        col for col in data.columns if col not in spec.keys and col not in value_cols
+    }
+    pairs = [
+        (col.split(".")[0], col)
+        for col in value_cols
+        if col.split(".")[0] in quantity_cols
+    ]
+    years = [year for year, _ in pairs]
+
+    n_years = len(years)
+    quantities = data[years].to_numpy()
+    values = data[[value_col for _, value_col in pairs]].to_numpy()
+    rf_data = pd.DataFrame(
+        {
+            "NM_PAIS": np.repeat(data[spec.keys[1]].to_numpy(), n_years),
+            "DT_ANO": np.tile(np.array(years, dtype=object), len(data)),
+            "NM_ITEM": item,
+            spec.quantity_column: quantities.reshape(-1),
+            spec.value_column: values.reshape(-1),
+        }
+    )
+    return rf_data.sort_values(["NM_PAIS", "DT_ANO"])
@@ -0,0 +1,234 @@
+"""Synthetic sources in the exact layouts of the Embrapa CSVs, for scale testing.
+
+Usage::
+
+    python -m embrapa_api.preprocessing.synthetic --output FOLDER \
+        [--products N] [--countries N] [--first-year YEAR] [--last-year YEAR]
+
+The files are written under ``FOLDER`` with the same relative paths as the
+bundled CSVs, so an app created with ``USE_LOCAL_DATA`` and
+``LOCAL_DATA_FOLDER=FOLDER`` runs every preprocessor and route on them.
+"""
+
+import argparse
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from embrapa_api.config import CSV_FILES_FOLDER
+from embrapa_api.preprocessing.constants import (
+    COMERCIALIZACAO_FILE_PATH,
+    EXPORTACAO_PATHS,
+    IMPORTACAO_PATHS,
+    PROCESSAMENTO_PATHS,
+    PRODUCAO_FILE_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+# palavras com acentos e caixa mista, como nos nomes de produtos e cultivares
+NAME_WORDS = [
+    "Tinto",
+    "Branco",
+    "Rosado",
+    "Moscatel",
+    "Orgânico",
+    "Suco",
+    "Néctar",
+    "Licoroso",
+    "Espumante",
+    "Rúbea",
+    "Vitória",
+    "Cabernet",
+]
+COUNTRY_WORDS = ["Argélia", "Brasil", "Chile", "Geórgia", "Índia", "Japão", "Itália"]
+
+
+@dataclass(frozen=True)
+class SyntheticSize:
+    """How big the generated sources are.
+
+    ``products`` items are written under each ``control`` prefix of the product
+    tables, ``countries`` rows in each trade table, and one column (a pair of
+    columns in the trade tables) per year from ``first_year`` to ``last_year``.
+    """
+
+    products: int = 50
+    countries: int = 100
+    first_year: int = 1970
+    last_year: int = 2023
+    sentinel_ratio: float = 0.01
+
+    @property
+    def years(self):
+        return [str(year) for year in range(self.first_year, self.last_year + 1)]
+
+
+@dataclass(frozen=True)
+class ProductLayout:
+    """Layout of a product table (producao, comercializacao, processamento).
+
+    Every ``control`` prefix is preceded by a category row whose ``control`` and
+    name are the category itself (no row when the category is None). Items have
+    ``control`` set to ``"<prefix>_<name>"``.
+    """
+
+    name_column: str
+    categories: Dict[str, Optional[str]]
+    sep: str = ";"
+    name_indent: str = ""
+    sentinels: bool = False
+
+
+PRODUCAO_LAYOUT = ProductLayout(
+    "produto",
+    {
+        "vm": "VINHO DE MESA",
+        "vv": "VINHO FINO DE MESA (VINIFERA)",
+        "su": "SUCO",
+        "de": "DERIVADOS",
+    },
+)
+COMERCIALIZACAO_LAYOUT = ProductLayout(
+    "Produto",
+    {
+        "vm": "VINHO DE MESA",
+        "ve": "VINHO ESPECIAL",
+        "es": "ESPUMANTES ",
+        "su": "SUCO DE UVAS",
+        "ou": "OUTROS PRODUTOS COMERCIALIZADOS",
+    },
+    name_indent="  ",
+)
+PROCESSAMENTO_LAYOUT = ProductLayout(
+    "cultivar", {"ti": "TINTAS", "br": "BRANCAS E ROSADAS"}, sep="\t", sentinels=True
+)
+SEM_CLASSE_LAYOUT = ProductLayout("cultivar", {"sc": None}, sep="\t", sentinels=True)
+
+
+@dataclass(frozen=True)
+class TradeLayout:
+    """Layout of an import/export table: the key columns and a quantity/value
+    column pair per year, both headed by the bare year (pandas reads the second
+    one as ``"<ano>.1"``)."""
+
+    keys: Tuple[str, str] = ("Id", "País")
+    sep: str = ";"
+
+
+TRADE_LAYOUT = TradeLayout()
+
+
+def _names(words, count, rng):
+    """``count`` distinct names built from ``words`` and a sequence number."""
+    picked = rng.choice(words, size=count)
+    return [f"{word} {number}" for number, word in enumerate(picked, start=1)]
+
+
+def _measures(rows, columns, rng):
+    """Non-negative integer measures, about a third of them zero like the sources."""
+    values = rng.integers(0, 10_000_000, size=(rows, columns))
+    values[rng.random((rows, columns)) < 0.3] = 0
+    return values
+
+
+def product_table(layout: ProductLayout, size: SyntheticSize, rng) -> pd.DataFrame:
+    """Wide product table with ``id``, ``control``, the name column and years."""
+    controls, names = [], []
+    for prefix, category in layout.categories.items():
+        if category is not None:
+            controls.append(category)
+            names.append(category)
+        for name in _names(NAME_WORDS, size.products, rng):
+            controls.append(f"{prefix}_{name}")
+            names.append(f"{layout.name_indent}{name}")
+
+    years = size.years
+    values = _measures(len(names), len(years), rng)
+    if layout.sentinels:
+        # marcadores da Embrapa ("nd", "*") espalhados nas colunas de ano
+        values = values.astype(object)
+        mask = rng.random(values.shape) < size.sentinel_ratio
+        values[mask] = rng.choice(["nd", "*"], size=int(mask.sum()))
+
+    data = pd.DataFrame(values, columns=years)
+    data.insert(0, "id", np.arange(1, len(names) + 1))
+    data.insert(1, "control", controls)
+    data.insert(2, layout.name_column, names)
+    return data
+
+
+def trade_table(layout: TradeLayout, size: SyntheticSize, rng) -> pd.DataFrame:
+    """Wide import/export table with one row per country."""
+    years = size.years
+    values = _measures(size.countries, 2 * len(years), rng)
+    data = pd.DataFrame(values, columns=[year for year in years for _ in range(2)])
+    data.insert(0, layout.keys[0], np.arange(1, size.countries + 1))
+    data.insert(1, layout.keys[1], _names(COUNTRY_WORDS, size.countries, rng))
+    return data
+
+
+def source_layouts() -> Dict[str, object]:
+    """Layout of every bundled source, keyed by its path."""
+    layouts = {
+        PRODUCAO_FILE_PATH: PRODUCAO_LAYOUT,
+        COMERCIALIZACAO_FILE_PATH: COMERCIALIZACAO_LAYOUT,
+    }
+    for name, source in PROCESSAMENTO_PATHS.items():
+        layout = SEM_CLASSE_LAYOUT if name == "Sem Classe" else PROCESSAMENTO_LAYOUT
+        layouts[source["path"]] = layout
+    for source in [*IMPORTACAO_PATHS.values(), *EXPORTACAO_PATHS.values()]:
+        layouts[source["path"]] = TRADE_LAYOUT
+    return layouts
+
+
+def generate(
+    folder: str, size: SyntheticSize = SyntheticSize(), seed: int = 0
+) -> Dict[str, str]:
+    """Write a synthetic copy of every source under ``folder``.
+
+    Returns the written path of each bundled source path. The same ``seed`` and
+    ``size`` always produce the same files.
+    """
+    rng = np.random.default_rng(seed)
+    written = {}
+    for path, layout in source_layouts().items():
+        target = os.path.join(folder, os.path.relpath(path, CSV_FILES_FOLDER))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if isinstance(layout, ProductLayout):
+            data = product_table(layout, size, rng)
+        else:
+            data = trade_table(layout, size, rng)
+        data.to_csv(target, sep=layout.sep, index=False)
+        written[path] = target
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = SyntheticSize()
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--products", type=int, default=defaults.products)
+    parser.add_argument("--countries", type=int, default=defaults.countries)
+    parser.add_argument("--first-year", type=int, default=defaults.first_year)
+    parser.add_argument("--last-year", type=int, default=defaults.last_year)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    size = SyntheticSize(
+        products=args.products,
+        countries=args.countries,
+        first_year=args.first_year,
+        last_year=args.last_year,
+    )
+    for target in generate(args.output, size, seed=args.seed).values():
+        logger.info(f"{target}: {os.path.getsize(target)} bytes")
+
+
+if __name__ == "__main__":
+    main()
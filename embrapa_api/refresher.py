@@ -0,0 +1,135 @@
+"""Background refresh of the dataset snapshots, off the request path."""
+
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from embrapa_api.artifacts import downloads_folder, prune_downloads
+from embrapa_api.store import BundledSourcesError, DatasetStore
+
+logger = logging.getLogger(__name__)
+
+
+def _reloader_watcher(app) -> bool:
+    """Whether this is the watcher process of the debug reloader.
+
+    With ``debug=True`` the werkzeug reloader runs the app module in a parent
+    process that only restarts the child serving the requests; the child has
+    ``WERKZEUG_RUN_MAIN`` set.
+    """
+    return app.debug and os.environ.get("WERKZEUG_RUN_MAIN") != "true"
+
+
+class BackgroundRefresher:
+    """Periodically rebuilds every dataset of a store in a daemon thread.
+
+    Each cycle re-fetches the sources (conditional GETs through the mirror),
+    runs the preprocessors and swaps the new snapshots in. Requests keep being
+    served from the current snapshot meanwhile; a failed rebuild is logged and
+    the last good snapshot stays in place until the next cycle. So does a
+    rebuild that fell back to the bundled files: their data is older than any
+    snapshot built from upstream or loaded from the build artifacts.
+    """
+
+    def __init__(self, store: DatasetStore, interval: float = 6 * 3600):
+        self.store = store
+        self.interval = interval
+        self.last_refresh: Dict[str, datetime] = {}
+        self.last_error: Dict[str, str] = {}
+        self._app = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        app.extensions["refresher"] = self
+        self.interval = app.config.get("REFRESH_INTERVAL", self.interval)
+        if app.config.get("BACKGROUND_REFRESH", not app.testing):
+            if _reloader_watcher(app):
+                logger.info("Background refresh left to the reloader's child process.")
+                return
+            self.start(app)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, app):
+        """Start the refresh thread (a no-op if it is already running)."""
+        self._app = app
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="embrapa-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        self.warm()
+        while not self._stop.wait(self.interval):
+            self.refresh_all()
+
+    def warm(self):
+        """Materialize every dataset right after startup, off the request path.
+
+        Datasets with a build artifact are read from it; the others are built.
+        """
+        with self._app.app_context():
+            for name in self.store.preprocessors:
+                if self._stop.is_set():
+                    return
+                try:
+                    self.store.get(name)
+                except Exception as e:
+                    self.last_error[name] = repr(e)
+                    logger.exception(f"Warming up {name} failed.")
+
+    def refresh_all(self):
+        """Rebuild every dataset, keeping the current snapshot on failures."""
+        with self._app.app_context():
+            for name in self.store.preprocessors:
+                if self._stop.is_set():
+                    return
+                self.refresh(name)
+
+    def refresh(self, name: str):
+        previous = self.store.current(name)
+        try:
+            # os arquivos empacotados so servem quando nao ha nada carregado
+            snapshot = self.store.refresh(name, allow_bundled=not self.store.has(name))
+        except BundledSourcesError as e:
+            self.last_error[name] = repr(e)
+            logger.warning(f"Background refresh of {name} kept the snapshot: {e}")
+            return None
+        except Exception as e:
+            self.last_error[name] = repr(e)
+            logger.exception(f"Background refresh of {name} failed; keeping snapshot.")
+            return None
+        self.last_refresh[name] = datetime.now(timezone.utc)
+        self.last_error.pop(name, None)
+        logger.info(f"Refreshed {name}: version {snapshot.version}.")
+        if previous is not None and previous.version != snapshot.version:
+            self.prune_downloads(name, {previous.version, snapshot.version})
+        return snapshot
+
+    def prune_downloads(self, name: str, keep):
+        """Drop downloads rendered for versions older than ``keep``.
+
+        The previous version is kept because requests (here or in other
+        workers) may still be sending its file; files of older versions are
+        re-rendered on demand if some worker still serves them.
+        """
+        if self._app is None:
+            return
+        try:
+            prune_downloads(downloads_folder(self._app.config), name, keep)
+        except OSError:
+            logger.exception(f"Pruning the downloads of {name} failed.")
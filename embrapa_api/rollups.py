@@ -0,0 +1,204 @@
+"""Rollup cube answering group-by aggregations of a snapshot.
+
+The cube keeps, for a few common groupings, the sum and the count of every
+measure per group. Any aggregation whose dimensions and filters fall inside
+one of those groupings is answered from it (a lookup, or a group-by over a
+table with a few hundred rows) instead of grouping the whole snapshot.
+"""
+
+import threading
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from embrapa_api.schema import YEAR_COLUMN
+
+AGGREGATIONS = ("sum", "mean", "count")
+
+# colunas numericas que podem ser agregadas em cada dataset
+MEASURES: Dict[str, List[str]] = {
+    "producao": ["VR_PRODUCAO_L"],
+    "processamento": ["QT_UVAS_PROCESSADAS_KG"],
+    "comercializacao": ["VR_COMERCIALIZACAO_L"],
+    "importacao": ["QTD_IMPORTADO_KG", "VL_VALOR_IMPORTADO_USD"],
+    "exportacao": ["QTD_EXPORTADO_KG", "VL_VALOR_EXPORTADO_USD"],
+}
+
+# colunas pelas quais cada dataset pode ser agrupado ou filtrado
+DIMENSIONS: Dict[str, List[str]] = {
+    "producao": [YEAR_COLUMN, "TIPO_PRODUTO", "ID_PRODUTO", "NM_PRODUTO"],
+    "processamento": [
+        YEAR_COLUMN,
+        "CD_TIPO_UVA",
+        "CD_TIPO_VINHO",
+        "ID_UVA_PROCESSADA",
+        "NM_UVA",
+    ],
+    "comercializacao": [YEAR_COLUMN, "TIPO_PRODUTO", "ID_PRODUTO", "NM_PRODUTO"],
+    "importacao": [YEAR_COLUMN, "NM_PAIS", "NM_ITEM"],
+    "exportacao": [YEAR_COLUMN, "NM_PAIS", "NM_ITEM"],
+}
+
+
+def common_groupings(dimensions: Sequence[str]) -> List[Tuple[str, ...]]:
+    """The grand total, each dimension alone and the year crossed with each
+    other dimension: the groupings the dashboards ask for."""
+    groupings = [()]
+    groupings += [(dimension,) for dimension in dimensions]
+    groupings += [
+        (YEAR_COLUMN, dimension)
+        for dimension in dimensions
+        if YEAR_COLUMN in dimensions and dimension != YEAR_COLUMN
+    ]
+    return groupings
+
+
+def _partials(data: pd.DataFrame, dimensions: Sequence[str], measures: List[str]):
+    """Sum and count of each measure per group, indexed by ``dimensions``.
+
+    Columns are ``(statistic, measure)`` pairs. Sums and counts of finer groups
+    add up to those of coarser groups, which is what lets the cube roll up.
+    """
+    if not dimensions:
+        totals = {}
+        for measure in measures:
+            totals[("sum", measure)] = [data[measure].sum()]
+            totals[("count", measure)] = [data[measure].count()]
+        return pd.DataFrame(totals)
+    grouped = data.groupby(list(dimensions), observed=True, sort=True)[measures]
+    return pd.concat({"sum": grouped.sum(), "count": grouped.count()}, axis=1)
+
+
+def _matches(index: pd.Index, column: str, value: str):
+    """Mask of the index entries whose ``column`` equals ``value``, given as text.
+
+    Compares the integer codes of a MultiIndex level instead of materializing
+    the level values.
+    """
+    if isinstance(index, pd.MultiIndex):
+        number = index.names.index(column)
+        level, codes = index.levels[number], index.codes[number]
+    else:
+        level, codes = index, None
+    if pd.api.types.is_integer_dtype(level.dtype):
+        try:
+            value = int(value)
+        except ValueError:
+            return np.zeros(len(index), dtype=bool)
+    if codes is None:
+        return level == value
+    code = level.get_indexer([value])[0]
+    # -1 e o codigo de valores ausentes: um valor desconhecido nao casa com nada
+    return codes == code if code >= 0 else np.zeros(len(index), dtype=bool)
+
+
+class RollupCube:
+    """Precomputed sums and counts of the measures of a table.
+
+    The common groupings are computed when the cube is built. Queries that no
+    grouping covers group the whole table once and keep the result, so they
+    are also lookups from then on.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        dimensions: Sequence[str],
+        measures: List[str],
+        groupings: Sequence[Tuple[str, ...]] = None,
+    ):
+        self.data = data
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        if groupings is None:
+            groupings = common_groupings(self.dimensions)
+        self._tables: Dict[FrozenSet[str], Tuple[Tuple[str, ...], pd.DataFrame]] = {
+            frozenset(grouping): (grouping, _partials(data, grouping, self.measures))
+            for grouping in groupings
+        }
+        self._lock = threading.Lock()
+
+    @property
+    def groupings(self) -> List[Tuple[str, ...]]:
+        return [grouping for grouping, _ in self._tables.values()]
+
+    def covering(self, dimensions) -> Optional[Tuple[str, ...]]:
+        """Smallest stored grouping that contains every one of ``dimensions``."""
+        needed = set(dimensions)
+        candidates = [
+            (len(table), grouping)
+            for key, (grouping, table) in self._tables.items()
+            if needed <= key
+        ]
+        return min(candidates)[1] if candidates else None
+
+    def _table(self, dimensions) -> Tuple[Tuple[str, ...], pd.DataFrame]:
+        grouping = self.covering(dimensions)
+        if grouping is None:
+            grouping = tuple(sorted(dimensions, key=self.dimensions.index))
+            with self._lock:
+                if frozenset(grouping) not in self._tables:
+                    self._tables[frozenset(grouping)] = (
+                        grouping,
+                        _partials(self.data, grouping, self.measures),
+                    )
+        return self._tables[frozenset(grouping)]
+
+    def validate(self, group_by, measures, filters):
+        for column in [*group_by, *filters]:
+            if column not in self.dimensions:
+                raise ValueError(f"Unknown dimension: {column}")
+        if len(set(group_by)) != len(group_by):
+            raise ValueError("Repeated dimension in group_by")
+        for measure, aggregation in measures:
+            if measure not in self.measures:
+                raise ValueError(f"Unknown measure: {measure}")
+            if aggregation not in AGGREGATIONS:
+                raise ValueError(f"Unknown aggregation: {aggregation}")
+
+    def aggregate(
+        self,
+        group_by: Sequence[str],
+        measures: Sequence[Tuple[str, str]],
+        filters: Dict[str, str] = None,
+    ) -> pd.DataFrame:
+        """Aggregate ``measures`` (``(measure, aggregation)`` pairs) per group.
+
+        ``filters`` keeps only the rows whose dimension equals the given value,
+        compared as text (``{"DT_ANO": "2020"}``). The result has one column per
+        dimension of ``group_by``, in that order, then one ``<measure>_<agg>``
+        column per requested measure; groups without rows are left out, and so
+        is the grand total when no row matches the filters.
+        """
+        filters = filters or {}
+        self.validate(group_by, measures, filters)
+        grouping, table = self._table([*group_by, *filters])
+
+        for column, value in filters.items():
+            table = table[_matches(table.index, column, value)]
+        # dimensoes filtradas tem um unico valor: basta descarta-las do indice
+        remaining = tuple(column for column in grouping if column not in filters)
+        if group_by and set(group_by) == set(remaining):
+            if filters:
+                table = table.droplevel(list(filters))
+            if tuple(group_by) != remaining:
+                table = table.reorder_levels(list(group_by)).sort_index()
+        elif group_by:
+            table = table.groupby(level=list(group_by), observed=True).sum()
+        elif len(table):
+            # sem linhas, o total tambem fica de fora em vez de virar zero
+            table = table.agg(["sum"])
+
+        result = {}
+        for measure, aggregation in measures:
+            sums, counts = table[("sum", measure)], table[("count", measure)]
+            if aggregation == "sum":
+                values = sums
+            elif aggregation == "count":
+                values = counts.astype("int64")
+            else:
+                values = sums / counts.where(counts > 0)
+            result[f"{measure}_{aggregation}"] = values
+        frame = pd.DataFrame(result, index=table.index)
+        return frame.reset_index() if group_by else frame.reset_index(drop=True)
@@ -0,0 +1,70 @@
+"""Compact in-memory representation of the refined tables.
+
+The preprocessors produce text columns as Python ``str`` objects. Snapshots
+store them as categoricals, ``DT_ANO`` as a small integer and integer measures
+in the narrowest integer type that holds them. The JSON pages are encoded
+straight from the compact columns (see ``embrapa_api.serialization``) and the
+CSV downloads print the same text, so the outputs are unchanged.
+
+``restore`` converts a slice back to the original representation. The
+request path does not use it; it is the reference the serialization is
+checked against.
+"""
+
+import numpy as np
+import pandas as pd
+
+YEAR_COLUMN = "DT_ANO"
+YEAR_DTYPE = "int16"
+
+# text columns whose distinct values are at most this fraction of the rows
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _is_year_column(values: pd.Series) -> bool:
+    """True when every year is a canonical integer string, e.g. ``"1970"``."""
+    if values.dtype != object or values.isna().any():
+        return False
+    digits = values.str.fullmatch(r"[1-9][0-9]{0,3}")
+    return bool(digits.all())
+
+
+def compact(data: pd.DataFrame, float32: bool = False) -> pd.DataFrame:
+    """Return ``data`` with categorical text, int16 years and narrow measures.
+
+    ``float32`` also narrows float measures. That saves memory but changes how
+    the values are printed, so it is off by default.
+    """
+    columns = {}
+    for column in data.columns:
+        values = data[column]
+        if column == YEAR_COLUMN and _is_year_column(values):
+            values = values.astype(YEAR_DTYPE)
+        elif values.dtype == object:
+            if values.nunique(dropna=False) <= MAX_CATEGORY_RATIO * len(values):
+                values = values.astype("category")
+        elif pd.api.types.is_integer_dtype(values):
+            values = pd.to_numeric(values, downcast="integer")
+        elif float32 and pd.api.types.is_float_dtype(values):
+            values = values.astype(np.float32)
+        columns[column] = values
+    return pd.DataFrame(columns, index=data.index)
+
+
+def restore(data: pd.DataFrame) -> pd.DataFrame:
+    """Convert a compact slice back to the representation of the preprocessors.
+
+    Reference for ``serialization.records``, which builds the same values
+    without materializing the converted frame.
+    """
+    columns = {}
+    for column in data.columns:
+        values = data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        elif column == YEAR_COLUMN and pd.api.types.is_integer_dtype(values):
+            values = values.astype(str)
+        elif pd.api.types.is_integer_dtype(values):
+            values = values.astype(np.int64)
+        columns[column] = values
+    return pd.DataFrame(columns, index=data.index)
@@ -0,0 +1,64 @@
+"""Accent- and case-insensitive prefix search over the names of a snapshot."""
+
+import re
+from bisect import bisect_left
+from typing import Iterable, List, Optional
+
+from unidecode import unidecode
+
+_WORD = re.compile(r"\w+")
+_SPACES = re.compile(r"\s+")
+
+
+def fold(text: str) -> str:
+    """Search form of a text: no accents, case-folded, single-spaced."""
+    return _SPACES.sub(" ", unidecode(str(text)).casefold()).strip()
+
+
+class PrefixIndex:
+    """Sorted word suffixes of the distinct values of a column.
+
+    The folded form of each value is indexed from the start of every word, so
+    ``"sul"`` and ``"coreia do s"`` both find ``"Coreia do Sul, República"``.
+    A lookup is a binary search for the first key with the prefix followed by
+    a scan over the matching keys.
+    """
+
+    def __init__(self, values: Iterable):
+        self.values = [
+            value for value in dict.fromkeys(values) if isinstance(value, str)
+        ]
+        self._folded = [fold(value) for value in self.values]
+        entries = sorted(
+            (text[word.start() :], position)
+            for position, text in enumerate(self._folded)
+            for word in _WORD.finditer(text)
+        )
+        self._keys = [key for key, _ in entries]
+        self._positions = [position for _, position in entries]
+
+    def __len__(self):
+        return len(self.values)
+
+    def matches(self, term: str, limit: Optional[int] = None) -> List[str]:
+        """Values with a word starting with ``term``.
+
+        Values that start with the term come first, then the others, each group
+        in alphabetical order of the folded names.
+        """
+        term = fold(term)
+        if not term:
+            return []
+        found = {}
+        for i in range(bisect_left(self._keys, term), len(self._keys)):
+            if not self._keys[i].startswith(term):
+                break
+            found.setdefault(self._positions[i], None)
+        ranked = sorted(
+            found,
+            key=lambda position: (
+                not self._folded[position].startswith(term),
+                self._folded[position],
+            ),
+        )
+        return [self.values[position] for position in ranked[:limit]]
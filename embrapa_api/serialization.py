@@ -0,0 +1,52 @@
+"""JSON encoding of snapshot pages straight from their column arrays.
+
+``encode`` uses orjson when it is installed and falls back to the standard
+library otherwise; both produce compact JSON with ``null`` for missing
+measures.
+"""
+
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from embrapa_api.schema import YEAR_COLUMN
+
+
+def column_values(values: pd.Series) -> List[Any]:
+    """Python values of a compact column, as ``restore`` would output them.
+
+    Categoricals are decoded with a single ``take`` over their categories, the
+    integer year becomes its string and NaN becomes None.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # o codigo -1 (ausente) indexa o None acrescentado ao fim das categorias
+        categories = np.append(values.cat.categories.to_numpy(dtype=object), None)
+        return categories.take(values.cat.codes.to_numpy()).tolist()
+    if values.name == YEAR_COLUMN and pd.api.types.is_integer_dtype(values):
+        return values.astype(str).tolist()
+    if values.dtype.kind in "fO" and values.hasnans:
+        array = values.to_numpy(dtype=object)
+        array[values.isna().to_numpy()] = None
+        return array.tolist()
+    return values.tolist()
+
+
+def records(data: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows of ``data`` as dicts, built from one Python list per column."""
+    columns = [column_values(data[column]) for column in data.columns]
+    names = list(data.columns)
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def encode(payload: Any) -> bytes:
+    """Compact UTF-8 JSON of ``payload``."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
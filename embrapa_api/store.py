@@ -0,0 +1,363 @@
+"""In-memory store of preprocessed datasets shared by the whole process.
+
+pandas, the indexes and the preprocessing package are imported only when a
+snapshot is first materialized, so creating the app (e.g. when a worker is
+spawned) does not pay for them.
+"""
+
+import hashlib
+import importlib
+import logging
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type
+
+from embrapa_api.artifacts import read_artifact, read_manifest
+from embrapa_api.config import ARTIFACTS_FOLDER
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from embrapa_api.indexes import BitmapIndex, HashIndex, SortedIndex
+    from embrapa_api.preprocessing.preprocessors import BasePreprocessor
+    from embrapa_api.rollups import RollupCube
+    from embrapa_api.search import PrefixIndex
+
+logger = logging.getLogger(__name__)
+
+
+class BundledSourcesError(RuntimeError):
+    """A rebuild read some sources from the bundled files instead of upstream."""
+
+    def __init__(self, name: str, paths: List[str]):
+        super().__init__(f"{name} fell back to the bundled files: {', '.join(paths)}")
+        self.name = name
+        self.paths = paths
+
+
+class LazyClasses(Mapping):
+    """Name to class mapping that imports each class on first access.
+
+    Iterating over the names does not import anything.
+    """
+
+    def __init__(self, paths: Dict[str, str]):
+        self._paths = paths
+
+    def __getitem__(self, name: str) -> Type:
+        module, _, attribute = self._paths[name].rpartition(".")
+        return getattr(importlib.import_module(module), attribute)
+
+    def __contains__(self, name) -> bool:
+        return name in self._paths
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+
+_PREPROCESSORS_MODULE = "embrapa_api.preprocessing.preprocessors"
+PREPROCESSORS: Mapping[str, Type["BasePreprocessor"]] = LazyClasses(
+    {
+        "producao": f"{_PREPROCESSORS_MODULE}.ProducaoPreprocessor",
+        "processamento": f"{_PREPROCESSORS_MODULE}.ProcessamentoPreprocessor",
+        "comercializacao": f"{_PREPROCESSORS_MODULE}.ComercializacaoPreprocessor",
+        "importacao": f"{_PREPROCESSORS_MODULE}.ImportacaoPreprocessor",
+        "exportacao": f"{_PREPROCESSORS_MODULE}.ExportacaoPreprocessor",
+    }
+)
+
+# colunas cujos valores distintos alimentam os filtros das telas de cada dataset
+FACETS: Dict[str, List[str]] = {
+    "producao": ["ID_PRODUTO"],
+    "processamento": ["ID_UVA_PROCESSADA"],
+    "comercializacao": ["NM_PRODUTO"],
+    "importacao": ["NM_ITEM", "NM_PAIS"],
+    "exportacao": ["NM_ITEM", "NM_PAIS"],
+}
+
+# colunas de nomes com busca por prefixo (autocomplete e parametro ``search``)
+SEARCH_COLUMNS: Dict[str, List[str]] = {
+    "producao": ["NM_PRODUTO"],
+    "processamento": ["NM_UVA"],
+    "comercializacao": ["NM_PRODUTO"],
+    "importacao": ["NM_PAIS"],
+    "exportacao": ["NM_PAIS"],
+}
+
+
+def _content_version(data: "pd.DataFrame") -> str:
+    """Stable hash of the table contents, used to identify a snapshot."""
+    import pandas as pd
+
+    digest = hashlib.sha1(",".join(data.columns).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class Snapshot:
+    """A finished, read-only table produced by a preprocessor."""
+
+    name: str
+    data: "pd.DataFrame"
+    version: str
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    _derived: Dict = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    @classmethod
+    def from_frame(cls, name: str, data: "pd.DataFrame", version: str = None):
+        data = data.reset_index(drop=True)
+        return cls(name=name, data=data, version=version or _content_version(data))
+
+    def derived(self, key, builder: Callable):
+        """Return a structure derived from this snapshot, building it only once."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = builder()
+        return self._derived[key]
+
+    def seed(self, key, value: Any):
+        """Provide a derived structure computed elsewhere (e.g. by the build)."""
+        with self._lock:
+            self._derived.setdefault(key, value)
+
+    def facet(self, column: str) -> List:
+        """Distinct values of ``column``, in order of first appearance."""
+        return self.derived(
+            ("facet", column), lambda: self.data[column].unique().tolist()
+        )
+
+    def index(self, column: str) -> "HashIndex":
+        """Value to row-position index of ``column``."""
+        from embrapa_api.indexes import HashIndex
+
+        return self.derived(("index", column), lambda: HashIndex(self.data[column]))
+
+    def rollups(self) -> "RollupCube":
+        """Rollup cube of the measures of this snapshot, built on first use."""
+        from embrapa_api.rollups import DIMENSIONS, MEASURES, RollupCube
+
+        return self.derived(
+            ("rollups",),
+            lambda: RollupCube(self.data, DIMENSIONS[self.name], MEASURES[self.name]),
+        )
+
+    def bitmap_index(self, column: str) -> "BitmapIndex":
+        """Per-value bitmaps of a low-cardinality ``column``, for value lists."""
+        from embrapa_api.indexes import BitmapIndex
+
+        return self.derived(
+            ("bitmap_index", column), lambda: BitmapIndex(self.data[column])
+        )
+
+    def search_index(self, column: str) -> "PrefixIndex":
+        """Prefix search over the distinct values of ``column``."""
+        from embrapa_api.search import PrefixIndex
+
+        # fora do builder: derived nao e reentrante
+        values = self.facet(column)
+        return self.derived(("search_index", column), lambda: PrefixIndex(values))
+
+    def sorted_index(self, column: str) -> "SortedIndex":
+        """Value-ordered row positions of a numeric ``column``."""
+        from embrapa_api.indexes import SortedIndex
+
+        return self.derived(
+            ("sorted_index", column), lambda: SortedIndex(self.data[column])
+        )
+
+    def positions(
+        self, filters: Dict, ranges: Dict[str, Tuple] = None
+    ) -> Optional["np.ndarray"]:
+        """Sorted positions of the rows matching every filter and range.
+
+        ``filters`` maps a column to a value or to a list of accepted values;
+        ``ranges`` maps a column to ``(low, high)`` (bounds inclusive, None for
+        unbounded). Value lists on columns with few distinct values are
+        resolved on bitmaps; the other filters on the hash indexes, as unions
+        of their position arrays. Returns None when there is no filter.
+        """
+        from embrapa_api.indexes import (
+            BITMAP_MAX_VALUES,
+            bitmap_positions,
+            intersect_positions,
+            range_positions,
+        )
+
+        position_sets = []
+        bitmapped = {}
+        for column, value in filters.items():
+            values = [value] if isinstance(value, str) else value
+            index = self.index(column)
+            if len(values) > 1 and len(index) <= BITMAP_MAX_VALUES:
+                bitmapped[column] = values
+            else:
+                position_sets.append(index.lookup_any(values))
+        if bitmapped:
+            bitmaps = {column: self.bitmap_index(column) for column in bitmapped}
+            position_sets.append(bitmap_positions(bitmaps, bitmapped))
+        positions = intersect_positions(position_sets)
+        for column, (low, high) in (ranges or {}).items():
+            positions = range_positions(positions, self.sorted_index(column), low, high)
+        return positions
+
+
+class DatasetStore:
+    """Holds one snapshot per dataset, built once and then served from memory.
+
+    Each dataset is read from its build artifact, or built by running its
+    preprocessor, the first time it is requested. Builds are serialized per
+    dataset, so concurrent requests for a cold dataset run the ETL only once.
+    """
+
+    def __init__(
+        self,
+        preprocessors: Mapping[str, Type["BasePreprocessor"]] = None,
+        compact_schema: bool = True,
+        float32: bool = False,
+    ):
+        self.preprocessors = preprocessors or PREPROCESSORS
+        self.compact_schema = compact_schema
+        self.float32 = float32
+        self._snapshots: Dict[str, Snapshot] = {}
+        # artefatos registrados na partida e lidos no primeiro acesso
+        self._artifacts: Dict[str, Tuple[str, Dict]] = {}
+        self._locks = {name: threading.Lock() for name in self.preprocessors}
+        self._listeners: List[Callable[[Snapshot], None]] = []
+
+    def init_app(self, app):
+        app.extensions["dataset_store"] = self
+        self.compact_schema = app.config.get("COMPACT_SCHEMA", self.compact_schema)
+        self.float32 = app.config.get("FLOAT32_MEASURES", self.float32)
+        # com dados locais, os artefatos do ultimo build nao podem se sobrepor a eles
+        load = app.config.get("LOAD_ARTIFACTS", not app.config.get("USE_LOCAL_DATA"))
+        if load:
+            self.load_artifacts(app.config.get("ARTIFACTS_FOLDER", ARTIFACTS_FOLDER))
+
+    def subscribe(self, listener: Callable[[Snapshot], None]):
+        """Register a callback invoked every time a new snapshot is installed."""
+        self._listeners.append(listener)
+
+    def _swap(self, snapshot: Snapshot):
+        self._snapshots[snapshot.name] = snapshot
+        self._artifacts.pop(snapshot.name, None)
+        for listener in self._listeners:
+            listener(snapshot)
+
+    def _check_name(self, name: str):
+        if name not in self.preprocessors:
+            raise KeyError(f"Unknown dataset: {name}")
+
+    def has(self, name: str) -> bool:
+        """Whether the dataset is available without running its preprocessor."""
+        return name in self._snapshots or name in self._artifacts
+
+    def current(self, name: str) -> Optional[Snapshot]:
+        """The snapshot in memory for a dataset, if any, without building it."""
+        return self._snapshots.get(name)
+
+    def get(self, name: str) -> Snapshot:
+        """Return the current snapshot of a dataset, building it if needed."""
+        snapshot = self._snapshots.get(name)
+        if snapshot is not None:
+            return snapshot
+        self._check_name(name)
+        with self._locks[name]:
+            snapshot = self._snapshots.get(name)
+            if snapshot is None:
+                if name in self._artifacts:
+                    snapshot = self._read_artifact(name)
+                else:
+                    snapshot = self._build(name)
+                self._swap(snapshot)
+        return snapshot
+
+    def _snapshot(self, name: str, data: "pd.DataFrame", version: str = None):
+        if self.compact_schema:
+            from embrapa_api.schema import compact
+
+            data = compact(data, float32=self.float32)
+        return Snapshot.from_frame(name, data, version)
+
+    def _read_artifact(self, name: str) -> Snapshot:
+        folder, entry = self._artifacts[name]
+        artifact = read_artifact(folder, entry)
+        snapshot = self._snapshot(name, artifact["data"], artifact["version"])
+        for column, values in artifact["facets"].items():
+            snapshot.seed(("facet", column), values)
+        logger.info(f"Loaded dataset snapshot {name} from {folder}.")
+        return snapshot
+
+    def _build(self, name: str, allow_bundled: bool = True) -> Snapshot:
+        logger.info(f"Building dataset snapshot: {name}")
+        preprocessor = self.preprocessors[name]()
+        data = preprocessor.preprocess()
+        if preprocessor.bundled_sources and not allow_bundled:
+            raise BundledSourcesError(name, preprocessor.bundled_sources)
+        return self._snapshot(name, data)
+
+    def refresh(self, name: str, allow_bundled: bool = True) -> Snapshot:
+        """Rebuild a dataset and swap the new snapshot in.
+
+        Readers keep getting the previous snapshot while the build runs. When
+        the rebuilt table has the same content version, the current snapshot
+        (and everything derived from it) is kept. With ``allow_bundled=False``,
+        a build that fell back to the bundled files raises
+        ``BundledSourcesError`` instead of replacing the current data.
+        """
+        self._check_name(name)
+        with self._locks[name]:
+            snapshot = self._build(name, allow_bundled)
+            current = self._snapshots.get(name)
+            if current is not None and current.version == snapshot.version:
+                logger.info(f"Dataset {name} unchanged (version {current.version}).")
+                return current
+            self._swap(snapshot)
+        return snapshot
+
+    def put(self, name: str, data: "pd.DataFrame", version: str = None) -> Snapshot:
+        """Install an already preprocessed table as the current snapshot."""
+        self._check_name(name)
+        snapshot = self._snapshot(name, data, version)
+        with self._locks[name]:
+            self._swap(snapshot)
+        return snapshot
+
+    def load_artifacts(self, folder: str):
+        """Register the snapshots persisted by the build step, if any.
+
+        Only the manifest is read here; each table is memory-mapped the first
+        time its dataset is requested. Datasets that already have a snapshot in
+        memory are left untouched.
+        """
+        datasets = read_manifest(folder)["datasets"]
+        if not datasets:
+            logger.info(
+                f"No artifacts in {folder} (see `python -m embrapa_api.build`); "
+                "datasets will be built on first use."
+            )
+        for name, entry in datasets.items():
+            if name in self.preprocessors and name not in self._snapshots:
+                self._artifacts[name] = (folder, entry)
+
+    def clear(self, name: str = None):
+        """Drop one snapshot (or all of them) so the next read rebuilds it."""
+        if name is None:
+            self._snapshots.clear()
+            self._artifacts.clear()
+        else:
+            self._snapshots.pop(name, None)
+            self._artifacts.pop(name, None)
@@ -1,6 +1,7 @@
 from app import create_app
 
-app = create_app()
+# DEBUG ja na criacao: o processo observador do reloader nao inicia o refresher
+app = create_app({'DEBUG': True} if __name__ == "__main__" else None)
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,24 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Aplicação com os CSVs do repositório, ignorando artefatos de builds
+    anteriores e renderizando os downloads em uma pasta temporária."""
+    app = create_app(
+        {
+            'TESTING': True,
+            'USE_LOCAL_DATA': True,
+            'LOAD_ARTIFACTS': False,
+            'DOWNLOADS_FOLDER': str(tmp_path),
+        }
+    )
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,86 @@
+import pytest
+
+from app import store
+
+
+def test_aggregate_by_year(client):
+    """Soma do valor exportado por ano para um país, como nos dashboards."""
+    data = store.get('exportacao').data
+    chile = data[data['NM_PAIS'] == 'Chile']
+    expected = chile.groupby('DT_ANO')['VL_VALOR_EXPORTADO_USD'].sum()
+
+    rv = client.get(
+        '/aggregate/exportacao?group_by=DT_ANO'
+        '&measures=VL_VALOR_EXPORTADO_USD&NM_PAIS=Chile'
+    )
+
+    assert rv.status_code == 200
+    assert rv.json['groups'] == len(expected)
+    assert {
+        row['DT_ANO']: row['VL_VALOR_EXPORTADO_USD_sum'] for row in rv.json['data']
+    } == {str(year): value for year, value in expected.items()}
+
+
+def test_aggregate_defaults_to_total_of_every_measure(client):
+    data = store.get('importacao').data
+
+    rv = client.get('/aggregate/importacao')
+
+    assert rv.json['data'] == [
+        {
+            'QTD_IMPORTADO_KG_sum': int(data['QTD_IMPORTADO_KG'].sum()),
+            'VL_VALOR_IMPORTADO_USD_sum': float(data['VL_VALOR_IMPORTADO_USD'].sum()),
+        }
+    ]
+
+
+def test_aggregate_mean_and_count(client):
+    data = store.get('producao').data
+    grouped = data.groupby('TIPO_PRODUTO', observed=True)['VR_PRODUCAO_L']
+
+    rv = client.get(
+        '/aggregate/producao?group_by=TIPO_PRODUTO'
+        '&measures=VR_PRODUCAO_L:mean,VR_PRODUCAO_L:count'
+    )
+
+    rows = {row['TIPO_PRODUTO']: row for row in rv.json['data']}
+    for tipo, mean in grouped.mean().items():
+        assert rows[tipo]['VR_PRODUCAO_L_mean'] == pytest.approx(mean)
+        assert rows[tipo]['VR_PRODUCAO_L_count'] == grouped.count()[tipo]
+
+
+def test_aggregate_cached_per_snapshot(client):
+    url = '/aggregate/comercializacao?group_by=DT_ANO'
+
+    first = client.get(url)
+    second = client.get(url)
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert first.json == second.json
+
+
+@pytest.mark.parametrize(
+    'url, status',
+    [
+        ('/aggregate/vinhos', 404),
+        ('/aggregate/producao?group_by=VR_PRODUCAO_L', 400),
+        ('/aggregate/producao?measures=NM_PRODUTO', 400),
+        ('/aggregate/producao?measures=VR_PRODUCAO_L:max', 400),
+        ('/aggregate/exportacao?DT_ANO=abc', 400),
+    ],
+)
+def test_aggregate_invalid(client, url, status):
+    rv = client.get(url)
+
+    assert rv.status_code == status
+    assert 'error' in rv.json
+
+
+@pytest.mark.parametrize('query', ['NM_PAIS=Foo', 'DT_ANO=1800'])
+def test_aggregate_total_without_rows(client, query):
+    """Um filtro sem linhas não devolve um total zero."""
+    rv = client.get(f'/aggregate/exportacao?{query}')
+
+    assert rv.status_code == 200
+    assert rv.json == {'groups': 0, 'data': []}
@@ -1,24 +1,16 @@
-import pytest
-
-from app import create_app
+import gzip
+from unittest.mock import patch
 
+import pytest
 
-# Configuração do aplicativo Flask para testes
-@pytest.fixture
-def app():
-    app = create_app(
-        {
-            'TESTING': True,
-            'USE_LOCAL_DATA': True,
-            'CACHE_TYPE': 'simple',
-        }
-    )
-    return app
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
+from flasgger import Swagger
 
-@pytest.fixture
-def client(app):
-    return app.test_client()
+from app import create_app
 
 
 # Testes para os endpoints
@@ -63,3 +55,129 @@ def test_download_exportacao(client):
     assert rv.status_code == 200
     assert rv.mimetype == 'text/csv'
     assert "attachment; filename=exportacao.csv" in rv.headers['Content-Disposition']
+
+
+def test_data_endpoints_reuse_snapshot(client):
+    """As rotas leem do store: o preprocessamento roda uma vez por dataset."""
+    from app import store
+    from embrapa_api.preprocessing.preprocessors import ProducaoPreprocessor
+
+    store.clear('producao')
+    with patch.object(
+        ProducaoPreprocessor,
+        'preprocess',
+        autospec=True,
+        side_effect=ProducaoPreprocessor.preprocess,
+    ) as mock_preprocess:
+        client.get('/get_producao_data?start=0&length=10')
+        client.get('/get_producao_data?start=10&length=10')
+        client.get('/download_producao')
+
+    assert mock_preprocess.call_count == 1
+
+
+def test_download_identity_matches_csv(client):
+    """Sem Accept-Encoding o CSV é enviado sem compressão e idêntico ao
+    gerado pelo pandas, em blocos."""
+    from app import store
+    from embrapa_api.artifacts import iter_csv
+
+    data = store.get('exportacao').data
+    chunks = list(iter_csv(data, chunk_rows=1000))
+
+    rv = client.get('/download_exportacao', headers={'Accept-Encoding': 'identity'})
+
+    assert len(chunks) == -(-len(data) // 1000)
+    assert b"".join(chunks) == data.to_csv(index=False).encode()
+    assert 'Content-Encoding' not in rv.headers
+    assert rv.data == data.to_csv(index=False).encode()
+
+
+@pytest.mark.parametrize(
+    'encoding, decompress',
+    [('gzip', gzip.decompress), ('br', lambda body: brotli.decompress(body))],
+)
+def test_download_compressed(client, encoding, decompress):
+    """O download pré-comprimido é escolhido conforme o Accept-Encoding."""
+    if encoding == 'br':
+        pytest.importorskip('brotli')
+    from app import store
+
+    rv = client.get('/download_producao', headers={'Accept-Encoding': encoding})
+
+    assert rv.status_code == 200
+    assert rv.headers['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in rv.headers['Vary']
+    expected = store.get('producao').data.to_csv(index=False).encode()
+    assert decompress(rv.data) == expected
+
+
+def test_download_not_modified(client):
+    """Um download repetido com If-None-Match recebe 304 sem corpo."""
+    from app import store
+
+    first = client.get('/download_importacao', headers={'Accept-Encoding': 'gzip'})
+    etag = first.headers['ETag']
+    second = client.get(
+        '/download_importacao',
+        headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag},
+    )
+
+    assert store.get('importacao').version in etag
+    assert second.status_code == 304
+    assert second.data == b''
+
+
+def test_download_rerendered_when_file_removed(client, tmp_path):
+    """Se o arquivo já servido foi removido (por um build ou outro worker), o
+    download é renderizado de novo em vez de falhar."""
+    first = client.get('/download_producao', headers={'Accept-Encoding': 'gzip'})
+    for path in tmp_path.iterdir():
+        path.unlink()
+
+    rv = client.get('/download_producao', headers={'Accept-Encoding': 'gzip'})
+
+    assert rv.status_code == 200
+    assert rv.data == first.data
+
+
+def test_metrics_stage_histograms(client):
+    """As etapas de filtro, paginação e serialização aparecem em /metrics."""
+    client.get('/get_importacao_data?length=5&NM_PAIS=Chile&_=metrics')
+
+    rv = client.get('/metrics')
+    assert rv.status_code == 200
+    assert rv.mimetype == 'text/plain'
+    body = rv.data.decode('utf-8')
+    assert '# TYPE embrapa_stage_seconds histogram' in body
+    for stage in ('filter', 'paginate', 'serialize'):
+        assert (
+            f'embrapa_stage_seconds_count{{dataset="importacao",stage="{stage}"}}'
+            in body
+        )
+
+
+def test_metrics_disabled(tmp_path):
+    app = create_app(
+        {
+            'TESTING': True,
+            'LOAD_ARTIFACTS': False,
+            'METRICS_ENABLED': False,
+            'DOWNLOADS_FOLDER': str(tmp_path),
+        }
+    )
+    assert app.test_client().get('/metrics').status_code == 404
+
+
+def test_apispec_parsed_once_in_debug(app):
+    """A spec do Swagger é montada uma única vez, mesmo em modo debug."""
+    app.debug = True
+    client = app.test_client()
+    with patch.object(
+        Swagger, 'get_apispecs', autospec=True, return_value={'swagger': '2.0'}
+    ) as parse:
+        first = client.get('/apispec_1.json')
+        second = client.get('/apispec_1.json')
+
+    assert first.json == second.json == {'swagger': '2.0'}
+    assert parse.call_count == 1
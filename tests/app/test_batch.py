@@ -0,0 +1,173 @@
+import json
+
+import pytest
+
+from app import store
+from app.routes import encode_cursor
+
+
+def without_draw(body):
+    body.pop('draw')
+    return body
+
+
+def test_batch_matches_single_requests(client):
+    """Cada resultado do lote é o corpo de /get_*_data da mesma consulta."""
+    rv = client.post(
+        '/batch',
+        json={
+            'queries': [
+                {'dataset': 'producao', 'length': 5},
+                {
+                    'dataset': 'exportacao',
+                    'filters': {'NM_PAIS': ['Chile', 'Japão']},
+                    'year_from': 2010,
+                    'length': 20,
+                },
+                {'dataset': 'importacao', 'filters': {'NM_PAIS': 'Chile'}},
+            ]
+        },
+    )
+
+    assert rv.status_code == 200
+    results = rv.json['results']
+    urls = [
+        '/get_producao_data?length=5',
+        '/get_exportacao_data?NM_PAIS=Chile,Japão&year_from=2010&length=20',
+        '/get_importacao_data?NM_PAIS=Chile',
+    ]
+    assert [result.pop('dataset') for result in results] == [
+        'producao',
+        'exportacao',
+        'importacao',
+    ]
+    assert results == [without_draw(client.get(url).json) for url in urls]
+
+
+def test_batch_shares_response_cache(client):
+    """Consultas do lote e dos endpoints de dados usam as mesmas entradas."""
+    batch = client.post(
+        '/batch', json={'queries': [{'dataset': 'producao', 'length': 3}]}
+    )
+    assert batch.json['results'][0]['recordsFiltered'] > 0
+
+    rv = client.get('/get_producao_data?length=3')
+
+    assert rv.headers['X-Cache'] == 'HIT'
+
+
+def test_batch_fields(client):
+    rv = client.post(
+        '/batch',
+        json={
+            'queries': [
+                {'dataset': 'exportacao', 'fields': ['DT_ANO', 'NM_PAIS']},
+                {'dataset': 'exportacao', 'fields': 'NM_PAIS'},
+            ]
+        },
+    )
+
+    first, second = rv.json['results']
+    assert set(first['data'][0]) == {'DT_ANO', 'NM_PAIS'}
+    assert set(second['data'][0]) == {'NM_PAIS'}
+
+
+def test_batch_is_streamed(client):
+    rv = client.post('/batch', json={'queries': []}, buffered=False)
+
+    assert rv.is_streamed
+    assert json.loads(rv.get_data()) == {'results': []}
+
+
+def test_data_fields(client):
+    rv = client.get('/get_importacao_data?fields=NM_PAIS,VL_VALOR_IMPORTADO_USD')
+
+    assert rv.status_code == 200
+    assert list(rv.json['data'][0]) == ['NM_PAIS', 'VL_VALOR_IMPORTADO_USD']
+
+
+@pytest.mark.parametrize(
+    'payload, status, message',
+    [
+        ({'queries': [{'dataset': 'vinhos'}]}, 400, 'Dataset inexistente'),
+        (
+            {'queries': [{'dataset': 'producao', 'filters': {'NM_PAIS': 'Chile'}}]},
+            400,
+            'Campo sem filtro',
+        ),
+        (
+            {'queries': [{'dataset': 'producao', 'fields': ['VR_EXPORTADO']}]},
+            400,
+            'Coluna inexistente',
+        ),
+        ({'queries': [{'dataset': 'producao', 'length': 'dez'}]}, 400, 'dez'),
+        ({'queries': [{'dataset': ['producao']}]}, 400, 'Dataset inexistente'),
+        ({'queries': [{'dataset': {'nome': 'producao'}}]}, 400, 'Dataset inexistente'),
+        ({'queries': ['producao']}, 400, 'objeto'),
+        (
+            {'queries': [{'dataset': 'producao', 'filters': {'ID_PRODUTO': {}}}]},
+            400,
+            'Valor inválido em ID_PRODUTO',
+        ),
+        (
+            {'queries': [{'dataset': 'producao', 'filters': {'ID_PRODUTO': [['10']]}}]},
+            400,
+            'Valor inválido em ID_PRODUTO',
+        ),
+        (
+            {'queries': [{'dataset': 'exportacao', 'search': {'q': 'chile'}}]},
+            400,
+            'Valor inválido em search',
+        ),
+        (
+            {'queries': [{'dataset': 'producao', 'cursor': encode_cursor('v0', 5)}]},
+            409,
+            'atualizado',
+        ),
+    ],
+)
+def test_batch_invalid_query(client, payload, status, message):
+    """O erro indica a consulta inválida e nenhuma consulta é executada."""
+    payload['queries'].insert(0, {'dataset': 'producao'})
+
+    rv = client.post('/batch', json=payload)
+
+    assert rv.status_code == status
+    assert message in rv.json['error']
+    assert rv.json['query'] == 1
+
+
+@pytest.mark.parametrize('payload', [None, [], {'queries': {}}])
+def test_batch_invalid_body(client, payload):
+    assert client.post('/batch', json=payload).status_code == 400
+
+
+def test_batch_limit(app, client):
+    app.config['BATCH_MAX_QUERIES'] = 2
+
+    rv = client.post('/batch', json={'queries': [{'dataset': 'producao'}] * 3})
+
+    assert rv.status_code == 400
+
+
+def test_batch_uses_one_snapshot(client):
+    """Uma atualização durante o streaming não mistura versões no lote."""
+    snapshot = store.get('producao')
+    rv = client.post(
+        '/batch',
+        json={
+            'queries': [{'dataset': 'producao', 'start': start} for start in (0, 10)]
+        },
+        buffered=False,
+    )
+    chunks = rv.response
+    received = next(chunks) + next(chunks) + next(chunks)
+    store.put('producao', snapshot.data.iloc[:5], version='atualizado')
+    try:
+        body = json.loads(received + b''.join(chunks))
+    finally:
+        store.clear('producao')
+
+    assert [result['recordsTotal'] for result in body['results']] == [
+        len(snapshot.data)
+    ] * 2
@@ -0,0 +1,144 @@
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from app import store
+from app.routes import filter_values
+
+
+def test_year_range(client):
+    """Exportações de 2010 a 2023, como nas perguntas por período."""
+    data = store.get('exportacao').data
+    expected = data[(data['DT_ANO'] >= 2010) & (data['DT_ANO'] <= 2023)]
+
+    rv = client.get('/get_exportacao_data?year_from=2010&year_to=2023&length=100000')
+
+    assert rv.json['recordsFiltered'] == len(expected)
+    assert rv.json['recordsTotal'] == len(data)
+    assert {row['DT_ANO'] for row in rv.json['data']} == {
+        str(year) for year in range(2010, 2024)
+    }
+
+
+def test_year_range_with_equality_filter(client):
+    data = store.get('importacao').data
+    expected = data[(data['NM_PAIS'] == 'Chile') & (data['DT_ANO'] >= 2015)]
+
+    rv = client.get('/get_importacao_data?NM_PAIS=Chile&year_from=2015&length=1000')
+
+    assert rv.json['recordsFiltered'] == len(expected)
+    assert [row['DT_ANO'] for row in rv.json['data']] == expected['DT_ANO'].astype(
+        str
+    ).tolist()
+
+
+def test_year_range_pages_with_cursor(client):
+    """O cursor continua a paginação dentro da faixa de anos."""
+    url = '/get_producao_data?year_to=1980&length=100'
+    first = client.get(url).json
+
+    second = client.get(f"{url}&cursor={first['next_cursor']}").json
+
+    expected = client.get('/get_producao_data?year_to=1980&start=100&length=100').json
+    assert second['data'] == expected['data']
+    assert all(int(row['DT_ANO']) <= 1980 for row in second['data'])
+
+
+def test_invalid_year(client):
+    rv = client.get('/get_producao_data?year_from=dois-mil')
+
+    assert rv.status_code == 400
+
+
+@pytest.mark.parametrize(
+    'query',
+    [
+        'NM_PAIS=Chile&NM_PAIS=Alemanha&NM_PAIS=Japão',
+        'NM_PAIS=Chile,Alemanha,Japão',
+        'NM_PAIS=Japão, Chile&NM_PAIS=Alemanha',
+    ],
+)
+def test_multi_value_filter(client, query):
+    """Parâmetros repetidos e listas separadas por vírgula têm o mesmo efeito."""
+    data = store.get('exportacao').data
+    expected = data[data['NM_PAIS'].isin(['Chile', 'Alemanha', 'Japão'])]
+
+    rv = client.get(f'/get_exportacao_data?length=100000&{query}')
+
+    assert rv.json['recordsFiltered'] == len(expected)
+    assert [row['NM_PAIS'] for row in rv.json['data']] == expected['NM_PAIS'].tolist()
+
+
+def test_multi_value_filters_combined(client):
+    data = store.get('importacao').data
+    expected = data[
+        data['NM_PAIS'].isin(['Chile', 'Argentina'])
+        & data['NM_ITEM'].isin(['Vinhos', 'Sucos'])
+        & (data['DT_ANO'] <= 2000)
+    ]
+
+    rv = client.get(
+        '/get_importacao_data?length=100000&NM_PAIS=Chile,Argentina'
+        '&NM_ITEM=Vinhos&NM_ITEM=Sucos&year_to=2000'
+    )
+
+    assert rv.json['recordsFiltered'] == len(expected)
+
+
+def test_value_with_comma_is_not_split(client):
+    """Nomes com vírgula existentes no dataset não são separados."""
+    data = store.get('importacao').data
+    country = 'Coreia do Sul, República'
+    expected = data[data['NM_PAIS'].isin([country, 'Chile'])]
+
+    single = client.get(f'/get_importacao_data?NM_PAIS={country}')
+    listed = client.get(f'/get_importacao_data?NM_PAIS={country}&NM_PAIS=Chile')
+
+    assert single.json['recordsFiltered'] == (data['NM_PAIS'] == country).sum()
+    assert listed.json['recordsFiltered'] == len(expected)
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        'Chile,Coreia do Sul, República',
+        'Coreia do Sul, República,Chile',
+        'Chile, Coreia do Sul, República',
+    ],
+)
+def test_list_mixing_value_with_comma(client, value):
+    """Numa lista, os pedaços são remontados nos nomes existentes com vírgula."""
+    data = store.get('importacao').data
+    expected = data[data['NM_PAIS'].isin(['Coreia do Sul, República', 'Chile'])]
+
+    rv = client.get(f'/get_importacao_data?NM_PAIS={value}')
+
+    assert rv.status_code == 200
+    assert rv.json['recordsFiltered'] == len(expected)
+
+
+def test_list_keeps_values_with_surrounding_spaces():
+    """Nomes com espaços nas pontas (como nos dados ampliados) casam inteiros."""
+    known = {'  Tinto', '  Rosado', 'Coreia do Sul, República'}
+    args = MultiDict({'NM_PRODUTO': '  Tinto,  Rosado, Coreia do Sul, República'})
+
+    values = filter_values(args, 'NM_PRODUTO', known)
+
+    assert values == ['  Tinto', '  Rosado', 'Coreia do Sul, República']
+
+
+def test_list_with_unknown_value(client):
+    """Um pedaço que não é valor do dataset é recusado, em vez de ser ignorado."""
+    rv = client.get('/get_importacao_data?NM_PAIS=Chile,Coreia do Leste, República')
+
+    assert rv.status_code == 400
+    assert 'Coreia do Leste' in rv.json['error']
+
+
+def test_multi_value_filter_shares_cache_entry(client):
+    """A ordem dos valores não muda a entrada de cache."""
+    first = client.get('/get_producao_data?ID_PRODUTO=12,10')
+    second = client.get('/get_producao_data?ID_PRODUTO=10&ID_PRODUTO=12')
+
+    assert first.json['recordsFiltered'] > 0
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
@@ -0,0 +1,115 @@
+import pytest
+
+from app import store
+from app.routes import encode_cursor
+
+
+def walk(client, url):
+    """Percorre todas as páginas seguindo o next_cursor."""
+    pages = [client.get(url).json]
+    while pages[-1]['next_cursor']:
+        pages.append(client.get(f"{url}&cursor={pages[-1]['next_cursor']}").json)
+    return pages
+
+
+@pytest.mark.parametrize(
+    'query, length',
+    [('', 700), ('NM_PAIS=Alemanha', 50)],
+)
+def test_cursor_pages_match_offset_pages(client, query, length):
+    """Seguir o cursor entrega as mesmas linhas da paginação por start."""
+    everything = client.get(f'/get_exportacao_data?length=100000&{query}').json
+
+    pages = walk(client, f'/get_exportacao_data?length={length}&{query}')
+
+    assert [row for page in pages for row in page['data']] == everything['data']
+    assert len(pages) == -(-everything['recordsFiltered'] // length)
+    assert pages[-1]['next_cursor'] is None
+    assert everything['next_cursor'] is None
+
+
+def test_cursor_ignores_start(client):
+    """Com cursor, o start é ignorado e a página segue a última linha entregue."""
+    first = client.get('/get_producao_data?length=10').json
+
+    rv = client.get(
+        f"/get_producao_data?length=10&start=500&cursor={first['next_cursor']}"
+    )
+
+    expected = client.get('/get_producao_data?start=10&length=10').json
+    assert rv.json['data'] == expected['data']
+
+
+def test_stale_cursor(client):
+    """Um cursor de outra versão do snapshot é recusado com 409."""
+    cursor = client.get('/get_comercializacao_data?length=5').json['next_cursor']
+    snapshot = store.get('comercializacao')
+    store.put('comercializacao', snapshot.data.iloc[:100])
+    try:
+        rv = client.get(f'/get_comercializacao_data?length=5&cursor={cursor}')
+    finally:
+        store.clear('comercializacao')
+
+    assert rv.status_code == 409
+    assert 'error' in rv.json
+
+
+def test_invalid_cursor(client):
+    rv = client.get('/get_producao_data?cursor=nao-e-um-cursor')
+
+    assert rv.status_code == 400
+    assert 'error' in rv.json
+
+
+@pytest.mark.parametrize('query', ['start=-5', 'length=-2', 'start=-1&length=-1'])
+def test_negative_start_or_length(client, query):
+    """start negativo (que devolveria as últimas linhas) e length menor que -1
+    são recusados com 400, sem emitir cursor."""
+    rv = client.get(f'/get_producao_data?{query}')
+
+    assert rv.status_code == 400
+    assert 'error' in rv.json
+
+
+def test_invalid_draw(client):
+    rv = client.get('/get_producao_data?draw=abc')
+
+    assert rv.status_code == 400
+    assert 'error' in rv.json
+
+
+def test_draw_echoed(client):
+    rv = client.get('/get_producao_data?draw=7&length=1')
+
+    assert rv.json['draw'] == 7
+
+
+def test_negative_cursor_position(client):
+    cursor = encode_cursor(store.get('producao').version, -5)
+
+    rv = client.get(f'/get_producao_data?cursor={cursor}')
+
+    assert rv.status_code == 400
+
+
+def test_length_all_rows(client):
+    """length=-1 é o "todos" do DataTables: devolve o resto das linhas."""
+    total = len(store.get('importacao').data)
+
+    rv = client.get('/get_importacao_data?start=10&length=-1').json
+
+    assert len(rv['data']) == total - 10
+    assert rv['next_cursor'] is None
+    filtered = client.get('/get_importacao_data?NM_PAIS=Chile&length=-1').json
+    assert len(filtered['data']) == filtered['recordsFiltered'] > 0
+
+
+def test_missing_values_serialized_as_null(client):
+    """Medidas ausentes (NaN) saem como null, o que mantém o JSON válido."""
+    data = store.get('processamento').data
+    start = int(data['QT_UVAS_PROCESSADAS_KG'].isna().to_numpy().argmax())
+
+    rv = client.get(f'/get_processamento_data?start={start}&length=1')
+
+    assert b'NaN' not in rv.data
+    assert rv.json['data'][0]['QT_UVAS_PROCESSADAS_KG'] is None
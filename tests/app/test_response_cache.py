@@ -0,0 +1,78 @@
+from app import response_cache, store
+
+
+def test_get_data_cache_hit_and_miss(client):
+    """A segunda requisição equivalente é servida do cache, mesmo com parâmetros
+    do DataTables que não afetam a resposta."""
+    first = client.get('/get_producao_data?start=0&length=5&draw=1&_=111')
+    second = client.get('/get_producao_data?length=5&start=0&draw=2&_=222')
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.json['draw'] == 2
+    assert first.json['data'] == second.json['data']
+
+
+def test_get_data_cache_keys_on_pagination_and_filters(client):
+    """Páginas e filtros diferentes não compartilham a mesma entrada de cache."""
+    page_1 = client.get('/get_importacao_data?start=0&length=5')
+    page_2 = client.get('/get_importacao_data?start=5&length=5')
+    filtered = client.get('/get_importacao_data?start=0&length=5&NM_ITEM=Sucos')
+
+    assert page_2.headers['X-Cache'] == 'MISS'
+    assert filtered.headers['X-Cache'] == 'MISS'
+    assert page_1.json['data'] != page_2.json['data']
+    assert {row['NM_ITEM'] for row in filtered.json['data']} == {'Sucos'}
+
+
+def test_get_data_cache_invalidated_on_new_snapshot(client):
+    """Instalar um novo snapshot invalida apenas o cache daquele dataset."""
+    client.get('/get_comercializacao_data?start=0&length=5')
+    client.get('/get_producao_data?start=0&length=5')
+    before = response_cache.stats()['comercializacao']
+
+    snapshot = store.get('comercializacao')
+    store.put('comercializacao', snapshot.data.iloc[:3])
+    comercializacao = client.get('/get_comercializacao_data?start=0&length=5')
+    producao = client.get('/get_producao_data?start=0&length=5')
+    store.clear('comercializacao')
+
+    assert comercializacao.headers['X-Cache'] == 'MISS'
+    assert comercializacao.json['recordsTotal'] == 3
+    assert producao.headers['X-Cache'] == 'HIT'
+    stats = response_cache.stats()['comercializacao']
+    assert stats['invalidations'] == before['invalidations'] + 1
+    assert stats['misses'] == before['misses'] + 1
+
+
+def test_cache_counters_on_metrics(client):
+    """Os contadores do cache são exportados por dataset em /metrics."""
+    client.get('/get_producao_data?start=0&length=7')
+    client.get('/get_producao_data?start=0&length=7')
+    stats = response_cache.stats()['producao']
+
+    body = client.get('/metrics').data.decode('utf-8')
+
+    assert '# TYPE embrapa_response_cache_hits_total counter' in body
+    for counter in ('hits', 'misses', 'invalidations'):
+        sample = f'embrapa_response_cache_{counter}_total{{dataset="producao"}}'
+        assert f'{sample} {float(stats[counter])!r}' in body
+
+
+def test_get_data_combined_filters(client):
+    """País e item são aplicados juntos, e a resposta em cache é a mesma."""
+    data = store.get('exportacao').data
+    selected = data[(data['NM_PAIS'] == 'Alemanha') & (data['NM_ITEM'] == 'Espumantes')]
+    # DT_ANO é int16 no snapshot e texto no JSON; medidas ausentes viram null
+    expected = selected.astype({'DT_ANO': str}).astype(object)
+    expected = expected.where(selected.notna(), None).to_dict(orient='records')
+    url = '/get_exportacao_data?NM_PAIS=Alemanha&NM_ITEM=Espumantes&length=1000'
+
+    miss = client.get(url)
+    hit = client.get(url)
+
+    assert len(expected) > 0
+    assert miss.json['recordsFiltered'] == len(expected)
+    assert miss.json['data'] == expected
+    assert (miss.headers['X-Cache'], hit.headers['X-Cache']) == ('MISS', 'HIT')
+    assert hit.json == miss.json
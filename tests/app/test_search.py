@@ -0,0 +1,69 @@
+import pytest
+
+from app import store
+
+
+def test_search_countries(client):
+    rv = client.get('/search/exportacao?q=japao')
+
+    assert rv.status_code == 200
+    assert rv.json == {'field': 'NM_PAIS', 'results': ['Japão']}
+
+
+def test_search_limit(client):
+    rv = client.get('/search/processamento?q=ca&limit=3')
+
+    assert len(rv.json['results']) == 3
+    assert all(name.lower().startswith('ca') for name in rv.json['results'])
+
+
+@pytest.mark.parametrize(
+    'url, status',
+    [
+        ('/search/vinhos?q=a', 404),
+        ('/search/producao?q=a&field=NM_PAIS', 400),
+        ('/search/producao?q=a&limit=dez', 400),
+    ],
+)
+def test_search_invalid(client, url, status):
+    assert client.get(url).status_code == status
+
+
+def test_data_search_term(client):
+    """O termo filtra as linhas pelo nome, sem diferenciar acentos."""
+    data = store.get('importacao').data
+    countries = ['Alemanha', 'Alemanha, República Democrática']
+    expected = data[data['NM_PAIS'].isin(countries)]
+
+    rv = client.get('/get_importacao_data?search=ALEMA&length=10000')
+
+    assert rv.json['recordsFiltered'] == len(expected)
+    assert {row['NM_PAIS'] for row in rv.json['data']} == set(countries)
+
+
+def test_data_search_datatables_box(client):
+    """A caixa de busca do DataTables usa o mesmo índice."""
+    by_search = client.get('/get_exportacao_data?search=japao&length=5').json
+    by_box = client.get('/get_exportacao_data?search[value]=Japão&length=5').json
+
+    assert by_box['data'] == by_search['data']
+    assert {row['NM_PAIS'] for row in by_box['data']} == {'Japão'}
+
+
+def test_data_search_with_filter_and_range(client):
+    data = store.get('exportacao').data
+    expected = data[(data['NM_PAIS'] == 'Alemanha') & (data['DT_ANO'] >= 2020)]
+
+    rv = client.get(
+        '/get_exportacao_data?search=ale&NM_PAIS=Alemanha&NM_PAIS=Chile'
+        '&year_from=2020&length=1000'
+    )
+
+    assert rv.json['recordsFiltered'] == len(expected)
+
+
+def test_data_search_without_match(client):
+    rv = client.get('/get_producao_data?search=inexistente')
+
+    assert rv.json['recordsFiltered'] == 0
+    assert rv.json['data'] == []
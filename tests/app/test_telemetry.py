@@ -0,0 +1,67 @@
+from flask import Flask
+
+from app import telemetry
+from app.telemetry import RequestTelemetry
+from embrapa_api.metrics import MetricsRegistry
+
+
+def test_requests_recorded_per_endpoint_and_status(client):
+    before = telemetry.stats().get('main.get_producao_data', {'statuses': {}})
+    count = before['statuses'].get('200', {}).get('count', 0)
+
+    rv = client.get('/get_producao_data?length=5&_=telemetry')
+    client.get('/nao_existe')
+
+    stats = telemetry.stats()
+    counters = stats['main.get_producao_data']['statuses']['200']
+    assert counters['count'] == count + 1
+    assert counters['mean_s'] > 0
+    assert counters['bytes'] >= len(rv.data)
+    assert stats['main.get_producao_data']['in_flight'] == 0
+    assert '404' in stats['unmatched']['statuses']
+
+
+def test_request_metrics_exported(client):
+    client.get('/')
+
+    body = client.get('/metrics').data.decode('utf-8')
+
+    assert '# TYPE embrapa_request_seconds histogram' in body
+    assert (
+        'embrapa_request_seconds_count{endpoint="main.index",method="GET",status="200"}'
+        in body
+    )
+    assert 'embrapa_response_bytes_count{endpoint="main.index",status="200"}' in body
+    assert 'embrapa_requests_in_flight{endpoint="main.index"} 0.0' in body
+
+
+def test_in_flight_during_request_and_errors():
+    registry = MetricsRegistry()
+    registry.enabled = True
+    recorder = RequestTelemetry(registry)
+    app = Flask(__name__)
+    recorder.init_app(app)
+    seen = {}
+
+    @app.route('/lenta')
+    def lenta():
+        seen['in_flight'] = recorder.stats()['lenta']['in_flight']
+        raise RuntimeError('falha')
+
+    rv = app.test_client().get('/lenta')
+
+    assert rv.status_code == 500
+    assert seen['in_flight'] == 1
+    stats = recorder.stats()['lenta']
+    assert stats['in_flight'] == 0
+    assert stats['statuses']['500']['count'] == 1
+
+
+def test_disabled_registry_installs_nothing():
+    recorder = RequestTelemetry(MetricsRegistry())
+    app = Flask(__name__)
+    recorder.init_app(app)
+
+    app.test_client().get('/')
+
+    assert recorder.stats() == {}
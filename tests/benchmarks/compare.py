@@ -0,0 +1,60 @@
+"""Compara dois arquivos de resultados de benchmark e aponta regressões.
+
+Uso::
+
+    python -m tests.benchmarks.compare .benchmarks/<antes>.json \
+        .benchmarks/<depois>.json
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as file:
+        report = json.load(file)
+    # tempos usam o menor valor medido; demais métricas, o valor registrado
+    return {
+        (entry['name'], json.dumps(entry['params'], sort_keys=True)): entry.get(
+            'min_s', entry.get('value')
+        )
+        for entry in report['results']
+    }
+
+
+def compare(before, after, threshold):
+    """Lista (nome, parâmetros, antes, depois, razão) e as regressões."""
+    rows, regressions = [], []
+    for key in sorted(before.keys() & after.keys()):
+        ratio = after[key] / before[key] if before[key] else float('inf')
+        row = (*key, before[key], after[key], ratio)
+        rows.append(row)
+        if ratio > threshold:
+            regressions.append(row)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=1.25,
+        help='Razão depois/antes a partir da qual o tempo é considerado regressão.',
+    )
+    args = parser.parse_args(argv)
+
+    rows, regressions = compare(
+        load_results(args.before), load_results(args.after), args.threshold
+    )
+    for name, params, before, after, ratio in rows:
+        flag = ' <- regressão' if ratio > args.threshold else ''
+        print(f'{name} {params}: {before:.6g} -> {after:.6g} ({ratio:.2f}x){flag}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
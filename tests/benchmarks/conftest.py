@@ -0,0 +1,16 @@
+import pytest
+
+from tests.benchmarks.recorder import BenchmarkRecorder
+
+
+@pytest.fixture(scope='session')
+def bench():
+    """Registrador de tempos compartilhado por todos os benchmarks da sessão.
+
+    Ao final da sessão os resultados são gravados em ``.benchmarks/<commit>.json``
+    (ou no caminho da variável BENCHMARK_OUTPUT).
+    """
+    recorder = BenchmarkRecorder()
+    yield recorder
+    if recorder.results:
+        recorder.write()
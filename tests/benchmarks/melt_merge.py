@@ -0,0 +1,27 @@
+"""Implementação anterior (melt + merge) das tabelas de comércio, mantida como
+referência para os benchmarks."""
+
+from embrapa_api.preprocessing.reshape import TradeSpec
+
+
+def melt_merge_trade(data, spec: TradeSpec, item):
+    keys = list(spec.keys)
+    valor_cols = [col for col in data.columns if '.1' in col]
+    qtd_cols = [col for col in data.columns.difference(keys) if col not in valor_cols]
+    renames = {"Id": "CD_PAIS", "País": "NM_PAIS", "ano": "DT_ANO"}
+
+    qtd_df = (
+        data[keys + qtd_cols]
+        .melt(id_vars=keys, var_name="ano", value_name=spec.quantity_column)
+        .rename(columns=renames)
+    )
+    valor_df = (
+        data[keys + valor_cols]
+        .melt(id_vars=keys, var_name="ano", value_name=spec.value_column)
+        .rename(columns=renames)
+        .assign(DT_ANO=lambda x: x["DT_ANO"].str.split(".").str[0])
+    )
+    rf_data = qtd_df.merge(valor_df, on=["CD_PAIS", "NM_PAIS", "DT_ANO"]).assign(
+        NM_ITEM=item
+    )
+    return rf_data[spec.columns].sort_values(['NM_PAIS', 'DT_ANO'])
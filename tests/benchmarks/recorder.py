@@ -0,0 +1,97 @@
+"""Registro dos tempos dos benchmarks em um arquivo JSON comparável entre commits."""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from embrapa_api.config import PROJECT_FOLDER
+
+BENCHMARKS_FOLDER = f'{PROJECT_FOLDER}/.benchmarks'
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=PROJECT_FOLDER,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def benchmark_scales():
+    """Fatores de escala dos dados sintéticos (variável BENCHMARK_SCALES)."""
+    return [
+        int(scale) for scale in os.environ.get('BENCHMARK_SCALES', '1,10').split(',')
+    ]
+
+
+class BenchmarkRecorder:
+    """Mede funções e acumula os resultados de uma sessão de benchmarks."""
+
+    def __init__(self):
+        self.commit = current_commit()
+        self.results = []
+
+    def measure(self, name, func, repeat=3, setup=None, **params):
+        """Executa ``func`` ``repeat`` vezes e registra os tempos.
+
+        ``setup`` roda antes de cada repetição, fora da medição. Retorna o
+        resultado da última execução.
+        """
+        timings = []
+        result = None
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+
+        self.results.append(
+            {
+                'name': name,
+                'params': params,
+                'repeat': repeat,
+                'min_s': min(timings),
+                'median_s': statistics.median(timings),
+                'mean_s': statistics.fmean(timings),
+            }
+        )
+        return result
+
+    def record(self, name, value, **params):
+        """Registra uma métrica que não é tempo (ex.: memória em bytes)."""
+        self.results.append({'name': name, 'params': params, 'value': value})
+
+    def best(self, name, **params):
+        """Menor tempo registrado para ``name`` com os parâmetros dados."""
+        for entry in reversed(self.results):
+            if entry['name'] == name and entry['params'] == params:
+                return entry['min_s']
+        raise KeyError(name)
+
+    def write(self, path=None):
+        path = path or os.environ.get(
+            'BENCHMARK_OUTPUT', f'{BENCHMARKS_FOLDER}/{self.commit}.json'
+        )
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        report = {
+            'commit': self.commit,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'results': self.results,
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        return path
@@ -0,0 +1,72 @@
+"""Ampliação das tabelas do repositório para benchmarks em escala."""
+
+import pandas as pd
+
+from embrapa_api.store import PREPROCESSORS
+
+# colunas de identificação das tabelas brutas: (id, nome)
+RAW_KEYS = {
+    'producao': ('id', 'produto'),
+    'processamento': ('id', 'cultivar'),
+    'comercializacao': ('id', 'Produto'),
+    'importacao': ('Id', 'País'),
+    'exportacao': ('Id', 'País'),
+}
+
+# atributos dos preprocessors que guardam os dados brutos ou os caminhos das fontes
+RAW_ATTRIBUTES = {
+    'producao': 'rw_producao',
+    'comercializacao': 'comercializacao',
+}
+PATHS_ATTRIBUTES = {
+    'processamento': 'processing_paths',
+    'importacao': 'importacao_paths',
+    'exportacao': 'exportacao_paths',
+}
+
+# colunas que identificam linhas nas tabelas tratadas
+REFINED_KEYS = {
+    'producao': ('ID_PRODUTO', 'NM_PRODUTO'),
+    'processamento': ('ID_UVA_PROCESSADA', 'NM_UVA'),
+    'comercializacao': ('ID_PRODUTO', 'NM_PRODUTO'),
+    'importacao': ('NM_PAIS',),
+    'exportacao': ('NM_PAIS',),
+}
+
+
+def replicate(data, keys, factor):
+    """Replica as linhas ``factor`` vezes, tornando as colunas ``keys`` distintas
+    em cada cópia."""
+    if factor == 1:
+        return data
+    copies = []
+    for copy in range(factor):
+        changes = {}
+        for key in keys:
+            values = data[key]
+            if pd.api.types.is_numeric_dtype(values):
+                changes[key] = values + copy * (values.max() + 1)
+            elif copy:
+                changes[key] = values.astype(str) + f' {copy}'
+        copies.append(data.assign(**changes))
+    return pd.concat(copies, ignore_index=True)
+
+
+def load_raw(name):
+    """Tabelas brutas de um dataset, por fonte (requer contexto da aplicação)."""
+    preprocessor = PREPROCESSORS[name]()
+    if name in RAW_ATTRIBUTES:
+        return {None: getattr(preprocessor, RAW_ATTRIBUTES[name])}
+    paths = getattr(preprocessor, PATHS_ATTRIBUTES[name])
+    return {source: preprocessor.load_data(source) for source in paths}
+
+
+def scale_raw(frames, name, factor):
+    return {
+        source: replicate(data, RAW_KEYS[name], factor)
+        for source, data in frames.items()
+    }
+
+
+def scale_refined(data, name, factor):
+    return replicate(data, REFINED_KEYS[name], factor)
@@ -0,0 +1,54 @@
+"""Benchmark da normalização de texto: por linha após o melt vs. por valor
+distinto antes do melt."""
+
+import pandas as pd
+import pytest
+from unidecode import unidecode
+
+from embrapa_api.preprocessing.preprocessors import _map_distinct, _normalize_name
+
+N_PRODUTOS = 60
+N_ANOS = [10, 50, 200]
+
+
+def wide_frame(n_anos):
+    """Tabela larga no formato de Producao.csv com ``n_anos`` colunas de ano."""
+    data = {
+        "id": range(N_PRODUTOS),
+        "produto": [f"PRODUÇÃO DE VINHO {i}" for i in range(N_PRODUTOS)],
+        "control": [f"vm_{i}" for i in range(N_PRODUTOS)],
+    }
+    data.update({str(1970 + ano): range(N_PRODUTOS) for ano in range(n_anos)})
+    return pd.DataFrame(data)
+
+
+def por_linha(wide):
+    long = wide.melt(id_vars=["id", "produto", "control"])
+    long["produto"] = long["produto"].astype(str).apply(unidecode).str.title()
+    return long
+
+
+def por_valor_distinto(wide):
+    wide = wide.assign(produto=_map_distinct(wide["produto"], _normalize_name))
+    return wide.melt(id_vars=["id", "produto", "control"])
+
+
+@pytest.mark.parametrize("n_anos", N_ANOS)
+def test_normalizacao_por_valor_distinto(bench, n_anos):
+    """O resultado é idêntico e o custo deixa de crescer com o número de anos."""
+    wide = wide_frame(n_anos)
+
+    antes = bench.measure(
+        "normalizacao.por_linha", lambda: por_linha(wide), n_anos=n_anos
+    )
+    depois = bench.measure(
+        "normalizacao.por_valor_distinto",
+        lambda: por_valor_distinto(wide),
+        n_anos=n_anos,
+    )
+
+    pd.testing.assert_frame_equal(depois, antes)
+    if n_anos == max(N_ANOS):
+        assert bench.best(
+            "normalizacao.por_valor_distinto", n_anos=n_anos
+        ) < bench.best("normalizacao.por_linha", n_anos=n_anos)
@@ -0,0 +1,85 @@
+"""Benchmark do carregamento e do preprocessamento de cada dataset."""
+
+from unittest.mock import patch
+
+import pytest
+from flask import Flask, current_app
+
+from embrapa_api.preprocessing.synthetic import SyntheticSize, generate
+from embrapa_api.store import PREPROCESSORS
+from tests.benchmarks.recorder import benchmark_scales
+from tests.benchmarks.scaling import RAW_ATTRIBUTES, load_raw, scale_raw
+
+
+@pytest.fixture
+def sequential_fetch(app_context):
+    """Desliga o prefetch para que o preprocess meça apenas o processamento."""
+    current_app.config['CONCURRENT_FETCH'] = False
+    yield
+    current_app.config['CONCURRENT_FETCH'] = True
+
+
+@pytest.mark.parametrize('name', list(PREPROCESSORS))
+def test_load_data(bench, app_context, name):
+    """Tempo de leitura das fontes locais de cada dataset."""
+    frames = bench.measure(
+        'preprocessor.load_data', lambda: load_raw(name), dataset=name
+    )
+    assert all(not data.empty for data in frames.values())
+
+
+@pytest.mark.parametrize('scale', benchmark_scales())
+@pytest.mark.parametrize('name', list(PREPROCESSORS))
+def test_preprocess(bench, sequential_fetch, name, scale):
+    """Tempo do preprocess, isolado da leitura, nos dados locais ampliados."""
+    frames = scale_raw(load_raw(name), name, scale)
+    preprocessor = PREPROCESSORS[name]()
+
+    if name in RAW_ATTRIBUTES:
+        setattr(preprocessor, RAW_ATTRIBUTES[name], frames[None])
+        result = bench.measure(
+            'preprocessor.preprocess',
+            preprocessor.preprocess,
+            dataset=name,
+            scale=scale,
+        )
+    else:
+        with patch.object(preprocessor, 'load_data', side_effect=frames.get):
+            result = bench.measure(
+                'preprocessor.preprocess',
+                preprocessor.preprocess,
+                dataset=name,
+                scale=scale,
+            )
+
+    assert not result.empty
+
+
+@pytest.fixture(scope='module', params=benchmark_scales())
+def synthetic_app(request, tmp_path_factory):
+    """App lendo fontes sintéticas com ``50 * escala`` produtos por prefixo e
+    ``100 * escala`` países, de 1900 a 2023."""
+    scale = request.param
+    folder = str(tmp_path_factory.mktemp(f'synthetic-{scale}'))
+    size = SyntheticSize(
+        products=50 * scale, countries=100 * scale, first_year=1900, last_year=2023
+    )
+    generate(folder, size)
+    app = Flask(__name__)
+    app.config.update(
+        USE_LOCAL_DATA=True, LOCAL_DATA_FOLDER=folder, CONCURRENT_FETCH=False
+    )
+    with app.app_context():
+        yield scale
+
+
+@pytest.mark.parametrize('name', list(PREPROCESSORS))
+def test_preprocess_synthetic(bench, synthetic_app, name):
+    """Tempo de leitura e preprocess de ponta a ponta nas fontes sintéticas."""
+    result = bench.measure(
+        'preprocessor.synthetic',
+        lambda: PREPROCESSORS[name]().preprocess(),
+        dataset=name,
+        scale=synthetic_app,
+    )
+    assert not result.empty
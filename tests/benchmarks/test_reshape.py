@@ -0,0 +1,57 @@
+"""Benchmark do reshape das tabelas de comércio contra o melt + merge."""
+
+import pandas as pd
+import pytest
+
+from embrapa_api.preprocessing.constants import EXPORTACAO_PATHS
+from embrapa_api.preprocessing.reshape import EXPORTACAO_SPEC, reshape_trade
+from tests.benchmarks.melt_merge import melt_merge_trade
+
+
+def scaled_trade(data, country_factor, year_factor):
+    """Replica países e anos de uma tabela de comércio, mantendo as colunas
+    pareadas ``<ano>``/``<ano>.1``."""
+    keys = ["Id", "País"]
+    years = [col for col in data.columns if col not in keys and "." not in col]
+    columns = {}
+    for copy in range(year_factor):
+        for year in years:
+            new_year = str(int(year) + 100 * copy)
+            columns[new_year] = data[year]
+            columns[f"{new_year}.1"] = data[f"{year}.1"]
+    wide = pd.concat([data[keys], pd.DataFrame(columns)], axis=1)
+    copies = [
+        wide.assign(Id=wide["Id"] + copy * len(wide), País=wide["País"] + f" {copy}")
+        for copy in range(country_factor)
+    ]
+    return pd.concat(copies, ignore_index=True)
+
+
+@pytest.mark.parametrize("country_factor, year_factor", [(1, 1), (10, 1), (10, 10)])
+def test_reshape_vs_melt_merge(bench, country_factor, year_factor):
+    """Mesmo resultado, com o reshape mais rápido em 10x e 100x células."""
+    base = pd.read_csv(EXPORTACAO_PATHS["Vinhos"]["path"], sep=";")
+    data = scaled_trade(base, country_factor, year_factor)
+    params = {"scale": country_factor * year_factor}
+    repeat = 3 if params["scale"] < 100 else 1
+
+    antes = bench.measure(
+        "trade.melt_merge",
+        lambda: melt_merge_trade(data, EXPORTACAO_SPEC, "Vinhos"),
+        repeat=repeat,
+        **params,
+    )
+    depois = bench.measure(
+        "trade.reshape",
+        lambda: reshape_trade(data, EXPORTACAO_SPEC, "Vinhos"),
+        repeat=repeat,
+        **params,
+    )
+
+    pd.testing.assert_frame_equal(
+        depois.reset_index(drop=True), antes.reset_index(drop=True)
+    )
+    if params["scale"] >= 10:
+        assert bench.best("trade.reshape", **params) < bench.best(
+            "trade.melt_merge", **params
+        )
@@ -0,0 +1,59 @@
+"""Benchmark das agregações: cubo de rollups x groupby sobre a tabela inteira."""
+
+import pytest
+
+from embrapa_api.rollups import DIMENSIONS, MEASURES, RollupCube
+from embrapa_api.schema import compact
+from tests.benchmarks.recorder import benchmark_scales
+from tests.benchmarks.scaling import scale_refined
+
+# consultas típicas dos dashboards: (group_by, filtros)
+QUERIES = {
+    'por_ano': (['DT_ANO'], {}),
+    'por_pais': (['NM_PAIS'], {}),
+    'ano_de_um_pais': (['DT_ANO'], {'NM_PAIS': 'Chile'}),
+    'item_por_ano': (['NM_ITEM', 'DT_ANO'], {}),
+}
+
+
+@pytest.fixture(scope='module')
+def exportacao(app_context):
+    from embrapa_api.preprocessing.preprocessors import ExportacaoPreprocessor
+
+    return ExportacaoPreprocessor().preprocess()
+
+
+def groupby(data, group_by, filters, measures):
+    for column, value in filters.items():
+        data = data[data[column] == value]
+    return data.groupby(group_by, observed=True)[measures].sum()
+
+
+@pytest.mark.parametrize('scale', benchmark_scales())
+def test_rollups(bench, exportacao, scale):
+    data = compact(scale_refined(exportacao, 'exportacao', scale))
+    dimensions, measures = DIMENSIONS['exportacao'], MEASURES['exportacao']
+
+    cube = bench.measure(
+        'rollups.build',
+        lambda: RollupCube(data, dimensions, measures),
+        scale=scale,
+        rows=len(data),
+    )
+    for query, (group_by, filters) in QUERIES.items():
+        params = {'scale': scale, 'query': query}
+        result = bench.measure(
+            'rollups.query',
+            lambda: cube.aggregate(group_by, [(m, 'sum') for m in measures], filters),
+            repeat=10,
+            source='cubo',
+            **params,
+        )
+        expected = bench.measure(
+            'rollups.query',
+            lambda: groupby(data, group_by, filters, measures),
+            repeat=10,
+            source='groupby',
+            **params,
+        )
+        assert len(result) == len(expected)
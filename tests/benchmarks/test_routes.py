@@ -0,0 +1,127 @@
+"""Benchmark de todas as rotas da aplicação pelo test client do Flask."""
+
+import json
+
+import pytest
+
+from app import create_app, response_cache, store
+from app.routes import encode_cursor
+from embrapa_api.store import PREPROCESSORS
+from tests.benchmarks.recorder import benchmark_scales
+from tests.benchmarks.scaling import scale_refined
+
+FILTERS = {
+    'producao': 'ID_PRODUTO',
+    'processamento': 'ID_UVA_PROCESSADA',
+    'comercializacao': 'NM_PRODUTO',
+    'importacao': 'NM_PAIS',
+    'exportacao': 'NM_PAIS',
+}
+
+
+@pytest.fixture(scope='module')
+def client(tmp_path_factory):
+    app = create_app(
+        {
+            'TESTING': True,
+            'USE_LOCAL_DATA': True,
+            'LOAD_ARTIFACTS': False,
+            'DOWNLOADS_FOLDER': str(tmp_path_factory.mktemp('downloads')),
+        }
+    )
+    with app.app_context():
+        yield app.test_client()
+
+
+@pytest.fixture(scope='module', params=benchmark_scales())
+def scale(request, client):
+    """Instala no store snapshots ampliados pelo fator de escala."""
+    factor = request.param
+    if factor > 1:
+        originals = {name: store.get(name).data for name in PREPROCESSORS}
+        for name, data in originals.items():
+            store.put(name, scale_refined(data, name, factor))
+    yield factor
+    if factor > 1:
+        store.clear()
+
+
+def routes(name):
+    snapshot = store.get(name)
+    data = snapshot.data
+    cursor = encode_cursor(snapshot.version, len(data) - 11)
+    value = data[FILTERS[name]].iloc[len(data) // 2]
+    return {
+        'view': f'/{name}',
+        'download': f'/download_{name}',
+        'data_first_page': f'/get_{name}_data?start=0&length=10',
+        'data_deep_page': f'/get_{name}_data?start={len(data) - 10}&length=10',
+        'data_deep_cursor': f'/get_{name}_data?cursor={cursor}&length=10',
+        'data_large_page': f'/get_{name}_data?start=0&length=10000',
+        'data_filtered': f'/get_{name}_data?length=10&{FILTERS[name]}={value}',
+        'data_multi_filtered': (
+            f'/get_{name}_data?length=10&{FILTERS[name]}='
+            + ','.join(map(str, store.get(name).facet(FILTERS[name])[:10]))
+        ),
+        'data_year_range': f'/get_{name}_data?length=10&year_from=2010&year_to=2023',
+        'data_filtered_year_range': (
+            f'/get_{name}_data?length=10&{FILTERS[name]}={value}&year_from=2010'
+        ),
+    }
+
+
+def test_index(bench, client):
+    rv = bench.measure('route', lambda: client.get('/'), route='index')
+    assert rv.status_code == 200
+
+
+@pytest.mark.parametrize('name', list(PREPROCESSORS))
+def test_routes(bench, client, scale, name):
+    """Mede cada rota do dataset; as rotas de dados são medidas com o cache de
+    respostas frio (invalidado antes de cada execução) e quente."""
+    for route, url in routes(name).items():
+        params = {'dataset': name, 'route': route, 'scale': scale}
+        if route.startswith('data'):
+            rv = bench.measure(
+                'route',
+                lambda: client.get(url),
+                setup=lambda: response_cache.invalidate(name),
+                cache='miss',
+                **params,
+            )
+            assert rv.headers['X-Cache'] == 'MISS'
+            rv = bench.measure('route', lambda: client.get(url), cache='hit', **params)
+            assert rv.headers['X-Cache'] == 'HIT'
+        else:
+            rv = bench.measure('route', lambda: client.get(url), **params)
+        assert rv.status_code == 200
+
+
+@pytest.mark.parametrize('size', [10, 100])
+def test_batch(bench, client, scale, size):
+    """Lote de consultas filtradas contra as mesmas consultas feitas uma a uma,
+    com o cache de respostas frio."""
+    name = 'exportacao'
+    values = store.get(name).facet(FILTERS[name])[:size]
+    urls = [f'/get_{name}_data?length=10&{FILTERS[name]}={value}' for value in values]
+    payload = {
+        'queries': [
+            {'dataset': name, 'filters': {FILTERS[name]: value}, 'length': 10}
+            for value in values
+        ]
+    }
+    params = {'dataset': name, 'size': size, 'scale': scale}
+
+    bench.measure(
+        'batch_single_requests',
+        lambda: [client.get(url) for url in urls],
+        setup=lambda: response_cache.invalidate(name),
+        **params,
+    )
+    rv = bench.measure(
+        'batch',
+        lambda: client.post('/batch', json=payload).get_data(),
+        setup=lambda: response_cache.invalidate(name),
+        **params,
+    )
+    assert len(json.loads(rv)['results']) == len(values)
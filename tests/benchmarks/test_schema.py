@@ -0,0 +1,42 @@
+"""Benchmark do esquema compacto: memória, filtro e serialização."""
+
+import pytest
+
+from embrapa_api.schema import compact, restore
+from embrapa_api.store import PREPROCESSORS
+
+FILTER_COLUMNS = {
+    'producao': 'ID_PRODUTO',
+    'processamento': 'ID_UVA_PROCESSADA',
+    'comercializacao': 'NM_PRODUTO',
+    'importacao': 'NM_PAIS',
+    'exportacao': 'NM_PAIS',
+}
+
+
+@pytest.mark.parametrize('name', list(PREPROCESSORS))
+def test_compact_schema_report(bench, app_context, name):
+    """Compara memória, filtro por igualdade e serialização (CSV e página JSON)
+    entre a representação atual (str) e o esquema compacto."""
+    data = PREPROCESSORS[name]().preprocess()
+    compacted = compact(data)
+    column = FILTER_COLUMNS[name]
+    value = data[column].iloc[len(data) // 2]
+
+    memoria = {}
+    for schema, frame, to_records in [
+        ('str', data, lambda page: page.to_dict(orient='records')),
+        ('compacto', compacted, lambda page: restore(page).to_dict(orient='records')),
+    ]:
+        params = {'dataset': name, 'schema': schema}
+        memoria[schema] = frame.memory_usage(deep=True).sum()
+        bench.record('schema.memory_bytes', int(memoria[schema]), **params)
+        bench.measure(
+            'schema.filter', lambda: frame[frame[column] == value], repeat=5, **params
+        )
+        bench.measure('schema.csv', lambda: frame.to_csv(index=False), **params)
+        bench.measure(
+            'schema.page_json', lambda: to_records(frame.iloc[:100]), repeat=5, **params
+        )
+
+    assert memoria['compacto'] < memoria['str']
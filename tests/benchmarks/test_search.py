@@ -0,0 +1,45 @@
+"""Benchmark da busca por nomes: índice de prefixos x varredura com str.contains."""
+
+import pytest
+
+from embrapa_api.search import PrefixIndex
+from embrapa_api.store import SEARCH_COLUMNS, Snapshot
+from tests.benchmarks.recorder import benchmark_scales
+from tests.benchmarks.scaling import scale_refined
+
+TERMS = ['ale', 'sul', 'japao']
+
+
+@pytest.fixture(scope='module')
+def exportacao(app_context):
+    from embrapa_api.preprocessing.preprocessors import ExportacaoPreprocessor
+
+    return ExportacaoPreprocessor().preprocess()
+
+
+@pytest.mark.parametrize('scale', benchmark_scales())
+def test_search(bench, exportacao, scale):
+    snapshot = Snapshot.from_frame(
+        'exportacao', scale_refined(exportacao, 'exportacao', scale)
+    )
+    column = SEARCH_COLUMNS['exportacao'][0]
+    names = snapshot.data[column]
+
+    index = bench.measure(
+        'search.build',
+        lambda: PrefixIndex(names.unique()),
+        scale=scale,
+        names=names.nunique(),
+    )
+    for term in TERMS:
+        params = {'scale': scale, 'term': term}
+        found = bench.measure(
+            'search.lookup', lambda: index.matches(term), repeat=20, **params
+        )
+        bench.measure(
+            'search.contains',
+            lambda: names[names.str.contains(term, case=False)].unique(),
+            repeat=5,
+            **params,
+        )
+        assert found and set(found) <= set(index.values)
@@ -0,0 +1,54 @@
+"""Benchmark da serialização JSON das páginas dos endpoints de dados."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from embrapa_api import serialization
+from embrapa_api.schema import compact, restore
+from embrapa_api.serialization import encode, records
+
+PAGE_SIZES = [10, 100, 10000]
+
+
+def to_dict_json(page):
+    """Caminho anterior: ``restore`` + ``to_dict`` + ``json.dumps`` (jsonify)."""
+    return json.dumps(restore(page).to_dict(orient='records')).encode()
+
+
+def columns_json(page):
+    with patch.object(serialization, 'orjson', None):
+        return encode(records(page))
+
+
+def columns_orjson(page):
+    return encode(records(page))
+
+
+@pytest.fixture(scope='module')
+def exportacao(app_context):
+    from embrapa_api.preprocessing.preprocessors import ExportacaoPreprocessor
+
+    return compact(ExportacaoPreprocessor().preprocess())
+
+
+@pytest.mark.parametrize('rows', PAGE_SIZES)
+def test_page_serialization(bench, exportacao, rows):
+    """Compara, por tamanho de página, o caminho anterior com a codificação a
+    partir das colunas (biblioteca padrão e orjson); registra linhas/s."""
+    page = exportacao.iloc[len(exportacao) // 2 :].iloc[:rows]
+    repeat = 50 if rows < 10000 else 5
+
+    encoders = [('to_dict+json', to_dict_json), ('colunas+json', columns_json)]
+    if serialization.orjson is not None:
+        encoders.append(('colunas+orjson', columns_orjson))
+    for encoder, func in encoders:
+        params = {'rows': rows, 'encoder': encoder}
+        body = bench.measure('serialize.page', lambda: func(page), repeat, **params)
+        bench.record(
+            'serialize.rows_per_s',
+            rows / bench.best('serialize.page', **params),
+            **params,
+        )
+        assert len(json.loads(body)) == rows
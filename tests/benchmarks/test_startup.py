@@ -0,0 +1,92 @@
+"""Benchmark da inicialização da aplicação (``create_app``)."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from app import create_app, store
+from embrapa_api.artifacts import MANIFEST_FILE
+from embrapa_api.config import PROJECT_FOLDER
+
+# modulos que so devem ser importados quando um dataset e materializado
+LAZY_MODULES = [
+    'pandas',
+    'numpy',
+    'pyarrow',
+    'requests',
+    'unidecode',
+    'embrapa_api.preprocessing.preprocessors',
+    'embrapa_api.schema',
+    'embrapa_api.indexes',
+]
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app, store
+app = create_app({'TESTING': True, 'ARTIFACTS_FOLDER': sys.argv[1]})
+elapsed = time.perf_counter() - start
+lazy = json.loads(sys.argv[2])
+print(json.dumps({'seconds': elapsed, 'loaded': [m for m in lazy if m in sys.modules]}))
+"""
+
+
+@pytest.fixture(scope='module')
+def artifacts_folder(tmp_path_factory):
+    """Pasta de artefatos com manifesto: a partida só deve ler o manifesto."""
+    folder = tmp_path_factory.mktemp('artifacts')
+    manifest = {
+        'datasets': {
+            'producao': {
+                'file': 'producao.arrow',
+                'facets': 'producao.facets.json',
+                'version': 'v1',
+                'rows': 1,
+            }
+        }
+    }
+    (folder / MANIFEST_FILE).write_text(json.dumps(manifest))
+    return str(folder)
+
+
+def cold_start(artifacts_folder):
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            STARTUP_SCRIPT,
+            artifacts_folder,
+            json.dumps(LAZY_MODULES),
+        ],
+        cwd=PROJECT_FOLDER,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_create_app_cold(bench, artifacts_folder):
+    """Import do pacote ``app`` e ``create_app`` em um processo novo, como no
+    spawn de um worker; nenhum módulo pesado deve ser carregado."""
+    runs = [cold_start(artifacts_folder) for _ in range(3)]
+
+    bench.record(
+        'startup.create_app_cold', min(run['seconds'] for run in runs), repeat=3
+    )
+    assert all(run['loaded'] == [] for run in runs)
+
+
+def test_create_app_warm(bench, artifacts_folder):
+    """``create_app`` com os módulos já importados."""
+    try:
+        app = bench.measure(
+            'startup.create_app',
+            lambda: create_app({'TESTING': True, 'ARTIFACTS_FOLDER': artifacts_folder}),
+        )
+        assert 'main.index' in app.view_functions
+    finally:
+        # o manifesto falso nao pode vazar para os outros testes
+        store.clear()
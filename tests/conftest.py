@@ -5,7 +5,7 @@ from app import create_app
 
 @pytest.fixture(scope='module')
 def app():
-    app = create_app({'TESTING': True, 'USE_LOCAL_DATA': True})
+    app = create_app({'TESTING': True, 'USE_LOCAL_DATA': True, 'LOAD_ARTIFACTS': False})
     yield app
 
 
@@ -0,0 +1,141 @@
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from app import create_app
+from embrapa_api.preprocessing.mirror import SourceMirror
+from embrapa_api.preprocessing.constants import PRODUCAO_FILE_PATH
+from embrapa_api.preprocessing.preprocessors import ProducaoPreprocessor, _load_data
+
+URL = "http://vitibrasil.cnpuv.embrapa.br/download/Producao.csv"
+CONTENT = b"id;produto;control;2020\n1;VINHO DE MESA;VINHO DE MESA;100\n"
+
+
+def fake_response(status_code, content=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(status_code)
+    return response
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return SourceMirror(str(tmp_path / "mirror"))
+
+
+def test_fetch_stores_file_and_validators(mirror):
+    """O primeiro download grava o arquivo e os validadores HTTP."""
+    response = fake_response(200, CONTENT, {"ETag": '"abc"', "Last-Modified": "x"})
+    with patch("requests.get", return_value=response) as mock_get:
+        entry = mirror.fetch(URL)
+
+    assert mock_get.call_args.kwargs["headers"] == {}
+    assert entry.etag == '"abc"'
+    assert entry.last_modified == "x"
+    with open(entry.path, "rb") as file:
+        assert file.read() == CONTENT
+    assert mirror.entry(URL) == entry
+
+
+def test_fetch_not_modified_uses_mirrored_copy(mirror):
+    """Um 304 mantém o arquivo espelhado e a data do download original."""
+    first = fake_response(200, CONTENT, {"ETag": '"abc"', "Last-Modified": "x"})
+    with patch("requests.get", return_value=first):
+        original = mirror.fetch(URL)
+
+    with patch("requests.get", return_value=fake_response(304)) as mock_get:
+        entry = mirror.fetch(URL)
+
+    assert mock_get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "x",
+    }
+    assert entry.path == original.path
+    assert entry.fetched_at == original.fetched_at
+    assert entry.sha256 == original.sha256
+
+
+def test_concurrent_fetches_do_not_clobber_each_other(mirror):
+    """Vários processos (ou threads) atualizando o mesmo espelho gravam por
+    arquivos temporários próprios: o resultado é sempre uma cópia inteira."""
+    contents = [CONTENT * (i + 1) for i in range(8)]
+    barrier = threading.Barrier(len(contents))
+    errors = []
+
+    def fetch():
+        barrier.wait()
+        try:
+            mirror.fetch(URL)
+        except OSError as e:
+            errors.append(e)
+
+    with patch(
+        "requests.get",
+        side_effect=[fake_response(200, content) for content in contents],
+    ):
+        threads = [threading.Thread(target=fetch) for _ in contents]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+    assert errors == []
+    entry = mirror.entry(URL)
+    with open(entry.path, "rb") as file:
+        assert file.read() in contents
+    assert not [name for name in os.listdir(mirror.folder) if name.endswith(".tmp")]
+
+
+def test_fetch_error_status_raises(mirror):
+    with patch("requests.get", return_value=fake_response(500)):
+        with pytest.raises(requests.HTTPError):
+            mirror.fetch(URL)
+
+
+def test_load_data_falls_back_to_mirror(tmp_path):
+    """Sem acesso à URL, o _load_data lê a última cópia espelhada."""
+    app = create_app(
+        {
+            'TESTING': True,
+            'USE_LOCAL_DATA': False,
+            'LOAD_ARTIFACTS': False,
+            'MIRROR_FOLDER': str(tmp_path),
+        }
+    )
+    with app.app_context():
+        with patch("requests.get", return_value=fake_response(200, CONTENT)):
+            online = _load_data(URL, "fake_path", sep=";")
+        with patch("requests.get", side_effect=requests.ConnectionError()):
+            offline = _load_data(URL, "fake_path", sep=";")
+
+    assert offline.equals(online)
+    assert offline.loc[0, "produto"] == "VINHO DE MESA"
+
+
+def test_preprocessor_reports_bundled_fallback(tmp_path):
+    """Sem upstream nem espelho, o preprocessor indica que usou o arquivo empacotado."""
+    app = create_app(
+        {
+            'TESTING': True,
+            'USE_LOCAL_DATA': False,
+            'LOAD_ARTIFACTS': False,
+            'MIRROR_FOLDER': str(tmp_path / "mirror"),
+        }
+    )
+    with app.app_context():
+        with patch("requests.get", return_value=fake_response(200, CONTENT)):
+            online = ProducaoPreprocessor()
+        with patch("requests.get", side_effect=requests.ConnectionError()):
+            mirrored = ProducaoPreprocessor()
+            app.config['MIRROR_FOLDER'] = str(tmp_path / "vazio")
+            bundled = ProducaoPreprocessor()
+
+    assert online.bundled_sources == mirrored.bundled_sources == []
+    assert bundled.bundled_sources == [PRODUCAO_FILE_PATH]
+    assert not bundled.rw_producao.attrs
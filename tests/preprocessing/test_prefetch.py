@@ -0,0 +1,119 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app import create_app
+from embrapa_api.preprocessing.preprocessors import (
+    ExportacaoPreprocessor,
+    ImportacaoPreprocessor,
+    ProcessamentoPreprocessor,
+)
+
+PATCH_LOAD = "embrapa_api.preprocessing.preprocessors._load_data"
+PATCH_OFFLINE = "embrapa_api.preprocessing.preprocessors._load_offline"
+
+
+@pytest.fixture
+def fetch_app():
+    return create_app(
+        {
+            'TESTING': True,
+            'USE_LOCAL_DATA': True,
+            'LOAD_ARTIFACTS': False,
+            'FETCH_TIMEOUT': 5,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "preprocessor_cls, paths_attr",
+    [
+        (ProcessamentoPreprocessor, "processing_paths"),
+        (ImportacaoPreprocessor, "importacao_paths"),
+        (ExportacaoPreprocessor, "exportacao_paths"),
+    ],
+)
+def test_sources_are_fetched_concurrently(fetch_app, preprocessor_cls, paths_attr):
+    """Todas as fontes do dataset são carregadas ao mesmo tempo: a barreira só é
+    liberada se todas as threads estiverem carregando simultaneamente."""
+    with fetch_app.app_context():
+        preprocessor = preprocessor_cls()
+        paths = getattr(preprocessor, paths_attr)
+        barrier = threading.Barrier(len(paths), timeout=5)
+        real_load = pd.read_csv
+
+        def slow_load(url, path, sep, **read_kwargs):
+            barrier.wait()
+            return real_load(path, sep=sep, **read_kwargs)
+
+        with patch(PATCH_LOAD, side_effect=slow_load) as mock_load:
+            result = preprocessor.preprocess()
+
+    assert mock_load.call_count == len(paths)
+    assert not result.empty
+
+
+def test_source_timeout_falls_back_to_offline_copy(fetch_app):
+    """Uma fonte lenta demais é substituída pela cópia local sem bloquear as outras."""
+    fetch_app.config['FETCH_TIMEOUT'] = 0.05
+    with fetch_app.app_context():
+        preprocessor = ImportacaoPreprocessor()
+        real_load = pd.read_csv
+
+        def load(url, path, sep, **read_kwargs):
+            if url.endswith("ImpVinhos.csv"):
+                time.sleep(0.5)
+            return real_load(path, sep=sep, **read_kwargs)
+
+        with (
+            patch(PATCH_LOAD, side_effect=load),
+            patch(PATCH_OFFLINE, side_effect=load) as mock_offline,
+        ):
+            result = preprocessor.preprocess()
+
+    assert mock_offline.call_count == 1
+    assert "ImpVinhos.csv" in mock_offline.call_args.args[0]
+    assert set(result["NM_ITEM"]) == set(preprocessor.importacao_paths)
+
+
+def test_stalled_sources_share_one_deadline(fetch_app):
+    """Com todas as fontes travadas, o preprocess espera um FETCH_TIMEOUT no
+    total, e não um por fonte."""
+    fetch_app.config['FETCH_TIMEOUT'] = 0.2
+    release = threading.Event()
+    with fetch_app.app_context():
+        preprocessor = ImportacaoPreprocessor()
+        real_load = pd.read_csv
+
+        def stalled(url, path, sep, **read_kwargs):
+            release.wait(5)
+            return real_load(path, sep=sep, **read_kwargs)
+
+        def offline(url, path, sep, **read_kwargs):
+            return real_load(path, sep=sep, **read_kwargs)
+
+        start = time.monotonic()
+        try:
+            with (
+                patch(PATCH_LOAD, side_effect=stalled),
+                patch(PATCH_OFFLINE, side_effect=offline) as mock_offline,
+            ):
+                preprocessor.preprocess()
+            elapsed = time.monotonic() - start
+        finally:
+            release.set()
+
+    assert mock_offline.call_count == len(preprocessor.importacao_paths)
+    assert elapsed < 2 * 0.2 + 0.3
+
+
+def test_concurrent_fetch_can_be_disabled(fetch_app):
+    fetch_app.config['CONCURRENT_FETCH'] = False
+    with fetch_app.app_context():
+        preprocessor = ExportacaoPreprocessor()
+        preprocessor.preprocess()
+
+    assert preprocessor._pending == {}
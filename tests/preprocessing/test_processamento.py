@@ -127,3 +127,29 @@ def test_preprocess_integration(processamento_preprocessor):
             col in result.columns
             for col in ['ID_UVA_PROCESSADA', 'CD_TIPO_VINHO', 'DT_ANO']
         )
+
+
+def test_processa_marcadores_embrapa(processamento_preprocessor, tmp_path):
+    """Marcadores como 'nd' e '*' viram NaN célula a célula, sem descartar os
+    valores numéricos da mesma coluna, e são contabilizados por fonte."""
+    path = tmp_path / "ProcessaViniferas.csv"
+    path.write_text(
+        "id\tcontrol\tcultivar\t2020\t2021\n"
+        "1\tti_Tinto\tTinto\t100\tnd\n"
+        "2\tbr_Branco\tBranco\t*\t250\n"
+        "3\tbr_Rosado\tRosado\t\t300\n"
+    )
+    processamento_preprocessor.processing_paths = {
+        "Viniferas": {"url": "fake_url", "path": str(path)}
+    }
+
+    result = processamento_preprocessor.processa_viniferas()
+    valores = result.set_index(["ID_UVA_PROCESSADA", "DT_ANO"])[
+        "QT_UVAS_PROCESSADAS_KG"
+    ]
+
+    assert valores[("1_viniferas", "2020")] == 100.0
+    assert valores[("2_viniferas", "2021")] == 250.0
+    assert pd.isna(valores[("1_viniferas", "2021")])
+    assert pd.isna(valores[("2_viniferas", "2020")])
+    assert processamento_preprocessor.sentinel_counts == {"Viniferas": 3}
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from embrapa_api.preprocessing.constants import EXPORTACAO_PATHS, IMPORTACAO_PATHS
+from embrapa_api.preprocessing.reshape import (
+    EXPORTACAO_SPEC,
+    IMPORTACAO_SPEC,
+    reshape_trade,
+)
+from tests.benchmarks.melt_merge import melt_merge_trade
+
+
+def test_reshape_trade_pairs_years():
+    """Quantidade e valor de cada ano são pareados sem join; anos sem par são
+    descartados."""
+    data = pd.DataFrame(
+        {
+            "Id": [1, 2],
+            "País": ["Chile", "Brasil"],
+            "2020": [10, 20],
+            "2020.1": [100.0, 200.0],
+            "2021": [30, 40],
+            "2021.1": [300.0, 400.0],
+            "2022": [50, 60],
+        }
+    )
+
+    result = reshape_trade(data, IMPORTACAO_SPEC, "Vinhos").reset_index(drop=True)
+
+    expected = pd.DataFrame(
+        {
+            "NM_PAIS": ["Brasil", "Brasil", "Chile", "Chile"],
+            "DT_ANO": ["2020", "2021", "2020", "2021"],
+            "NM_ITEM": ["Vinhos"] * 4,
+            "QTD_IMPORTADO_KG": [20, 40, 10, 30],
+            "VL_VALOR_IMPORTADO_USD": [200.0, 400.0, 100.0, 300.0],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize(
+    "spec, paths",
+    [(IMPORTACAO_SPEC, IMPORTACAO_PATHS), (EXPORTACAO_SPEC, EXPORTACAO_PATHS)],
+)
+def test_reshape_trade_matches_melt_merge(spec, paths):
+    """Nos CSVs reais o reshape gera exatamente a mesma tabela do melt + merge."""
+    for item, config in paths.items():
+        data = pd.read_csv(config["path"], sep=";")
+        pd.testing.assert_frame_equal(
+            reshape_trade(data, spec, item).reset_index(drop=True),
+            melt_merge_trade(data, spec, item).reset_index(drop=True),
+        )
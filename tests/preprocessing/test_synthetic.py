@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+from flask import Flask
+
+from embrapa_api.preprocessing.constants import EXPORTACAO_PATHS, PRODUCAO_FILE_PATH
+from embrapa_api.preprocessing.synthetic import SyntheticSize, generate, source_layouts
+from embrapa_api.store import PREPROCESSORS
+
+SIZE = SyntheticSize(
+    products=3, countries=4, first_year=1900, last_year=1910, sentinel_ratio=0.2
+)
+
+
+@pytest.fixture(scope='module')
+def synthetic(tmp_path_factory):
+    folder = tmp_path_factory.mktemp('synthetic')
+    return str(folder), generate(str(folder), SIZE, seed=1)
+
+
+def test_generate_mirrors_bundled_layouts(synthetic):
+    """Cada fonte gerada tem as mesmas colunas de identificação e o mesmo
+    separador da fonte original."""
+    _, written = synthetic
+    layouts = source_layouts()
+
+    for path, target in written.items():
+        sep = layouts[path].sep
+        original = pd.read_csv(path, sep=sep, nrows=1)
+        generated = pd.read_csv(target, sep=sep)
+        assert list(generated.columns[:2]) == list(original.columns[:2])
+
+    trade = pd.read_csv(written[EXPORTACAO_PATHS['Vinhos']['path']], sep=';')
+    assert len(trade) == SIZE.countries
+    assert '1905.1' in trade.columns
+
+
+def test_generate_product_controls(synthetic):
+    """Linhas de categoria seguidas de itens com prefixo de control."""
+    _, written = synthetic
+
+    producao = pd.read_csv(written[PRODUCAO_FILE_PATH], sep=';')
+    assert producao['control'].iloc[0] == 'VINHO DE MESA'
+    assert producao['control'].iloc[1].startswith('vm_')
+    assert len(producao) == 4 * (SIZE.products + 1)
+
+
+def test_generate_is_deterministic(tmp_path):
+    first = generate(str(tmp_path / 'a'), SIZE, seed=7)
+    second = generate(str(tmp_path / 'b'), SIZE, seed=7)
+
+    for path in first:
+        with open(first[path], 'rb') as a, open(second[path], 'rb') as b:
+            assert a.read() == b.read()
+
+
+@pytest.mark.parametrize('name', list(PREPROCESSORS))
+def test_preprocessors_run_on_synthetic_sources(synthetic, name):
+    """Com LOCAL_DATA_FOLDER os preprocessors leem as fontes sintéticas."""
+    folder, _ = synthetic
+    app = Flask(__name__)
+    app.config.update(USE_LOCAL_DATA=True, LOCAL_DATA_FOLDER=folder)
+
+    with app.app_context():
+        preprocessor = PREPROCESSORS[name]()
+        result = preprocessor.preprocess()
+
+    assert not result.empty
+    assert result['DT_ANO'].min() == '1900'
+    assert result['DT_ANO'].max() == '1910'
+    if name == 'processamento':
+        assert sum(preprocessor.sentinel_counts.values()) > 0
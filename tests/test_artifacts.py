@@ -0,0 +1,160 @@
+import gzip
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app import create_app, store
+from embrapa_api.artifacts import (
+    DOWNLOAD_ENCODINGS,
+    DOWNLOADS_SUBFOLDER,
+    prune_downloads,
+    read_artifacts,
+    read_manifest,
+    read_table,
+    render_download,
+    write_artifacts,
+    write_table,
+)
+from embrapa_api.build import build
+from embrapa_api.store import FACETS, PREPROCESSORS, DatasetStore, Snapshot
+
+
+@pytest.fixture(scope='module')
+def artifacts_folder(tmp_path_factory):
+    folder = tmp_path_factory.mktemp('artifacts')
+    build(str(folder), use_local=True)
+    return folder
+
+
+def test_write_read_table_roundtrip(tmp_path):
+    """A tabela lida do arquivo Arrow é idêntica à gravada."""
+    data = pd.DataFrame(
+        {
+            'NM_PAIS': ['Brasil', 'Chile'],
+            'DT_ANO': ['1970', '1971'],
+            'QTD_IMPORTADO_KG': [1.5, float('nan')],
+        }
+    )
+    path = str(tmp_path / 'tabela.arrow')
+    write_table(data, path)
+
+    pd.testing.assert_frame_equal(read_table(path), data)
+
+
+def test_build_writes_every_dataset(artifacts_folder):
+    """O build grava uma tabela por dataset com a versão do snapshot."""
+    artifacts = read_artifacts(str(artifacts_folder))
+
+    assert set(artifacts) == set(PREPROCESSORS)
+    assert all(len(artifact['data']) > 0 for artifact in artifacts.values())
+
+
+def test_store_loads_artifacts_without_preprocessing(artifacts_folder):
+    """O store carregado a partir dos artefatos não executa nenhum preprocessor
+    e reproduz os mesmos snapshots de um build em memória."""
+    store = DatasetStore()
+    with patch.object(DatasetStore, '_build') as mock_build:
+        store.load_artifacts(str(artifacts_folder))
+        snapshots = {name: store.get(name) for name in PREPROCESSORS}
+
+    mock_build.assert_not_called()
+    for name, snapshot in snapshots.items():
+        rebuilt = snapshot.from_frame(name, snapshot.data)
+        assert rebuilt.version == snapshot.version
+
+
+def test_build_writes_facets_and_downloads(artifacts_folder):
+    """O build grava as listas de filtros e os downloads em cada codificação."""
+    manifest = read_manifest(str(artifacts_folder))
+    artifacts = read_artifacts(str(artifacts_folder))
+
+    for name, entry in manifest['datasets'].items():
+        assert set(artifacts[name]['facets']) == set(FACETS[name])
+        assert set(entry['downloads']) == set(DOWNLOAD_ENCODINGS)
+        folder = artifacts_folder / DOWNLOADS_SUBFOLDER
+        plain = (folder / entry['downloads']['identity']).read_bytes()
+        compressed = (folder / entry['downloads']['gzip']).read_bytes()
+        assert gzip.decompress(compressed) == plain
+
+    countries = artifacts['importacao']['facets']['NM_PAIS']
+    assert countries == artifacts['importacao']['data']['NM_PAIS'].unique().tolist()
+
+
+def test_app_boots_from_artifacts_only(artifacts_folder):
+    """Com os artefatos, todas as rotas respondem sem rede, sem preprocessors e
+    sem renderizar CSVs."""
+    downloads = artifacts_folder / DOWNLOADS_SUBFOLDER
+    rendered = {path.name: path.stat().st_mtime_ns for path in downloads.iterdir()}
+    store.clear()
+    try:
+        with (
+            patch('requests.get', side_effect=AssertionError('rede')),
+            patch.object(DatasetStore, '_build') as mock_build,
+        ):
+            app = create_app(
+                {
+                    'TESTING': True,
+                    'USE_LOCAL_DATA': False,
+                    'ARTIFACTS_FOLDER': str(artifacts_folder),
+                }
+            )
+            client = app.test_client()
+            for name in PREPROCESSORS:
+                for url in (
+                    f'/{name}',
+                    f'/download_{name}',
+                    f'/get_{name}_data?length=5&_=artefatos',
+                ):
+                    assert client.get(url).status_code == 200, url
+
+        mock_build.assert_not_called()
+        assert {
+            path.name: path.stat().st_mtime_ns for path in downloads.iterdir()
+        } == rendered
+    finally:
+        store.clear()
+
+
+def test_render_download_keeps_other_versions(tmp_path):
+    """Renderizar uma versão nova não apaga a anterior, que ainda pode estar
+    sendo servida por outro worker."""
+    data = pd.DataFrame({'NM_PAIS': ['Chile']})
+    old = render_download(data, str(tmp_path), 'exportacao', 'v1', 'gzip')
+
+    new = render_download(data, str(tmp_path), 'exportacao', 'v2', 'gzip')
+
+    assert old != new
+    assert (tmp_path / 'exportacao-v1.csv.gz').exists()
+
+
+def test_prune_downloads_keeps_given_versions(tmp_path):
+    data = pd.DataFrame({'NM_PAIS': ['Chile']})
+    for version in ('v1', 'v2', 'v3'):
+        render_download(data, str(tmp_path), 'exportacao', version, 'identity')
+    render_download(data, str(tmp_path), 'importacao', 'v1', 'identity')
+    # arquivo de outro processo ainda sendo escrito
+    (tmp_path / 'exportacao-v1.csv.123-456.tmp').write_bytes(b'')
+
+    removed = prune_downloads(str(tmp_path), 'exportacao', {'v2', 'v3'})
+
+    assert [path.rsplit('/', 1)[-1] for path in removed] == ['exportacao-v1.csv']
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'exportacao-v1.csv.123-456.tmp',
+        'exportacao-v2.csv',
+        'exportacao-v3.csv',
+        'importacao-v1.csv',
+    ]
+
+
+def test_build_keeps_downloads_of_previous_build(tmp_path):
+    """Um novo build mantém os downloads do build anterior (servidos pela
+    aplicação em execução) e remove os mais antigos."""
+    data = pd.DataFrame({'NM_PAIS': ['Chile'], 'QTD_IMPORTADO_KG': [1.0]})
+    downloads = tmp_path / DOWNLOADS_SUBFOLDER
+    for version in ('v1', 'v2', 'v3'):
+        snapshot = Snapshot.from_frame('importacao', data, version)
+        write_artifacts({'importacao': snapshot}, str(tmp_path))
+
+    versions = {path.name.split('.')[0] for path in downloads.iterdir()}
+    assert versions == {'importacao-v2', 'importacao-v3'}
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from embrapa_api.indexes import (
+    BitmapIndex,
+    HashIndex,
+    SortedIndex,
+    bitmap_positions,
+    intersect_positions,
+    range_positions,
+)
+from embrapa_api.store import Snapshot
+
+
+def make_snapshot():
+    data = pd.DataFrame(
+        {
+            'NM_PAIS': ['Chile', 'Brasil', 'Chile', 'Chile', 'Brasil'],
+            'NM_ITEM': ['Vinhos', 'Vinhos', 'Sucos', 'Vinhos', 'Sucos'],
+            'DT_ANO': ['2012', '2009', '2010', '2023', '2010'],
+        }
+    )
+    return Snapshot.from_frame('importacao', data)
+
+
+def test_hash_index_lookup():
+    """O índice retorna as posições de cada valor na ordem da tabela."""
+    index = HashIndex(pd.Series(['b', 'a', 'b', 'c', 'b']))
+
+    assert len(index) == 3
+    assert index.lookup('b').tolist() == [0, 2, 4]
+    assert index.lookup('c').tolist() == [3]
+    assert index.lookup('inexistente').tolist() == []
+
+
+def test_intersect_positions():
+    assert intersect_positions([]) is None
+    result = intersect_positions([np.array([0, 2, 4, 6]), np.array([2, 3, 6])])
+    assert result.tolist() == [2, 6]
+
+
+def test_snapshot_positions_match_boolean_mask():
+    """Filtros combinados pelo índice equivalem à máscara booleana do pandas."""
+    snapshot = make_snapshot()
+    data = snapshot.data
+
+    positions = snapshot.positions({'NM_PAIS': 'Chile', 'NM_ITEM': 'Vinhos'})
+    expected = data[(data['NM_PAIS'] == 'Chile') & (data['NM_ITEM'] == 'Vinhos')]
+
+    assert data.iloc[positions].equals(expected)
+    assert snapshot.positions({}) is None
+
+
+def test_snapshot_index_built_once():
+    snapshot = make_snapshot()
+    assert snapshot.index('NM_PAIS') is snapshot.index('NM_PAIS')
+
+
+def test_sorted_index_range():
+    """Intervalos inclusivos, abertos de um lado e vazios, na ordem da tabela."""
+    index = SortedIndex(pd.Series(['2012', '2009', '2010', '2023', '2010']))
+
+    assert index.range(2010, 2012).tolist() == [0, 2, 4]
+    assert index.range(low=2011).tolist() == [0, 3]
+    assert index.range(high=2009).tolist() == [1]
+    assert index.range(2013, 2020).tolist() == []
+    assert index.range(2020, 2010).tolist() == []
+    assert index.count(2010, 2012) == 3
+
+
+@pytest.mark.parametrize(
+    'positions', [None, np.array([0, 3]), np.array([0, 1, 2, 3, 4])]
+)
+def test_range_positions(positions):
+    """Filtrar as posições uma a uma ou intersectar dá o mesmo resultado."""
+    years = pd.Series([2012, 2009, 2010, 2023, 2010], dtype='int16')
+    index = SortedIndex(years)
+    rows = np.arange(len(years)) if positions is None else positions
+    expected = [row for row in rows if 2010 <= years[row] <= 2012]
+
+    assert range_positions(positions, index, 2010, 2012).tolist() == expected
+
+
+def test_snapshot_positions_with_year_range():
+    """Faixa de anos combinada com filtro de igualdade."""
+    snapshot = make_snapshot()
+    data = snapshot.data
+    years = data['DT_ANO'].astype(int)
+
+    positions = snapshot.positions({'NM_PAIS': 'Chile'}, {'DT_ANO': (2010, None)})
+    only_range = snapshot.positions({}, {'DT_ANO': (None, 2010)})
+
+    assert data.iloc[positions].equals(
+        data[(data['NM_PAIS'] == 'Chile') & (years >= 2010)]
+    )
+    assert data.iloc[only_range].equals(data[years <= 2010])
+
+
+def test_bitmap_index_lookup():
+    """O bitmap de uma lista de valores é o OU dos bitmaps de cada valor."""
+    values = pd.Series(['b', 'a', 'b', 'c', 'b', 'a', 'c', 'c', 'a', None])
+    index = BitmapIndex(values)
+
+    def rows(bitmap):
+        return np.flatnonzero(np.unpackbits(bitmap, count=len(values))).tolist()
+
+    assert len(index) == 3
+    assert rows(index.lookup(['b'])) == [0, 2, 4]
+    assert rows(index.lookup(['a', 'c'])) == [1, 3, 5, 6, 7, 8]
+    assert rows(index.lookup(['inexistente'])) == []
+
+
+def test_hash_index_lookup_any():
+    """A união das posições de vários valores sai na ordem da tabela."""
+    index = HashIndex(pd.Series(['b', 'a', 'b', 'c', 'b', 'a']))
+
+    assert index.lookup_any(['c', 'a']).tolist() == [1, 3, 5]
+    assert index.lookup_any(['b', 'b']).tolist() == [0, 2, 4]
+    assert index.lookup_any(['inexistente']).tolist() == []
+    assert index.lookup_any([]).tolist() == []
+
+
+def test_value_lists_use_bitmaps_only_on_low_cardinality(monkeypatch):
+    """Colunas com muitos valores distintos não ganham bitmaps (que ocupariam
+    valores x linhas / 8 bytes); as listas são resolvidas no índice hash."""
+    monkeypatch.setattr('embrapa_api.indexes.BITMAP_MAX_VALUES', 2)
+    rows = 1000
+    data = pd.DataFrame(
+        {
+            'ID_UVA_PROCESSADA': [str(i % 100) for i in range(rows)],
+            'NM_ITEM': ['Vinhos', 'Sucos'] * (rows // 2),
+        }
+    )
+    snapshot = Snapshot.from_frame('processamento', data)
+
+    positions = snapshot.positions(
+        {'ID_UVA_PROCESSADA': ['7', '8', '42'], 'NM_ITEM': ['Vinhos', 'Sucos']}
+    )
+
+    mask = data['ID_UVA_PROCESSADA'].isin(['7', '8', '42'])
+    assert positions.tolist() == np.flatnonzero(mask).tolist()
+    assert ('bitmap_index', 'NM_ITEM') in snapshot._derived
+    assert ('bitmap_index', 'ID_UVA_PROCESSADA') not in snapshot._derived
+
+
+def test_snapshot_positions_with_value_lists():
+    """Listas de valores (OU) em vários campos (E) equivalem ao ``isin``."""
+    snapshot = make_snapshot()
+    data = snapshot.data
+
+    positions = snapshot.positions(
+        {'NM_PAIS': ['Chile', 'Brasil'], 'NM_ITEM': 'Vinhos'},
+        {'DT_ANO': (2010, None)},
+    )
+    mask = (
+        data['NM_PAIS'].isin(['Chile', 'Brasil'])
+        & (data['NM_ITEM'] == 'Vinhos')
+        & (data['DT_ANO'].astype(int) >= 2010)
+    )
+
+    assert data.iloc[positions].equals(data[mask])
+    assert bitmap_positions({}, {}) is None
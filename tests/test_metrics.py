@@ -0,0 +1,103 @@
+import math
+
+from flask import Flask
+
+from embrapa_api.metrics import (
+    SOURCE_SECONDS,
+    STAGE_SECONDS,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+from embrapa_api.preprocessing.constants import IMPORTACAO_PATHS
+from embrapa_api.preprocessing.preprocessors import ImportacaoPreprocessor
+
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram('t_seconds', 'Teste.', ('stage',), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, stage='sort')
+
+    series = histogram.collect()[('sort',)]
+    assert series['buckets'] == {0.1: 2, 1.0: 3, math.inf: 4}
+    assert series['count'] == 4
+    assert series['sum'] == 2.65
+
+
+def test_histogram_render_prometheus_text():
+    histogram = Histogram('t_seconds', 'Teste.', ('dataset',), buckets=(1.0,))
+    histogram.observe(0.5, dataset='a"b')
+
+    lines = list(histogram.render())
+
+    assert lines == [
+        '# HELP t_seconds Teste.',
+        '# TYPE t_seconds histogram',
+        't_seconds_bucket{dataset="a\\"b",le="1.0"} 1',
+        't_seconds_bucket{dataset="a\\"b",le="+Inf"} 1',
+        't_seconds_sum{dataset="a\\"b"} 0.5',
+        't_seconds_count{dataset="a\\"b"} 1',
+    ]
+
+
+def test_registry_timer_disabled_records_nothing():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('t_seconds', 'Teste.', ('stage',))
+
+    with registry.timer(histogram, stage='sort'):
+        pass
+    assert histogram.collect() == {}
+
+    registry.enabled = True
+    with registry.timer(histogram, stage='sort'):
+        pass
+    assert histogram.collect()[('sort',)]['count'] == 1
+
+
+def test_registry_init_app_registers_endpoint():
+    registry = MetricsRegistry()
+    registry.histogram('t_seconds', 'Teste.').observe(0.2)
+    app = Flask(__name__)
+
+    registry.init_app(app)
+    rv = app.test_client().get('/metrics')
+
+    assert rv.status_code == 200
+    assert 't_seconds_count 1' in rv.data.decode('utf-8')
+
+
+def test_preprocess_records_stages(app_context):
+    """O preprocess registra leitura por fonte e as etapas do dataset."""
+    ImportacaoPreprocessor().preprocess()
+
+    stages = STAGE_SECONDS.collect()
+    assert stages[('importacao', 'reshape')]['count'] >= len(IMPORTACAO_PATHS)
+    assert stages[('importacao', 'sort')]['count'] >= 1
+    assert SOURCE_SECONDS.collect()[('ImpVinhos.csv', 'parse')]['count'] >= 1
+
+
+def test_counter_render():
+    counter = Counter('t_hits_total', 'Teste.', ('dataset',))
+
+    counter.inc(dataset='a')
+    counter.inc(2, dataset='a')
+
+    assert counter.collect() == {('a',): 3}
+    assert list(counter.render()) == [
+        '# HELP t_hits_total Teste.',
+        '# TYPE t_hits_total counter',
+        't_hits_total{dataset="a"} 3.0',
+    ]
+
+
+def test_gauge_inc_dec_render():
+    gauge = Gauge('t_in_flight', 'Teste.', ('endpoint',))
+
+    gauge.inc(endpoint='a')
+    gauge.inc(endpoint='a')
+    gauge.dec(endpoint='a')
+
+    assert gauge.collect() == {('a',): 1}
+    assert list(gauge.render())[-1] == 't_in_flight{endpoint="a"} 1.0'
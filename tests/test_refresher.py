@@ -0,0 +1,174 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+from flask import Flask
+
+from embrapa_api.preprocessing.preprocessors import BasePreprocessor
+from embrapa_api.refresher import BackgroundRefresher
+from embrapa_api.store import DatasetStore
+
+
+class UpstreamPreprocessor(BasePreprocessor):
+    """Preprocessor de teste cujo resultado reflete o estado de um upstream fake."""
+
+    value = 1.0
+    failing = False
+    bundled = False
+    release = None
+
+    def preprocess(self):
+        if UpstreamPreprocessor.release is not None:
+            UpstreamPreprocessor.release.wait(5)
+        if UpstreamPreprocessor.failing:
+            raise ConnectionError("upstream fora do ar")
+        if UpstreamPreprocessor.bundled:
+            self.bundled_sources.append("data/fake.csv")
+        return pd.DataFrame({"ID_PRODUTO": ["1"], "VR_PRODUCAO_L": [self.value]})
+
+
+@pytest.fixture
+def store():
+    UpstreamPreprocessor.value = 1.0
+    UpstreamPreprocessor.failing = False
+    UpstreamPreprocessor.bundled = False
+    UpstreamPreprocessor.release = None
+    return DatasetStore({"fake": UpstreamPreprocessor})
+
+
+@pytest.fixture
+def refresher(store):
+    refresher = BackgroundRefresher(store, interval=0.05)
+    yield refresher
+    refresher.stop(timeout=5)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condição não atingida a tempo"
+        time.sleep(0.01)
+
+
+def test_refresh_keeps_snapshot_when_unchanged(store, refresher):
+    """Conteúdo igual mantém o snapshot (e o que foi derivado dele)."""
+    refresher._app = Flask(__name__)
+    first = store.get("fake")
+
+    refresher.refresh_all()
+
+    assert store.get("fake") is first
+    assert "fake" in refresher.last_refresh
+
+
+def test_refresh_failure_keeps_last_good_snapshot(store, refresher):
+    """Com o upstream fora do ar o último snapshot bom continua sendo servido."""
+    refresher._app = Flask(__name__)
+    first = store.get("fake")
+    UpstreamPreprocessor.failing = True
+
+    refresher.refresh_all()
+
+    assert store.get("fake") is first
+    assert "upstream fora do ar" in refresher.last_error["fake"]
+
+
+def test_background_thread_swaps_new_snapshot(store, refresher):
+    """A thread aquece o dataset na partida e troca o snapshot quando o upstream
+    muda."""
+    app = Flask(__name__)
+    app.config.update(BACKGROUND_REFRESH=True, REFRESH_INTERVAL=0.05)
+    refresher.init_app(app)
+
+    wait_for(lambda: store.has("fake"))
+    first = store.get("fake")
+    UpstreamPreprocessor.value = 2.0
+
+    wait_for(lambda: store.get("fake").version != first.version)
+    assert store.get("fake").data["VR_PRODUCAO_L"].tolist() == [2.0]
+
+
+def test_bundled_fallback_keeps_snapshot(store, refresher):
+    """Dados dos arquivos empacotados não substituem um snapshot já carregado."""
+    refresher._app = Flask(__name__)
+    first = store.put("fake", store.get("fake").data.assign(VR_PRODUCAO_L=5.0))
+    UpstreamPreprocessor.bundled = True
+    UpstreamPreprocessor.value = 2.0
+
+    assert refresher.refresh("fake") is None
+
+    assert store.get("fake") is first
+    assert "bundled" in refresher.last_error["fake"]
+
+
+def test_bundled_fallback_used_without_snapshot(store, refresher):
+    refresher._app = Flask(__name__)
+    UpstreamPreprocessor.bundled = True
+
+    snapshot = refresher.refresh("fake")
+
+    assert store.get("fake") is snapshot
+    assert "fake" not in refresher.last_error
+
+
+def test_refresh_prunes_downloads_of_older_versions(store, refresher, tmp_path):
+    """Após uma troca de versão ficam os downloads da versão atual e da
+    anterior; os mais antigos são removidos fora do caminho das requisições."""
+    refresher._app = Flask(__name__)
+    refresher._app.config.update(DOWNLOADS_FOLDER=str(tmp_path))
+    for version in ("antiga", "anterior"):
+        (tmp_path / f"fake-{version}.csv").write_bytes(b"")
+    store.put("fake", store.get("fake").data, version="anterior")
+    UpstreamPreprocessor.value = 2.0
+
+    current = refresher.refresh("fake")
+
+    assert current.version != "anterior"
+    assert [path.name for path in tmp_path.iterdir()] == ["fake-anterior.csv"]
+
+
+def test_reads_not_blocked_by_slow_refresh(store, refresher):
+    """Durante um rebuild lento as leituras recebem o snapshot atual na hora."""
+    refresher._app = Flask(__name__)
+    first = store.get("fake")
+    UpstreamPreprocessor.release = threading.Event()
+    UpstreamPreprocessor.value = 3.0
+    thread = threading.Thread(target=refresher.refresh_all)
+    thread.start()
+
+    start = time.monotonic()
+    assert store.get("fake") is first
+    assert time.monotonic() - start < 0.5
+
+    UpstreamPreprocessor.release.set()
+    thread.join(5)
+    assert store.get("fake").data["VR_PRODUCAO_L"].tolist() == [3.0]
+
+
+def test_not_started_when_testing(store):
+    refresher = BackgroundRefresher(store)
+    app = Flask(__name__)
+    app.config.update(TESTING=True)
+
+    refresher.init_app(app)
+
+    assert not refresher.running
+
+
+@pytest.mark.parametrize("run_main, running", [(None, False), ("true", True)])
+def test_debug_reloader_starts_only_in_child(store, monkeypatch, run_main, running):
+    """Com o reloader, só o processo filho (que atende requisições) atualiza."""
+    if run_main is None:
+        monkeypatch.delenv("WERKZEUG_RUN_MAIN", raising=False)
+    else:
+        monkeypatch.setenv("WERKZEUG_RUN_MAIN", run_main)
+    refresher = BackgroundRefresher(store, interval=60)
+    app = Flask(__name__)
+    app.config.update(DEBUG=True, BACKGROUND_REFRESH=True)
+
+    refresher.init_app(app)
+    try:
+        assert refresher.running is running
+    finally:
+        refresher.stop(timeout=5)
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from embrapa_api.rollups import RollupCube
+from embrapa_api.schema import compact
+
+MEASURES = ['QTD', 'VALOR']
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    rows = 400
+    frame = pd.DataFrame(
+        {
+            'NM_PAIS': rng.choice(['Chile', 'Japão', 'Itália', 'Brasil'], rows),
+            'DT_ANO': rng.choice(['2019', '2020', '2021'], rows),
+            'NM_ITEM': rng.choice(['Vinhos', 'Sucos', 'Espumantes'], rows),
+            'QTD': rng.integers(0, 1000, rows),
+            'VALOR': rng.random(rows) * 100,
+        }
+    )
+    frame.loc[::7, 'VALOR'] = np.nan
+    return compact(frame)
+
+
+@pytest.fixture
+def cube(data):
+    return RollupCube(data, ['DT_ANO', 'NM_PAIS', 'NM_ITEM'], MEASURES)
+
+
+def expected(data, group_by, filters):
+    for column, value in filters.items():
+        data = data[data[column].astype(str) == value]
+    if not group_by:
+        return pd.DataFrame(
+            {
+                'QTD_sum': [data['QTD'].sum()],
+                'VALOR_mean': [data['VALOR'].mean()],
+                'VALOR_count': [data['VALOR'].count()],
+            }
+        )
+    grouped = data.groupby(group_by, observed=True)
+    return pd.DataFrame(
+        {
+            'QTD_sum': grouped['QTD'].sum(),
+            'VALOR_mean': grouped['VALOR'].mean(),
+            'VALOR_count': grouped['VALOR'].count(),
+        }
+    ).reset_index()
+
+
+@pytest.mark.parametrize(
+    'group_by, filters',
+    [
+        ([], {}),
+        (['DT_ANO'], {}),
+        (['NM_PAIS', 'DT_ANO'], {}),
+        (['DT_ANO'], {'NM_PAIS': 'Chile'}),
+        ([], {'DT_ANO': '2020'}),
+        (['NM_ITEM'], {'NM_PAIS': 'Japão'}),
+        (['NM_PAIS', 'NM_ITEM', 'DT_ANO'], {}),
+    ],
+)
+def test_aggregate_matches_groupby(data, cube, group_by, filters):
+    """O cubo dá os mesmos números de um groupby sobre a tabela inteira."""
+    measures = [('QTD', 'sum'), ('VALOR', 'mean'), ('VALOR', 'count')]
+
+    result = cube.aggregate(group_by, measures, filters)
+
+    pd.testing.assert_frame_equal(
+        result, expected(data, group_by, filters), check_dtype=False
+    )
+
+
+def test_common_rollups_are_precomputed(cube):
+    """Ano, cada dimensão e ano x dimensão já estão no cubo; combinações
+    cobertas por eles não agrupam a tabela."""
+    assert cube.covering(['DT_ANO']) == ('DT_ANO',)
+    assert cube.covering(['NM_PAIS', 'DT_ANO']) == ('DT_ANO', 'NM_PAIS')
+    assert cube.covering([]) == ()
+    assert cube.covering(['NM_PAIS', 'NM_ITEM']) is None
+
+
+def test_uncovered_grouping_is_kept(cube):
+    """Um agrupamento fora do cubo é calculado uma vez e reaproveitado."""
+    cube.aggregate(['NM_ITEM'], [('QTD', 'sum')], {'NM_PAIS': 'Chile'})
+
+    assert cube.covering(['NM_PAIS', 'NM_ITEM']) == ('NM_PAIS', 'NM_ITEM')
+
+
+@pytest.mark.parametrize('group_by', [['NM_ITEM'], []])
+@pytest.mark.parametrize(
+    'filters', [{'DT_ANO': '1900'}, {'DT_ANO': 'abc'}, {'NM_PAIS': 'Inexistente'}]
+)
+def test_filter_without_rows(cube, group_by, filters):
+    """Sem linhas não há grupos, nem um total zero inventado."""
+    result = cube.aggregate(group_by, [('QTD', 'sum'), ('QTD', 'mean')], filters)
+
+    assert result.empty
+
+
+@pytest.mark.parametrize(
+    'group_by, measures, filters',
+    [
+        (['ID'], [('QTD', 'sum')], {}),
+        ([], [('QTD', 'sum')], {'ID': '1'}),
+        ([], [('NM_PAIS', 'sum')], {}),
+        ([], [('QTD', 'max')], {}),
+        (['DT_ANO', 'DT_ANO'], [('QTD', 'sum')], {}),
+    ],
+)
+def test_invalid_query(cube, group_by, measures, filters):
+    with pytest.raises(ValueError):
+        cube.aggregate(group_by, measures, filters)
@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from embrapa_api.schema import compact, restore
+from embrapa_api.store import PREPROCESSORS
+
+
+@pytest.fixture(scope='module')
+def refined(app_context):
+    """Tabelas tratadas a partir dos CSVs locais."""
+    return {name: cls().preprocess() for name, cls in PREPROCESSORS.items()}
+
+
+@pytest.mark.parametrize('name', list(PREPROCESSORS))
+def test_compact_outputs_are_byte_identical(refined, name):
+    """O esquema compacto gera exatamente o mesmo CSV e o mesmo JSON."""
+    data = refined[name]
+    compacted = compact(data)
+
+    assert compacted.to_csv(index=False) == data.to_csv(index=False)
+    assert json.dumps(restore(compacted).to_dict(orient='records')) == json.dumps(
+        data.to_dict(orient='records')
+    )
+
+
+@pytest.mark.parametrize('name', list(PREPROCESSORS))
+def test_compact_reduces_memory(refined, name):
+    data = refined[name]
+    compacted = compact(data)
+
+    assert compacted['DT_ANO'].dtype == np.int16
+    assert compacted.memory_usage(deep=True).sum() < data.memory_usage(deep=True).sum()
+
+
+def test_compact_keeps_high_cardinality_text_and_floats():
+    """Texto com muitos valores distintos continua como str e float32 é opcional."""
+    data = pd.DataFrame(
+        {
+            'NM_PAIS': ['Brasil', 'Chile', 'Peru'],
+            'DT_ANO': ['1970', '1971', '1972'],
+            'VALOR': [1.5, 2.5, np.nan],
+        }
+    )
+
+    assert compact(data)['NM_PAIS'].dtype == object
+    assert compact(data)['VALOR'].dtype == np.float64
+    assert compact(data, float32=True)['VALOR'].dtype == np.float32
@@ -0,0 +1,43 @@
+import pytest
+
+from embrapa_api.search import PrefixIndex, fold
+
+COUNTRIES = [
+    'Alemanha',
+    'Alemanha, República Democrática',
+    'África do Sul',
+    'Coreia do Sul',
+    'Japão',
+    'São Tomé e Príncipe',
+    'Japão',
+]
+
+
+def test_fold():
+    assert fold('  São  Tomé e PRÍNCIPE ') == 'sao tome e principe'
+
+
+@pytest.mark.parametrize(
+    'term, expected',
+    [
+        ('ale', ['Alemanha', 'Alemanha, República Democrática']),
+        ('JAPAO', ['Japão']),
+        ('sul', ['África do Sul', 'Coreia do Sul']),
+        ('republica dem', ['Alemanha, República Democrática']),
+        ('sao tome', ['São Tomé e Príncipe']),
+        ('xyz', []),
+        ('', []),
+    ],
+)
+def test_prefix_matches(term, expected):
+    """Busca por início de qualquer palavra, sem acentos nem maiúsculas."""
+    assert PrefixIndex(COUNTRIES).matches(term) == expected
+
+
+def test_matches_rank_and_limit():
+    """Nomes que começam pelo termo vêm antes dos que só têm uma palavra com ele."""
+    index = PrefixIndex(['Suco de Uva', 'Espumante Suave', 'Suave', 'Tinto Suave'])
+
+    assert index.matches('suave') == ['Suave', 'Espumante Suave', 'Tinto Suave']
+    assert index.matches('s', limit=2) == ['Suave', 'Suco de Uva']
+    assert len(index) == 4
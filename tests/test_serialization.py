@@ -0,0 +1,50 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from embrapa_api import serialization
+from embrapa_api.schema import compact, restore
+from embrapa_api.serialization import column_values, encode, records
+
+
+def test_records_match_restore():
+    """As linhas montadas a partir das colunas são as mesmas de ``restore``."""
+    data = pd.DataFrame(
+        {
+            'NM_PAIS': ['Chile', 'Japão', 'Chile', 'Chile'],
+            'DT_ANO': ['1970', '1971', '1972', '1973'],
+            'QTD': [1, 2, 3, 4],
+            'VALOR': [1.5, 2.5, 3.5, 4.5],
+        }
+    )
+    compacted = compact(data)
+
+    assert records(compacted.iloc[1:3]) == restore(compacted.iloc[1:3]).to_dict(
+        orient='records'
+    )
+    assert all(type(row['QTD']) is int for row in records(compacted))
+
+
+def test_column_values_missing():
+    """Categorias ausentes e NaN viram None."""
+    categories = pd.Series(pd.Categorical(['a', None, 'b']))
+    floats = pd.Series([1.0, np.nan])
+
+    assert column_values(categories) == ['a', None, 'b']
+    assert column_values(floats) == [1.0, None]
+
+
+def test_encode_without_orjson():
+    """Sem o orjson, a biblioteca padrão gera o mesmo JSON compacto."""
+    payload = {'data': [{'NM_PAIS': 'Japão', 'VALOR': None, 'QTD': 1}]}
+
+    with patch.object(serialization, 'orjson', None):
+        fallback = encode(payload)
+
+    assert json.loads(fallback) == json.loads(encode(payload)) == payload
+    assert (
+        fallback
+        == json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode()
+    )
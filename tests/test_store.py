@@ -0,0 +1,68 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from embrapa_api.preprocessing.preprocessors import BasePreprocessor
+from embrapa_api.store import DatasetStore
+
+
+class FakePreprocessor(BasePreprocessor):
+    """Preprocessor de teste que conta quantas vezes o ETL foi executado."""
+
+    calls = 0
+    value = 1.0
+
+    def preprocess(self):
+        FakePreprocessor.calls += 1
+        return pd.DataFrame(
+            {"ID_PRODUTO": ["2", "1"], "VR_PRODUCAO_L": [self.value, 2.0]},
+            index=[10, 20],
+        )
+
+
+@pytest.fixture
+def store():
+    FakePreprocessor.calls = 0
+    FakePreprocessor.value = 1.0
+    return DatasetStore({"fake": FakePreprocessor})
+
+
+def test_get_builds_once(store):
+    """O preprocessamento roda uma única vez e as leituras seguintes usam o
+    snapshot em memória."""
+    first = store.get("fake")
+    second = store.get("fake")
+
+    assert first is second
+    assert FakePreprocessor.calls == 1
+    assert list(first.data.index) == [0, 1]
+
+
+def test_get_concurrent_builds_once(store):
+    """Requisições simultâneas para um dataset frio executam o ETL uma vez."""
+    threads = [threading.Thread(target=store.get, args=("fake",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert FakePreprocessor.calls == 1
+
+
+def test_refresh_swaps_snapshot(store):
+    """O refresh reconstrói o dataset e troca a versão apenas se o conteúdo mudar."""
+    first = store.get("fake")
+    same = store.refresh("fake")
+    FakePreprocessor.value = 5.0
+    changed = store.refresh("fake")
+
+    assert same is first
+    assert changed.version != first.version
+    assert store.get("fake") is changed
+    assert FakePreprocessor.calls == 3
+
+
+def test_unknown_dataset(store):
+    with pytest.raises(KeyError):
+        store.get("inexistente")